@@ -23,6 +23,34 @@ The module that contains the Presentation and Slide classes that are used to gen
 
 The module that contains all component subclasses that can be used to generate Slide content
 
+#### assets
+
+The module that contains the helpers used to locate, cache and bundle the static assets of a presentation
+
+#### vendor
+
+The module that contains the helpers used to self-host (vendor) the third-party assets of a presentation
+
+#### serve
+
+The module that contains a WSGI/ASGI application used to serve presentations without exporting them to disk
+
+#### audit
+
+The module that contains the performance budget analyzer used to audit presentations before they're exported
+
+#### serialize
+
+The module that contains the compact, versioned serialization format used to send presentations between processes
+
+#### search
+
+The module that contains the full-text search index exported with the search export option
+
+#### cli
+
+The module that contains the ezprez command line interface (i.e. ezprez audit deck.py)
+
 Quickstart
 ----------
 #### Creating a presentation with a text slide and exporting it to ./Presentation
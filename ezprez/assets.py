@@ -0,0 +1,693 @@
+"""The module that contains the helpers used to locate, cache and bundle the static assets of a presentation
+
+Functions
+---------
+#### get_webslides_folder
+Returns the path to the cached copy of webslides, downloading it on first use
+
+#### iter_folder
+Yields the relative and absolute paths of every file in a folder
+
+#### read_file
+Reads a file as bytes, keeping a process-wide cached copy of any webslides file
+
+#### file_hash
+Returns the sha256 hex digest of a file's contents
+
+#### find_css_references
+Finds every url() and @import reference in a stylesheet
+
+#### find_html_references
+Finds every static/ file referenced in a generated html file
+
+#### rewrite_references
+Rewrites the static/ file references in a generated html file
+
+#### prune
+Removes every file that a generated html file does not reference (directly or through its stylesheets)
+
+#### fingerprint
+Renames every css, js, font and image file of an export to include a hash of its contents
+
+#### inline_sprite
+Inlines an svg sprite with only the icons a presentation uses into a generated html file
+
+#### defer_images
+Defers the background images and <img>'s of a generated slide until the lazy image script loads them
+
+#### critical_css
+Reduces a stylesheet to the rules that style some html (i.e. the first slides), so it can be inlined
+
+#### precache
+Adds a service worker that precaches every file a generated html file uses, so it works offline
+
+Notes
+-----
+- On first run you will need an internet connection to download webslides
+"""
+# Standard lib dependencies
+import os                                   # Used in path validation
+import re                                   # Used to find file references in css and html
+import json                                 # Used to write the fingerprint manifest
+import hashlib                              # Used to hash file contents
+import posixpath                            # Used to resolve relative references between exported files
+import threading                            # Used to make sure webslides is only downloaded once
+from shutil import copytree                 # Used to copy the downloaded webslides files into the cache
+from typing import Dict, Generator, List, Set, Tuple, Union  # Used to enrich type hints in functions
+
+# Internal Dependencies
+from ezprez.vendor import FONT_AWESOME_URL  # Used to drop the Font Awesome stylesheet when every icon is in the svg sprite
+from ezprez.vendor import split_css, rule_prelude # Used to split stylesheets into rules when extracting critical css
+
+# External Dependencies
+from elevate import elevate                 # Used for any protected folder access such as system wide python installs
+from pystall.core import ZIPResource, build # Used to download webslides from the latest version and extract it for use on export
+
+
+WEBSLIDES_FOLDER = os.path.join(os.path.dirname(__file__), "webslides")
+"""The folder the downloaded webslides distribution is cached in"""
+
+_file_cache: Dict[str, bytes] = {}
+"""The process-wide cache of webslides file contents, used by read_file()"""
+
+_download_lock = threading.Lock()
+"""Used to stop multiple threads downloading webslides at the same time"""
+
+_hash_cache: Dict[str, str] = {}
+"""The process-wide cache of webslides file hashes, used by file_hash()"""
+
+FINGERPRINTED_EXTENSIONS = {".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif", ".ico", ".woff", ".woff2", ".ttf", ".otf", ".eot"}
+"""The file extensions that are renamed by fingerprint()"""
+
+CSS_REFERENCE_PATTERN = re.compile(r"""url\(\s*(?P<quote>['"]?)(?P<url>[^'")\s]+)(?P=quote)\s*\)|@import\s+(?P<import_quote>['"])(?P<import_url>[^'"]+)(?P=import_quote)""")
+"""Matches url() and @import references in a stylesheet"""
+
+SVG_SYMBOL_PATTERN = re.compile(r"""<symbol\b[^>]*\bid=\\?['"](?P<id>[^'"\\]+)\\?['"][^>]*>.*?</symbol>""", re.S)
+"""Matches the <symbol>'s (and their ids) in svg-icons.js"""
+
+HTML_REFERENCE_PATTERN = re.compile(r"""(?<![\w/.-])(?P<prefix>\./)?(?P<path>static/[^"'()<>]+)""")
+"""Matches references to files in the static/ folder in a generated html file"""
+
+BACKGROUND_IMAGE_PATTERN = re.compile(r"""style=(?P<quote>['"])background-image:\s*url\((?P<url_quote>['"]?)(?P<url>[^'"()]+)(?P=url_quote)\)(?P=quote)""")
+"""Matches the inline background-image style of a slide's <span class='background'>"""
+
+LAZY_EAGER_SLIDES = 3
+"""How many slides (including the intro slide) load their images immediately when lazy_images is True"""
+
+LAZY_PREFETCH_SLIDES = 2
+"""How many slides after the current one the lazy image script loads ahead of time"""
+
+LAZY_IMAGES_SCRIPT = f"""<script>
+        (function () {{
+            var slides = document.querySelectorAll('#webslides > section');
+            function load(index) {{
+                if (!slides[index]) return;
+                slides[index].querySelectorAll('[data-background]').forEach(function (element) {{
+                    element.style.backgroundImage = 'url("' + element.getAttribute('data-background') + '")';
+                    element.removeAttribute('data-background');
+                }});
+                slides[index].querySelectorAll('img[data-src]').forEach(function (element) {{
+                    element.src = element.getAttribute('data-src');
+                    element.removeAttribute('data-src');
+                }});
+            }}
+            function loadAround(current) {{
+                for (var index = current; index <= current + {LAZY_PREFETCH_SLIDES}; index++) load(index);
+            }}
+            document.getElementById('webslides').addEventListener('ws:slide-change', function (event) {{
+                loadAround(event.detail.currentSlide0);
+            }});
+            document.addEventListener('DOMContentLoaded', function () {{
+                loadAround(window.ws && window.ws.currentSlideI_ || 0);
+            }});
+        }})();
+    </script>"""
+"""Loads the deferred images of the current slide and the next LAZY_PREFETCH_SLIDES slides whenever the slide changes"""
+
+SERVICE_WORKER_TEMPLATE = """// Generated by ezprez, precaches the presentation so it loads from cache and works offline
+const PRECACHE = "ezprez-precache";
+const RUNTIME = "ezprez-runtime";
+const MANIFEST = __MANIFEST__;
+
+// Each file is cached under its url with its content hash appended, so only files whose hash changed are downloaded again
+function cacheKey(path) {
+    return new URL(path, self.registration.scope).href + "?__ezprez=" + MANIFEST[path];
+}
+
+function manifestPath(url) {
+    const path = url.href.startsWith(self.registration.scope) ? url.href.slice(self.registration.scope.length).split(/[?#]/)[0] : null;
+    return path === "" ? "index.html" : path;
+}
+
+self.addEventListener("install", (event) => {
+    event.waitUntil(caches.open(PRECACHE).then((cache) => Promise.all(Object.keys(MANIFEST).map((path) =>
+        cache.match(cacheKey(path)).then((cached) => cached || fetch(new URL(path, self.registration.scope), {cache: "reload"}).then((response) => {
+            if (!response.ok) throw new Error("Could not precache " + path);
+            return cache.put(cacheKey(path), response);
+        }))
+    ))).then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+    const current = new Set(Object.keys(MANIFEST).map(cacheKey));
+    event.waitUntil(caches.open(PRECACHE).then((cache) => cache.keys().then((requests) => Promise.all(
+        requests.filter((request) => !current.has(request.url)).map((request) => cache.delete(request))
+    ))).then(() => self.clients.claim()));
+});
+
+self.addEventListener("fetch", (event) => {
+    if (event.request.method !== "GET") return;
+    const path = manifestPath(new URL(event.request.url));
+    if (path in MANIFEST) {
+        event.respondWith(caches.match(cacheKey(path), {cacheName: PRECACHE}).then((cached) => cached || fetch(event.request)));
+    } else { // Other files (i.e. fonts from a CDN) are cached the first time they're fetched, and used when the network is down
+        event.respondWith(fetch(event.request).then((response) => {
+            const copy = response.clone();
+            caches.open(RUNTIME).then((cache) => cache.put(event.request, copy));
+            return response;
+        }).catch(() => caches.match(event.request, {cacheName: RUNTIME})));
+    }
+});
+"""
+"""The service worker exported by precache(), __MANIFEST__ is replaced with the json of {path:hash}'s to precache"""
+
+SERVICE_WORKER_REGISTRATION = """<script>
+        if ("serviceWorker" in navigator) {
+            navigator.serviceWorker.register("sw.js");
+        }
+    </script>"""
+"""Registers the service worker exported by precache()"""
+
+
+def get_webslides_folder() -> str:
+    """Returns the path to the cached copy of webslides, downloading it on first use
+
+    Returns
+    -------
+    str
+        The absolute path to the cached webslides folder
+    """
+    if os.path.exists(WEBSLIDES_FOLDER):
+        return WEBSLIDES_FOLDER
+    with _download_lock:
+        if os.path.exists(WEBSLIDES_FOLDER):
+            return WEBSLIDES_FOLDER
+        # finding downloads folder
+        if os.name == "nt":
+            DOWNLOAD_FOLDER = f"{os.getenv('USERPROFILE')}\\Downloads"
+        else: # PORT: Assuming variable is there for MacOS and Linux installs
+            DOWNLOAD_FOLDER = f"{os.getenv('HOME')}/Downloads"
+        try:
+            build(ZIPResource("webslides", "https://webslides.tv/webslides-latest.zip", overwrite_agreement=True))
+            copytree(os.path.join(DOWNLOAD_FOLDER, "webslides"), WEBSLIDES_FOLDER)
+        except PermissionError:
+            elevate()
+            copytree(os.path.join(DOWNLOAD_FOLDER, "webslides"), WEBSLIDES_FOLDER)
+    return WEBSLIDES_FOLDER
+
+
+def iter_folder(folder:str) -> Generator[Tuple[str, str], None, None]:
+    """Yields the relative and absolute paths of every file in a folder
+
+    Parameters
+    ----------
+    folder : (str)
+        The folder to walk
+
+    Yields
+    ------
+    Tuple[str, str]
+        The path relative to folder (always using '/' as a separator), and the absolute path of the file
+
+    Examples
+    --------
+    ### Print every file in the webslides cache
+    ```
+    from ezprez.assets import get_webslides_folder, iter_folder
+
+    for relative_path, absolute_path in iter_folder(get_webslides_folder()):
+        print(relative_path)
+    ```
+    """
+    folder = os.path.abspath(folder)
+    for directory, _, file_names in os.walk(folder):
+        for file_name in file_names:
+            absolute_path = os.path.join(directory, file_name)
+            yield os.path.relpath(absolute_path, folder).replace(os.sep, "/"), absolute_path
+
+
+def read_file(path:str) -> bytes:
+    """Reads a file as bytes, keeping a process-wide cached copy of any webslides file
+
+    Parameters
+    ----------
+    path : (str)
+        The absolute path of the file to read
+
+    Returns
+    -------
+    bytes
+        The contents of the file
+
+    Notes
+    -----
+    - Files inside WEBSLIDES_FOLDER are read once per process, every call returns the same bytes object
+    - Any other file (i.e. images) is read from disk on each call
+
+    Examples
+    --------
+    ### Read the webslides stylesheet
+    ```
+    import os
+    from ezprez.assets import get_webslides_folder, read_file
+
+    stylesheet = read_file(os.path.join(get_webslides_folder(), "static", "css", "webslides.css"))
+    ```
+    """
+    if path.startswith(WEBSLIDES_FOLDER + os.sep):
+        if path not in _file_cache:
+            with open(path, "rb") as cached_file:
+                _file_cache[path] = cached_file.read()
+        return _file_cache[path]
+    with open(path, "rb") as uncached_file:
+        return uncached_file.read()
+
+
+def file_hash(source:Union[str, bytes]) -> str:
+    """Returns the sha256 hex digest of a file's contents
+
+    Parameters
+    ----------
+    source : (str or bytes)
+        The absolute path of the file, or the file contents
+
+    Returns
+    -------
+    str
+        The hex digest of the contents, webslides files are only hashed once per process
+    """
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    if source not in _hash_cache:
+        digest = hashlib.sha256(read_file(source)).hexdigest()
+        if not source.startswith(WEBSLIDES_FOLDER + os.sep):
+            return digest
+        _hash_cache[source] = digest
+    return _hash_cache[source]
+
+
+def _resolve_reference(reference:str, relative_to:str) -> Union[str, bool]:
+    """Resolves a reference found in a file to a path relative to the export root, or False if it points to another site/data"""
+    if reference.startswith(("data:", "http:", "https:", "//", "#", "about:")):
+        return False
+    reference = re.split(r"[?#]", reference, maxsplit=1)[0]
+    if not reference:
+        return False
+    if reference.startswith("/"):
+        return posixpath.normpath(reference.lstrip("/"))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(relative_to), reference))
+
+
+def find_css_references(css:str, css_path:str) -> List[Tuple[str, str]]:
+    """Finds every url() and @import reference in a stylesheet
+
+    Parameters
+    ----------
+    css : (str)
+        The contents of the stylesheet
+
+    css_path : (str)
+        The path of the stylesheet relative to the export root, i.e. 'static/css/webslides.css'
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        The reference as written in the stylesheet, and the path it points to relative to the export root
+
+    Notes
+    -----
+    - data: uris and references to other sites are skipped
+
+    Examples
+    --------
+    ### Find the fonts used by a stylesheet
+    ```
+    from ezprez.assets import find_css_references
+
+    find_css_references("src:url('../fonts/roboto.woff2')", "static/css/webslides.css") # [('../fonts/roboto.woff2', 'static/fonts/roboto.woff2')]
+    ```
+    """
+    references = []
+    for match in CSS_REFERENCE_PATTERN.finditer(css):
+        reference = match.group("url") or match.group("import_url")
+        resolved = _resolve_reference(reference, css_path)
+        if resolved:
+            references.append((reference, resolved))
+    return references
+
+
+def find_html_references(html:str) -> List[str]:
+    """Finds every static/ file referenced in a generated html file
+
+    Parameters
+    ----------
+    html : (str)
+        The generated html
+
+    Returns
+    -------
+    List[str]
+        The referenced paths relative to the export root, i.e. 'static/css/webslides.css'
+    """
+    references = []
+    for match in HTML_REFERENCE_PATTERN.finditer(html):
+        resolved = _resolve_reference(match.group("path"), "index.html")
+        if resolved:
+            references.append(resolved)
+    return references
+
+
+def prune(files:Dict[str, Union[str, bytes]], html:str) -> Dict[str, Union[str, bytes]]:
+    """Removes every file that a generated html file does not reference (directly or through its stylesheets)
+
+    Parameters
+    ----------
+    files : (Dict[str, str or bytes])
+        A dictionary of {relative_path:source_path or contents}'s of the exported files
+
+    html : (str)
+        The generated index.html the files are used by
+
+    Returns
+    -------
+    Dict[str, str or bytes]
+        Only the files referenced by html, the stylesheets it links, and the url()'s and @import's inside those stylesheets
+
+    Examples
+    --------
+    ### Only keep the files an in-memory export uses
+    ```
+    from ezprez.assets import prune
+
+    files = {"static/js/webslides.js": b"function WebSlides(){}", "demos/index.html": b"..."}
+    prune(files, "<script src='static/js/webslides.js'></script>") # {'static/js/webslides.js': b'function WebSlides(){}'}
+    ```
+    """
+    used = set()
+    unvisited = [path for path in find_html_references(html) if path in files]
+    while unvisited:
+        path = unvisited.pop()
+        if path in used:
+            continue
+        used.add(path)
+        if path.lower().endswith(".css"):
+            source = files[path]
+            css = (source if isinstance(source, bytes) else read_file(source)).decode("utf-8", errors="surrogateescape")
+            unvisited.extend(referenced_path for _, referenced_path in find_css_references(css, path) if referenced_path in files)
+    return {path: source for path, source in files.items() if path in used}
+
+
+def rewrite_references(html:str, renamed:Dict[str, str]) -> str:
+    """Rewrites the static/ file references in a generated html file
+
+    Parameters
+    ----------
+    html : (str)
+        The generated html
+
+    renamed : (Dict[str, str])
+        A dictionary of {original_path:new_path}'s relative to the export root
+
+    Returns
+    -------
+    str
+        The html with every reference to an original_path replaced with new_path
+    """
+    def _replace(match:re.Match) -> str:
+        path = match.group("path")
+        if path in renamed:
+            return (match.group("prefix") or "") + renamed[path]
+        return match.group(0)
+    return HTML_REFERENCE_PATTERN.sub(_replace, html)
+
+
+def _rewrite_css(css:str, css_path:str, renamed:Dict[str, str]) -> str:
+    """Rewrites the url() and @import references in a stylesheet that point to renamed files"""
+    def _replace(match:re.Match) -> str:
+        reference = match.group("url") or match.group("import_url")
+        resolved = _resolve_reference(reference, css_path)
+        if not resolved or resolved not in renamed:
+            return match.group(0)
+        suffix = reference[len(re.split(r"[?#]", reference, maxsplit=1)[0]):]
+        new_reference = posixpath.relpath(renamed[resolved], posixpath.dirname(css_path)) + suffix
+        return match.group(0).replace(reference, new_reference)
+    return CSS_REFERENCE_PATTERN.sub(_replace, css)
+
+
+def fingerprint(files:Dict[str, Union[str, bytes]]) -> Tuple[Dict[str, Union[str, bytes]], Dict[str, str]]:
+    """Renames every css, js, font and image file of an export to include a hash of its contents
+
+    Parameters
+    ----------
+    files : (Dict[str, str or bytes])
+        A dictionary of {relative_path:source_path or contents}'s of the exported files
+
+    Returns
+    -------
+    Tuple[Dict[str, str or bytes], Dict[str, str]]
+        The renamed files, and the manifest dictionary of {original_path:fingerprinted_path}'s
+
+    Notes
+    -----
+    - A file at static/css/webslides.css is renamed to static/css/webslides.<first 12 characters of sha256>.css
+    - url() and @import references inside stylesheets are rewritten before the stylesheet itself is hashed
+    - The manifest is also added to the files as manifest.json
+    - References in index.html are not rewritten, use rewrite_references() with the manifest
+
+    Examples
+    --------
+    ### Fingerprint the files of an in-memory export
+    ```
+    from ezprez.assets import fingerprint
+
+    files, manifest = fingerprint({"static/js/webslides.js": b"function WebSlides(){}"})
+    print(manifest) # {'static/js/webslides.js': 'static/js/webslides.27d0e0a8e1b5.js'}
+    ```
+    """
+    def _hashed_path(path:str, digest:str) -> str:
+        stem, extension = posixpath.splitext(path)
+        return f"{stem}.{digest[:12]}{extension}"
+
+    manifest = {}
+    rewritten = {}
+    for path, source in files.items():
+        extension = posixpath.splitext(path)[1].lower()
+        if extension in FINGERPRINTED_EXTENSIONS and extension != ".css":
+            manifest[path] = _hashed_path(path, file_hash(source))
+
+    def _fingerprint_stylesheet(path:str, parents:Tuple[str, ...]):
+        """Fingerprints a stylesheet after every stylesheet it imports"""
+        source = files[path]
+        css = (source if isinstance(source, bytes) else read_file(source)).decode("utf-8", errors="surrogateescape")
+        for _, referenced_path in find_css_references(css, path):
+            if referenced_path.endswith(".css") and referenced_path in files and referenced_path not in manifest and referenced_path not in parents:
+                _fingerprint_stylesheet(referenced_path, parents + (path,))
+        rewritten[path] = _rewrite_css(css, path, manifest).encode("utf-8", errors="surrogateescape")
+        manifest[path] = _hashed_path(path, file_hash(rewritten[path]))
+
+    for path in files:
+        if path.lower().endswith(".css") and path not in manifest:
+            _fingerprint_stylesheet(path, ())
+
+    result = {manifest.get(path, path): rewritten.get(path, source) for path, source in files.items()}
+    result["manifest.json"] = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    return result, manifest
+
+
+def inline_sprite(html:str, icon_names:Set[str]) -> str:
+    """Inlines an svg sprite with only the icons a presentation uses into a generated html file
+
+    Parameters
+    ----------
+    html : (str)
+        The generated index.html
+
+    icon_names : (Set[str])
+        The icon ids to include in the sprite, i.e. {'fa-heart', 'fa-github'}
+
+    Returns
+    -------
+    str
+        The html with the sprite inserted at the start of the <body>
+
+    Notes
+    -----
+    - The symbols are taken from the webslides svg-icons.js file, icons that are not in it are skipped
+    - Font Awesome icon fonts (i.e. the <i class='fab fa-github'> of a SocialLink) are replaced with the svg icon when it is in the sprite
+    - The svg-icons.js script is removed if every svg icon the html references is in the sprite
+    - The Font Awesome stylesheet is removed if no Font Awesome icon fonts are left in the html
+    """
+    svg_icons = read_file(os.path.join(get_webslides_folder(), "static", "js", "svg-icons.js")).decode("utf-8", errors="surrogateescape")
+    symbols = {match.group("id"): match.group(0).replace("\\'", "'").replace('\\"', '"') for match in SVG_SYMBOL_PATTERN.finditer(svg_icons)}
+    included = sorted(name for name in icon_names if name in symbols)
+
+    def _replace_icon_font(match:re.Match) -> str:
+        name = match.group("name")
+        if name not in symbols:
+            return match.group(0)
+        return f"<svg class='{name}' style='width:{match.group('size') or '1'}em;height:{match.group('size') or '1'}em;'><use xlink:href='#{name}'></use></svg>"
+    html = re.sub(r"""<i class=['"]fab (?P<name>fa-[a-z0-9-]+)(?: fa-(?P<size>\d)x)?['"]></i>""", _replace_icon_font, html)
+
+    sprite = f"<svg xmlns='http://www.w3.org/2000/svg' style='display:none'>{''.join(symbols[name] for name in included)}</svg>"
+    html = html.replace("<body>", f"<body>\n    {sprite}", 1)
+
+    referenced = set(re.findall(r"""xlink:href=['"]#([^'"]+)['"]""", html))
+    if referenced.issubset(included):
+        html = re.sub(r"""\s*(?:<!--[^>]*svg-icons\.js[^>]*-->\s*)?<script[^>]*src=['"]static/js/svg-icons\.js['"][^>]*></script>""", "", html)
+    if not re.search(r"""class=['"](?:[^'"]*\s)?fa[bsrl]?\s""", html):
+        html = re.sub(rf"""\s*(?:<noscript>)?<link[^>]*href=['"]{re.escape(FONT_AWESOME_URL)}['"][^>]*>(?:</noscript>)?""", "", html)
+    return html
+
+
+def defer_images(html:str) -> str:
+    """Defers the background images and <img>'s of a generated slide until the lazy image script loads them
+
+    Parameters
+    ----------
+    html : (str)
+        The generated html of a slide
+
+    Returns
+    -------
+    str
+        The html with background-image styles moved to data-background attributes, and <img> src's moved to data-src attributes
+
+    Notes
+    -----
+    - LAZY_IMAGES_SCRIPT needs to be included in the page to load the deferred images
+    - The paths are kept as ./static/ references, so prune() and fingerprint() still find and rewrite them
+    """
+    html = BACKGROUND_IMAGE_PATTERN.sub(lambda match: f"data-background={match.group('quote')}{match.group('url')}{match.group('quote')}", html)
+    return re.sub(r"(<img\b[^>]*?\s)src=", r"\1data-src=", html)
+
+
+def precache(files:Dict[str, Union[str, bytes]], html:str) -> Tuple[str, Dict[str, Union[str, bytes]]]:
+    """Adds a service worker that precaches every file a generated html file uses, so it works offline
+
+    Parameters
+    ----------
+    files : (Dict[str, str or bytes])
+        A dictionary of {relative_path:source_path or contents}'s of the exported files (without index.html)
+
+    html : (str)
+        The generated index.html
+
+    Returns
+    -------
+    Tuple[str, Dict[str, str or bytes]]
+        The html with the service worker registered before </body>, and the files with sw.js and precache-manifest.json added
+
+    Notes
+    -----
+    - Only index.html and the files it references (directly or through its stylesheets) are precached, see prune()
+    - precache-manifest.json is a dictionary of {relative_path:hash}'s, using the first 12 characters of the sha256 of each file
+    - The manifest is also embedded in sw.js, so browsers install the new service worker whenever any hash changes
+    - When a new service worker is installed only the files whose hash changed are downloaded, and outdated files are removed from the cache
+    - Files from other sites (i.e. fonts from a CDN) are cached the first time they're loaded, use the vendor export option to precache them instead
+
+    Examples
+    --------
+    ### Make an in-memory export work offline
+    ```
+    from ezprez.assets import precache
+
+    html, files = precache(files, html)
+    files["index.html"] = html.encode()
+    ```
+    """
+    html = html.replace("</body>", f"{SERVICE_WORKER_REGISTRATION}\n    </body>", 1)
+    referenced = prune(files, html)
+    manifest = {"index.html": file_hash(html.encode())[:12]}
+    for relative_path, source in referenced.items():
+        manifest[relative_path] = file_hash(source)[:12]
+    manifest = dict(sorted(manifest.items()))
+
+    result = dict(files)
+    result["precache-manifest.json"] = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    result["sw.js"] = SERVICE_WORKER_TEMPLATE.replace("__MANIFEST__", json.dumps(manifest, indent=4, sort_keys=True)).encode()
+    return html, result
+
+
+def critical_css(css:str, css_path:str, html:str) -> str:
+    """Reduces a stylesheet to the rules that style some html (i.e. the first slides), so it can be inlined
+
+    Parameters
+    ----------
+    css : (str)
+        The stylesheet
+
+    css_path : (str)
+        The path of the stylesheet relative to the export root, i.e. 'static/css/webslides.css'
+
+    html : (str)
+        The html the rules need to style
+
+    Returns
+    -------
+    str
+        The rules (including inside @media and @supports) with a selector that matches the tags, classes and ids in the html
+
+    Notes
+    -----
+    - Selectors are matched by their tags, classes and ids, pseudo-classes and attribute selectors are ignored (so a few extra rules can be kept)
+    - @font-face rules, and @keyframes named after a class in the html (i.e. fadeIn), are kept, every other at-rule (i.e. @import) is removed
+    - url() references are rewritten to be relative to the export root, so the css works inlined in index.html
+
+    Examples
+    --------
+    ### Get the critical css of the first slide
+    ```
+    from ezprez.assets import critical_css
+
+    critical_css(".wrap{margin:auto}.toc{color:red}", "static/css/webslides.css", "<div class='wrap'></div>") # '.wrap{margin:auto}'
+    ```
+    """
+    tags = {tag.lower() for tag in re.findall(r"<([a-zA-Z][\w-]*)", html)} | {"html", "body"}
+    classes = {class_name for match in re.finditer(r"""class=['"]([^'"]*)['"]""", html) for class_name in match.group(1).split()}
+    ids = set(re.findall(r"""id=['"]([^'"]+)['"]""", html))
+
+    def _matches(selector:str) -> bool:
+        selector = re.sub(r"::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]|\\.", "", selector)
+        for token in re.findall(r"[.#]?[\w-]+", selector):
+            if token[0] == ".":
+                if token[1:] not in classes:
+                    return False
+            elif token[0] == "#":
+                if token[1:] not in ids:
+                    return False
+            elif token.lower() not in tags:
+                return False
+        return True
+
+    def _filter(css:str) -> str:
+        rules = []
+        for rule in split_css(css):
+            prelude = rule_prelude(rule)
+            if prelude.startswith(("@media", "@supports")):
+                inner = _filter(rule[rule.find("{") + 1:rule.rfind("}")])
+                if inner:
+                    rules.append(f"{prelude}{{{inner}}}")
+            elif prelude.startswith("@font-face") or (re.match(r"@(?:-webkit-)?keyframes\s", prelude) and prelude.split()[-1] in classes):
+                rules.append(re.sub(r"/\*.*?\*/", "", rule, flags=re.S).strip())
+            elif prelude and not prelude.startswith("@") and any(_matches(selector) for selector in prelude.split(",")):
+                rules.append(re.sub(r"/\*.*?\*/", "", rule, flags=re.S).strip())
+        return "".join(rules)
+
+    def _rewrite(match:re.Match) -> str:
+        reference = match.group("url") or match.group("import_url")
+        resolved = _resolve_reference(reference, css_path)
+        if not resolved:
+            return match.group(0)
+        return match.group(0).replace(reference, resolved + reference[len(re.split(r"[?#]", reference, maxsplit=1)[0]):])
+
+    return CSS_REFERENCE_PATTERN.sub(_rewrite, _filter(css))
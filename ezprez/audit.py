@@ -0,0 +1,379 @@
+"""The module that contains the performance budget analyzer used to audit presentations before they're exported
+
+Classes
+-------
+#### Budget
+The limits a presentation has to stay within, used to fail builds of presentations that are too heavy
+
+#### Report
+The results of analyzing a presentation
+
+Functions
+---------
+#### analyze
+Analyzes a presentation's slides and components without rendering them
+
+#### estimate_nodes
+Estimates the number of html elements some content renders to, dispatching on its type
+
+Examples
+--------
+#### Fail a build if a presentation has more than 5MB of images
+```
+from ezprez.audit import Budget
+
+report = prez.analyze(Budget(max_image_bytes=5_000_000))
+
+if not report.passed:
+    raise SystemExit("\\n".join(report.violations))
+```
+"""
+# Standard lib dependencies
+import os                                   # Used to find the size of images
+import re                                   # Used to count the elements in raw html
+from math import ceil                       # Used to count the slides a table is split across
+from functools import singledispatch        # Used to dispatch node estimates on the type of content
+from dataclasses import dataclass, field    # Used to make class generation faster and more efficient
+from typing import Dict, List, Tuple, Union # Used to enrich type hints in functions
+
+# Internal dependencies
+from ezprez.components import *             # Used to dispatch node estimates on the type of component
+from ezprez.components import _Component    # Used to dispatch node estimates on the type of component
+from ezprez.vendor import GOOGLE_FONTS_URL, FONT_AWESOME_URL, HIGHLIGHT_CSS_URL, HIGHLIGHT_JS_URL # The third-party files every presentation's head requests
+
+
+HEAD_NODES = 40
+"""The approximate number of elements in the <head>, main, article and script tags of every presentation"""
+
+INTRO_NODES = 5
+"""The approximate number of elements in the intro slide"""
+
+ENDCARD_NODES = 13
+"""The approximate number of elements in the endcard"""
+
+SLIDE_NODES = 4
+"""The number of elements every slide has (section, wrap div, content div and the heading)"""
+
+
+@dataclass
+class Budget:
+    """The limits a presentation has to stay within, used to fail builds of presentations that are too heavy
+
+    Attributes
+    ----------
+    max_image_bytes: (int or False)
+        The most bytes of images the whole presentation can reference, optional and defaults to False (no limit)
+
+    max_slide_image_bytes: (int or False)
+        The most bytes of images a single slide can reference (the favicon and images in the navbar or footer aren't counted), optional and defaults to False (no limit)
+
+    max_videos: (int or False)
+        The most Video iframes the presentation can have, optional and defaults to False (no limit)
+
+    max_dom_nodes: (int or False)
+        The most html elements the presentation can render to, optional and defaults to False (no limit)
+
+    max_block_characters: (int or False)
+        The most characters a single Code or Raw block can have, optional and defaults to False (no limit)
+
+    max_external_requests: (int or False)
+        The most requests the presentation can make to other sites, optional and defaults to False (no limit)
+
+    Examples
+    --------
+    ### A budget for presentations that have to load quickly on conference wifi
+    ```
+    from ezprez.audit import Budget
+
+    budget = Budget(max_image_bytes=10_000_000, max_slide_image_bytes=1_000_000, max_videos=2, max_external_requests=4)
+    ```
+    """
+    max_image_bytes: Union[bool, int] = False
+    max_slide_image_bytes: Union[bool, int] = False
+    max_videos: Union[bool, int] = False
+    max_dom_nodes: Union[bool, int] = False
+    max_block_characters: Union[bool, int] = False
+    max_external_requests: Union[bool, int] = False
+
+
+@dataclass
+class Report:
+    """The results of analyzing a presentation
+
+    Attributes
+    ----------
+    slide_count: (int)
+        The number of slides, including the intro slide and endcard
+
+    image_bytes: (Dict[int, int])
+        A dictionary of {slide_number:bytes}'s of the images each slide references (slides without images are left out),
+        slide 0 is the images every slide loads (the favicon, and images in the navbar or footer)
+
+    missing_images: (List[str])
+        The filenames of referenced images that could not be found
+
+    videos: (int)
+        The number of Video iframes
+
+    dom_nodes: (int)
+        The estimated number of html elements the presentation renders to
+
+    largest_blocks: (List[Tuple[int, str, int]])
+        The (slide_number, component type, characters) of the largest Code and Raw blocks, largest first
+
+    external_requests: (List[str])
+        The url's of the files the presentation requests from other sites
+
+    unread_tables: (int)
+        The number of Tables whose rows are a generator, their rows and extra slides aren't counted so the generator isn't used up
+
+    violations: (List[str])
+        A description of each budget limit that was exceeded
+    """
+    slide_count: int = 0
+    image_bytes: Dict[int, int] = field(default_factory=dict)
+    missing_images: List[str] = field(default_factory=list)
+    videos: int = 0
+    dom_nodes: int = 0
+    largest_blocks: List[Tuple[int, str, int]] = field(default_factory=list)
+    external_requests: List[str] = field(default_factory=list)
+    unread_tables: int = 0
+    violations: List[str] = field(default_factory=list)
+
+
+    @property
+    def total_image_bytes(self) -> int:
+        """The bytes of every image the presentation references"""
+        return sum(self.image_bytes.values())
+
+
+    @property
+    def passed(self) -> bool:
+        """Whether the presentation is within its budget"""
+        return not self.violations
+
+
+    def __str__(self) -> str:
+        result = f"Slides: {self.slide_count}\n"
+        result += f"Images: {self.total_image_bytes:,} bytes\n"
+        for slide_number, image_bytes in sorted(self.image_bytes.items(), key=lambda item: -item[1]):
+            result += f"\t{f'Slide {slide_number}' if slide_number else 'Every slide'}: {image_bytes:,} bytes\n"
+        for filename in self.missing_images:
+            result += f"\tMissing image: {filename}\n"
+        result += f"Videos: {self.videos}\n"
+        result += f"Estimated DOM nodes: {self.dom_nodes:,}\n"
+        if self.unread_tables:
+            result += f"\tNot counting the rows of {self.unread_tables} tables of generated rows\n"
+        result += "Largest Code/Raw blocks:\n"
+        for slide_number, component_type, characters in self.largest_blocks:
+            result += f"\tSlide {slide_number}: {component_type} with {characters:,} characters\n"
+        result += f"External requests: {len(self.external_requests)}\n"
+        for url in self.external_requests:
+            result += f"\t{url}\n"
+        if self.violations:
+            result += "Budget exceeded:\n"
+            for violation in self.violations:
+                result += f"\t{violation}\n"
+        else:
+            result += "Within budget\n"
+        return result
+
+
+@singledispatch
+def estimate_nodes(content) -> int:
+    """Estimates the number of html elements some content renders to, dispatching on its type
+
+    Parameters
+    ----------
+    content : (str, list, tuple or Component)
+        The content to estimate, mirrors what ezprez.components.render() accepts
+
+    Returns
+    -------
+    int
+        The estimated number of elements
+
+    Notes
+    -----
+    - Components without a registered estimate count as one element, plus their nested components
+    - Other types can register an estimate with estimate_nodes.register()
+    """
+    return 1
+
+
+@estimate_nodes.register(str)
+def _estimate_text(content:str) -> int:
+    return 1
+
+
+@estimate_nodes.register(list)
+@estimate_nodes.register(tuple)
+def _estimate_list(content:Union[list, tuple]) -> int:
+    return 1 + sum(1 + (estimate_nodes(item) if not isinstance(item, str) else 0) for item in content)
+
+
+@estimate_nodes.register(_Component)
+def _estimate_component(content:_Component) -> int:
+    return 1 + sum(estimate_nodes(attribute) for attribute in vars(content).values() if isinstance(attribute, (list, tuple, _Component)))
+
+
+@estimate_nodes.register(SocialLink)
+@estimate_nodes.register(Code)
+@estimate_nodes.register(Video)
+@estimate_nodes.register(Footer)
+@estimate_nodes.register(Navbar)
+def _estimate_wrapped(content:_Component) -> int:
+    """Components that render as two elements (i.e. <a><i></i></a> or <pre><code></code></pre>) plus their links"""
+    links = getattr(content, "links", [])
+    return 2 + (len(links) if isinstance(content, Navbar) else 0) + sum(estimate_nodes(link) for link in links)
+
+
+@estimate_nodes.register(Icon)
+def _estimate_icon(content:Icon) -> int:
+    return 2
+
+
+@estimate_nodes.register(Image)
+def _estimate_image(content:Image) -> int:
+    return 2 if content.browser else 1
+
+
+@estimate_nodes.register(Raw)
+def _estimate_raw(content:Raw) -> int:
+    return len(re.findall(r"<[A-Za-z]", content.content))
+
+
+@estimate_nodes.register(TableOfContents)
+def _estimate_table_of_contents(content:TableOfContents) -> int:
+    return 4 + 4 * len(content.sections)
+
+
+@estimate_nodes.register(Chart)
+def _estimate_chart(content:Chart) -> int:
+    """The svg, title, axes and 4 labels, plus a polyline or a group with an element per point"""
+    return 7 + (1 if content.kind == "line" else 1 + len(content.y))
+
+
+@estimate_nodes.register(Table)
+def _estimate_table(content:Table) -> int:
+    """The table and tbody, the caption and heading row, and a row element plus an element per cell for each row (per page)"""
+    if content.one_shot: # Reading the rows would use them up before the export
+        return 2 + (1 if content.caption else 0) + (2 + len(content.columns) if content.columns else 0)
+    columns, rows = content._iter_rows()
+    nodes = 0
+    for row_number, row in enumerate(rows):
+        if not content.rows_per_slide or not row_number % content.rows_per_slide:
+            nodes += 2 + (1 if content.caption else 0) + (2 + len(columns) if columns else 0)
+        nodes += 1 + len(row)
+    return nodes or 2
+
+
+@estimate_nodes.register(Grid)
+def _estimate_grid(content:Grid) -> int:
+    nodes = 1
+    for column in content.contents:
+        if isinstance(column, (list, tuple)):
+            nodes += 1 + sum(estimate_nodes(item) for item in column)
+        else:
+            nodes += 1 + estimate_nodes(column)
+    return nodes
+
+
+def analyze(presentation, budget:Union[bool, Budget] = False) -> Report:
+    """Analyzes a presentation's slides and components without rendering them
+
+    Parameters
+    ----------
+    presentation : (Presentation)
+        The presentation to analyze
+
+    budget : (Budget or False)
+        The limits to check the presentation against, optional and defaults to False (nothing is checked)
+
+    Returns
+    -------
+    Report
+        The results of the analysis, Report.violations lists every budget limit that was exceeded
+
+    Notes
+    -----
+    - Tables of a generator of rows are only counted as an empty table (see Report.unread_tables), since reading the rows would leave nothing to export
+
+    Examples
+    --------
+    ### Print the report of a presentation
+    ```
+    from ezprez.audit import analyze
+
+    print(analyze(prez))
+    ```
+    """
+    report = Report(external_requests=[GOOGLE_FONTS_URL, FONT_AWESOME_URL, HIGHLIGHT_CSS_URL, HIGHLIGHT_JS_URL])
+    image_sizes = {}
+    blocks = []
+
+    def _add_image(slide_number:int, image:Image):
+        if image.filename not in image_sizes:
+            path = os.path.join(presentation.asset_folder, image.filename) if presentation.asset_folder else ""
+            image_sizes[image.filename] = os.path.getsize(path) if os.path.isfile(path) else False
+            if image_sizes[image.filename] is False:
+                report.missing_images.append(image.filename)
+        if image_sizes[image.filename]:
+            report.image_bytes[slide_number] = report.image_bytes.get(slide_number, 0) + image_sizes[image.filename]
+
+    def _add_components(slide_number:int, contents):
+        for component in walk(contents):
+            if isinstance(component, Image):
+                _add_image(slide_number, component)
+            elif isinstance(component, Video):
+                report.videos += 1
+                report.external_requests.append(f"https://www.youtube.com/embed/{component.video_id}")
+            elif isinstance(component, (Code, Raw)):
+                blocks.append((slide_number, type(component).__name__, len(component.content)))
+            elif isinstance(component, Table) and component.one_shot:
+                report.unread_tables += 1
+
+    report.dom_nodes = HEAD_NODES + sum(estimate_nodes(component) for component in (presentation.navbar, presentation.footer) if component)
+    slide_number = 0
+    if presentation.intro:
+        slide_number += 1
+        report.dom_nodes += INTRO_NODES + (1 if presentation.image else 0)
+        if presentation.image:
+            _add_image(slide_number, presentation.image)
+    for slide in presentation.slides:
+        slide_number += 1
+        report.dom_nodes += SLIDE_NODES + sum(estimate_nodes(content) for content in slide.contents)
+        if slide.image:
+            report.dom_nodes += 1
+            _add_image(slide_number, slide.image)
+        _add_components(slide_number, slide.contents)
+        for content in slide.contents: # Tables with rows_per_slide add a slide per page
+            if isinstance(content, Table) and content.rows_per_slide and not content.one_shot:
+                extra_slides = max(ceil(len(content) / content.rows_per_slide) - 1, 0)
+                report.dom_nodes += extra_slides * SLIDE_NODES
+                slide_number += extra_slides
+    if presentation.endcard:
+        slide_number += 1
+        report.dom_nodes += ENDCARD_NODES
+    if presentation.favicon:
+        _add_image(0, presentation.favicon)
+    _add_components(0, [component for component in (presentation.navbar, presentation.footer) if component])
+    report.slide_count = slide_number
+    report.largest_blocks = sorted(blocks, key=lambda block: -block[2])[:5]
+
+    if budget:
+        slide_image_bytes = {slide:image_bytes for slide, image_bytes in report.image_bytes.items() if slide} # Slide 0 is every slide
+        checks = (
+            (budget.max_image_bytes, report.total_image_bytes, "Total image size of {value:,} bytes is over the budget of {limit:,} bytes"),
+            (budget.max_slide_image_bytes, max(slide_image_bytes.values(), default=0), "Slide {slide} has {value:,} bytes of images, over the budget of {limit:,} bytes"),
+            (budget.max_videos, report.videos, "{value} videos is over the budget of {limit}"),
+            (budget.max_dom_nodes, report.dom_nodes, "An estimated {value:,} DOM nodes is over the budget of {limit:,}"),
+            (budget.max_block_characters, report.largest_blocks[0][2] if report.largest_blocks else 0, "The {block} block on slide {block_slide} has {value:,} characters, over the budget of {limit:,}"),
+            (budget.max_external_requests, len(report.external_requests), "{value} external requests is over the budget of {limit}"),
+        )
+        for limit, value, message in checks:
+            if limit is not False and limit is not None and value > limit:
+                heaviest_slide = max(slide_image_bytes, key=slide_image_bytes.get, default=0)
+                largest_block = report.largest_blocks[0] if report.largest_blocks else (0, "", 0)
+                report.violations.append(message.format(value=value, limit=limit, slide=heaviest_slide, block=largest_block[1], block_slide=largest_block[0]))
+    return report
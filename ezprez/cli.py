@@ -0,0 +1,136 @@
+"""The module that contains the ezprez command line interface
+
+Commands
+--------
+#### audit
+Analyzes the presentation(s) defined in a python file, and exits with a status of 1 if any are over budget
+
+Functions
+---------
+#### main
+The entrypoint for the ezprez command
+
+Examples
+--------
+#### Fail a CI build if deck.py's presentation has more than 5MB of images or 3 videos
+```
+ezprez audit deck.py --max-image-bytes 5000000 --max-videos 3
+```
+
+#### Audit the presentation assigned to the prez variable of deck.py
+```
+ezprez audit deck.py:prez
+```
+"""
+# Standard lib dependencies
+import os                                   # Used to find the folder of the presentation file
+import sys                                  # Used to import modules relative to the presentation file
+import json                                 # Used to print reports as json
+import runpy                                # Used to run python files to get their presentations
+import argparse                             # Used to parse the command line arguments
+from dataclasses import asdict, fields      # Used to convert budgets and reports to arguments and json
+from typing import List, Union              # Used to enrich type hints in functions
+
+# Internal dependencies
+from ezprez.core import Presentation        # Used to find the presentations in a python file
+from ezprez.audit import Budget             # Used to check presentations against performance budgets
+
+
+def _load_presentations(target:str) -> List[Presentation]:
+    """Runs a python file and returns the presentations it defines
+
+    Parameters
+    ----------
+    target : (str)
+        The path to the file, optionally followed by :name to pick the presentation assigned to name
+
+    Returns
+    -------
+    List[Presentation]
+        The presentations found in the file
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist
+
+    ValueError
+        If no presentations were found
+    """
+    path, _, name = target.partition(":") if not os.path.isfile(target) else (target, "", "")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Could not find presentation file {path}")
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+    try: # Files that call export() should guard it with if __name__ == "__main__", so auditing doesn't export them
+        namespace = runpy.run_path(path, run_name="__ezprez_audit__")
+    finally:
+        sys.path.pop(0)
+
+    if name:
+        if not isinstance(namespace.get(name), Presentation):
+            raise ValueError(f"{name} in {path} is not a Presentation")
+        return [namespace[name]]
+    presentations = [value for value in namespace.values() if isinstance(value, Presentation)]
+    if not presentations:
+        raise ValueError(f"No presentations were found in {path}")
+    return presentations
+
+
+def audit(target:str, budget:Union[bool, Budget] = False, as_json:bool = False) -> bool:
+    """Prints the analysis of the presentation(s) defined in a python file
+
+    Parameters
+    ----------
+    target : (str)
+        The path to the file, optionally followed by :name to pick the presentation assigned to name
+
+    budget : (Budget or False)
+        The limits to check the presentations against, optional and defaults to False (nothing is checked)
+
+    as_json : (bool)
+        Whether to print the reports as json instead of text, optional and defaults to False
+
+    Returns
+    -------
+    bool
+        Whether every presentation is within its budget
+    """
+    reports = {presentation.title: presentation.analyze(budget) for presentation in _load_presentations(target)}
+    if as_json:
+        print(json.dumps({title: {**asdict(report), "total_image_bytes": report.total_image_bytes, "passed": report.passed} for title, report in reports.items()}, indent=4))
+    else:
+        for title, report in reports.items():
+            print(f"{title}\n{'-' * len(title)}\n{report}")
+    return all(report.passed for report in reports.values())
+
+
+def main(arguments:Union[bool, List[str]] = False):
+    """The entrypoint for the ezprez command
+
+    Parameters
+    ----------
+    arguments : (List[str] or False)
+        The command line arguments, optional and defaults to False (sys.argv is used)
+    """
+    parser = argparse.ArgumentParser(prog="ezprez", description="An object based api for generating web presentations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    audit_parser = commands.add_parser("audit", help="Analyze a presentation and exit with a status of 1 if it's over budget")
+    audit_parser.add_argument("target", help="The python file that defines the presentation, optionally followed by :name to pick one (i.e. deck.py:prez)")
+    audit_parser.add_argument("--json", action="store_true", help="Print the report as json")
+    for budget_field in fields(Budget):
+        audit_parser.add_argument(f"--{budget_field.name.replace('_', '-')}", type=int, default=False, metavar="N")
+
+    parsed = parser.parse_args(arguments if arguments is not False else None)
+    if parsed.command == "audit":
+        budget = Budget(**{budget_field.name: getattr(parsed, budget_field.name) for budget_field in fields(Budget)})
+        try:
+            passed = audit(parsed.target, budget, parsed.json)
+        except (FileNotFoundError, ValueError) as error:
+            parser.exit(2, f"ezprez: error: {error}\n")
+        sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,21 +37,399 @@ A component to include images
 
 #### Grid
 A component that allows you to evenly space multiple peices of content
+
+#### Chart
+A component that renders a line, bar or scatter chart of a data series as an inline svg
+
+#### Table
+A component that renders rows of data (lists, dictionaries, a DataFrame or a .csv file) as a table, optionally split across slides
+
+#### RenderCacheInfo
+The counters of the memoized rendering cache, returned by render_cache_info()
+
+Functions
+---------
+#### walk
+Yields every component inside of some content, including components nested in other components
+
+#### render
+Generates the html of any content (str, list, tuple or Component), dispatching on its type
+
+#### downsample
+Reduces a data series to a number of points while keeping its shape, used by Chart
+
+#### memoize
+Turns memoized rendering (and interning) of components on or off for the whole process
+
+#### render_cache_info
+Returns the hit/miss counters and size of the memoized rendering cache
 """
 # Internal Dependencies
+import os
+import csv
+import weakref
+import threading
 from abc import ABC
-from typing import List, Union
+from itertools import chain, islice
+from operator import is_
+from math import ceil, isfinite
+from html import escape
+from collections import OrderedDict
+from functools import singledispatch, wraps
+from typing import Generator, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Union
 from dataclasses import dataclass
 
+from ezprez.serialize import Serializable
+
 
-class _Component(ABC):
+class _Component(ABC, Serializable):
     """Base class used for type checking, and inheritance on all components"""
     def __html__(self) -> str:
         raise NotImplementedError("Components require a __html__() method to be defined")
 
+    def __setattr__(self, name:str, value):
+        if _render_cache.maxsize and self.__dict__.get(name, value) is not value: # A field changed, so every cached key has to be recomputed
+            with _render_cache.lock:
+                _render_cache.generation += 1
+                interned = _render_cache.interned_keys.pop(id(self), None)
+                if interned: # It no longer equals the arguments it was interned with
+                    _render_cache.interned.pop(interned[1], None)
+        super().__setattr__(name, value)
+
+
+class RenderCacheInfo(NamedTuple):
+    """The counters of the memoized rendering cache, returned by render_cache_info()
+
+    Attributes
+    ----------
+    hits: (int)
+        The number of renders that were answered from the cache
+
+    misses: (int)
+        The number of renders that had to generate their html
+
+    maxsize: (int)
+        The most html strings the cache keeps, 0 when memoization is off
+
+    currsize: (int)
+        The number of html strings in the cache
+
+    interned: (int)
+        The number of distinct interned components that are still in use
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    interned: int
+
+
+class _RenderCache:
+    """The process-wide state of memoize(), shared by every component"""
+    def __init__(self):
+        self.maxsize = 0
+        self.intern = False
+        self.entries = OrderedDict()
+        self.keys = {}
+        self.generation = 0
+        self.interned = weakref.WeakValueDictionary()
+        self.interned_keys = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+
+_render_cache = _RenderCache()
+
+
+def memoize(enabled:bool = True, maxsize:int = 1024, intern:bool = True):
+    """Turns memoized rendering (and interning) of components on or off for the whole process
+
+    Parameters
+    ----------
+    enabled : (bool)
+        Whether to memoize, optional and defaults to True (False turns it off, and clears the cache and counters)
+
+    maxsize : (int)
+        The most html strings to keep, the least recently used are dropped first, optional and defaults to 1024
+
+    intern : (bool)
+        Whether value-type components (SocialLink, Link, Icon, Button, Video and Image) created with the same arguments are the same object, optional and defaults to True
+
+    Raises
+    ------
+    ValueError
+        If maxsize is less than 1
+
+    Notes
+    -----
+    - The html of a component is keyed by its type, its field values (including nested components) and the arguments of __html__(), so changing a field renders it again
+    - Navbar's and Footer's links are only validated when they're rendered (not on cache hits)
+    - Interned components are shared, so changing a field of one changes it everywhere it's used (and it's no longer returned for equal arguments); only turn interning on if components aren't modified after they're created
+    - Creating a component equal to an interned one returns the interned one as is, without running __init__() on it again
+    - Only Code, TableOfContents, Navbar and Footer are memoized, the html of the other components is as quick to generate as it is to look up
+
+    Examples
+    --------
+    ### Memoize rendering while exporting a large deck
+    ```
+    from ezprez.components import memoize, render_cache_info
+
+    memoize()
+    # Create the slides after memoize(), so equal components are interned
+    prez.export(".", force=True)
+    print(render_cache_info()) # i.e. RenderCacheInfo(hits=1998, misses=2, maxsize=1024, currsize=2, interned=3)
+    ```
+    """
+    if enabled and maxsize < 1:
+        raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+    with _render_cache.lock:
+        _render_cache.maxsize = maxsize if enabled else 0
+        _render_cache.intern = bool(enabled and intern)
+        _render_cache.hits = _render_cache.misses = 0
+        _render_cache.entries.clear()
+        _render_cache.keys.clear()
+        if not _render_cache.intern:
+            _render_cache.interned.clear()
+            _render_cache.interned_keys.clear()
+
+
+def render_cache_info() -> RenderCacheInfo:
+    """Returns the hit/miss counters and size of the memoized rendering cache
+
+    Returns
+    -------
+    RenderCacheInfo
+        The hits, misses, maxsize, current size, and number of interned components
+
+    Examples
+    --------
+    ### Check how many renders were memoized
+    ```
+    from ezprez.components import render_cache_info
+
+    info = render_cache_info()
+    print(f"{info.hits / ((info.hits + info.misses) or 1):.0%} of renders were cached")
+    ```
+    """
+    with _render_cache.lock:
+        return RenderCacheInfo(_render_cache.hits, _render_cache.misses, _render_cache.maxsize, len(_render_cache.entries), len(_render_cache.interned))
+
+
+def _cache_key(value):
+    """Returns a hashable key of a value, including the field values of components, raises a TypeError if it can't be keyed"""
+    value_type = type(value)
+    if value_type is str:
+        return value
+    if isinstance(value, _Component):
+        return _component_key(value)
+    if value_type is list or value_type is tuple:
+        return (value_type, *map(_cache_key, value))
+    if value_type is dict:
+        return (dict, *((_cache_key(key), _cache_key(item)) for key, item in value.items()))
+    hash(value)
+    return (value_type, value) # So 1, 1.0 and True aren't the same key
+
+
+def _contained(values:Iterable) -> tuple:
+    """Returns the items inside the list and dict fields of a component, used to check they're the same objects as when it was keyed"""
+    return tuple(tuple(value) if type(value) is list else tuple(chain.from_iterable(value.items())) for value in values if type(value) is list or type(value) is dict)
+
+
+def _component_key(component:_Component) -> tuple:
+    """Returns the key of a component's field values, reusing the last key until a field of any component (or an item in a list/dict field) changes"""
+    cache = _render_cache
+    values = vars(component).values()
+    cached = cache.keys.get(id(component))
+    if cached and cached[0] == cache.generation and cached[1]() is component:
+        if not cached[3]:
+            return cached[2]
+        contained = _contained(values)
+        if all(len(items) == len(old) and all(map(is_, items, old)) for items, old in zip(contained, cached[3])):
+            return cached[2]
+    generation = cache.generation
+    key = (type(component), *[item if type(item) is str else _cache_key(item) for item in values]) # Most fields are strings
+    contained = _contained(values)
+    if not any(isinstance(item, (list, tuple, dict)) for items in contained for item in items): # Changes in nested lists/dicts can't be detected, so those are keyed every time
+        component_id = id(component)
+        reference = weakref.ref(component, lambda _: cache.keys.pop(component_id, None)) # Not locked, the callback can run while the lock is held
+        with cache.lock:
+            cache.keys[component_id] = (generation, reference, key, contained)
+    return key
+
+
+def _memoized(method):
+    """Memoizes the html of a component's __html__() method while memoize() is on"""
+    @wraps(method)
+    def __html__(self, *args, **kwargs):
+        cache = _render_cache
+        if not cache.maxsize:
+            return method(self, *args, **kwargs)
+        try:
+            key = (_component_key(self), *args, *kwargs.items()) if args or kwargs else _component_key(self)
+        except TypeError: # i.e. a field was set to something unhashable
+            return method(self, *args, **kwargs)
+        with cache.lock:
+            html = cache.entries.get(key)
+            if html is not None:
+                cache.hits += 1
+                cache.entries.move_to_end(key)
+                return html
+            cache.misses += 1
+        html = method(self, *args, **kwargs)
+        with cache.lock:
+            cache.entries[key] = html
+            while len(cache.entries) > cache.maxsize:
+                cache.entries.popitem(last=False)
+        return html
+    return __html__
+
+
+class _Interned(type(_Component)):
+    """The metaclass of value components, returns the interned instance (without running __init__() on it again) while memoize() is on"""
+    def __call__(cls, *args, **kwargs):
+        cache = _render_cache
+        if not cache.intern:
+            return super().__call__(*args, **kwargs)
+        try:
+            key = (cls, _cache_key(args), _cache_key(kwargs))
+        except TypeError:
+            return super().__call__(*args, **kwargs)
+        with cache.lock:
+            instance = cache.interned.get(key)
+        if instance is not None:
+            return instance
+        instance = super().__call__(*args, **kwargs)
+        with cache.lock: # Another thread may have interned an equal instance while this one was created
+            interned = cache.interned.setdefault(key, instance)
+            if interned is instance:
+                instance_id = id(instance)
+                cache.interned_keys[instance_id] = (weakref.ref(instance, lambda _: cache.interned_keys.pop(instance_id, None)), key)
+            return interned
+
+
+class _ValueComponent(_Component, metaclass=_Interned):
+    """Base class of components that are interned while memoize() is on, so equal components are a single object"""
+    _serialized_by_value = True # Equal components are also stored once by to_bytes()
+
+
+def walk(content:Union[_Component, str, list, tuple]) -> Generator[_Component, None, None]:
+    """Yields every component inside of some content, including components nested in other components
+
+    Parameters
+    ----------
+    content : (Component, str, list or tuple)
+        The content to walk, i.e. Slide.contents
+
+    Yields
+    ------
+    Component
+        Each component, followed by the components nested inside of it (i.e. a Button then its Icon)
+
+    Examples
+    --------
+    ### Find every Icon used on a slide
+    ```
+    from ezprez.core import Slide
+    from ezprez.components import Button, Icon, walk
+
+    slide = Slide("Title", Button("Click me", "#", icon=Icon("fa-heart")))
+    icons = [component for component in walk(slide.contents) if isinstance(component, Icon)]
+    ```
+    """
+    if isinstance(content, (list, tuple)):
+        for subcontent in content:
+            yield from walk(subcontent)
+    elif isinstance(content, _Component):
+        yield content
+        for attribute in vars(content).values():
+            if isinstance(attribute, (list, tuple, _Component)):
+                yield from walk(attribute)
+
+
+@singledispatch
+def render(content, alignment:Union[bool, str] = False) -> str:
+    """Generates the html of any content (str, list, tuple or Component), dispatching on its type
+
+    Parameters
+    ----------
+    content : (str, list, tuple or Component)
+        The content to render, lists and tuples can be nested arbitrarily deep
+
+    alignment : (False or str)
+        The horizontal alignment of the slide a list is directly inside of (see notes), optional and defaults to False
+
+    Returns
+    -------
+    str
+        The html of the content
+
+    Raises
+    ------
+    ValueError
+        If there is no renderer registered for the type of content
+
+    Notes
+    -----
+    - Strings become paragraphs, lists/tuples become bullet lists, and components use their __html__() method
+    - When alignment is set a list is wrapped in an aligned grid (how a list directly in a Slide is rendered)
+    - The renderer for each type is looked up once and then cached, so rendering large decks doesn't repeat the type checks
+    - Other types can be rendered by registering a renderer for them with render.register()
+
+    Examples
+    --------
+    ### Render a nested list
+    ```
+    from ezprez.components import render
+
+    render(["a bullet point", ["a nested", "list"]])
+    ```
+
+    ### Register a renderer for a third-party type
+    ```
+    from decimal import Decimal
+    from ezprez.components import render
+
+    @render.register(Decimal)
+    def _render_decimal(content:Decimal, alignment = False) -> str:
+        return f"\t\t\t\t\t<p>{content:,.2f}</p>\n"
+    ```
+    """
+    raise ValueError(f"Provided content was {type(content)}, which is not List, Tuple, Component or string (register a renderer with render.register())")
+
+
+@render.register(str)
+def _render_text(content:str, alignment:Union[bool, str] = False) -> str:
+    """Renders a string as a paragraph"""
+    return f"\t\t\t\t\t<p>{content}</p>\n"
+
+
+@render.register(list)
+@render.register(tuple)
+def _render_list(content:Union[list, tuple], alignment:Union[bool, str] = False) -> str:
+    """Renders a list or tuple as bullet points, nested lists become nested bullet points"""
+    result = "\t\t\t\t\t\t\t<ul style='text-align:justify;'>\n" if alignment else "\t\t\t\t\t<ul>\n"
+    for bullet_point in content:
+        if isinstance(bullet_point, (list, tuple)):
+            result += f"\t\t\t\t\t\t\t\t<li>\n{render(bullet_point)}\t\t\t\t\t\t\t\t</li>\n"
+        elif isinstance(bullet_point, str) or render.dispatch(type(bullet_point)) is render.registry[object]: # Values without a renderer (i.e. numbers) are shown as text
+            result += f"\t\t\t\t\t\t\t\t<li>{bullet_point}</li>\n"
+        else:
+            result += f"\t\t\t\t\t\t\t\t<li>{render(bullet_point)}</li>\n"
+    result += "\t\t\t\t\t\t\t</ul>\n" if alignment else "\t\t\t\t\t</ul>\n"
+    if alignment:
+        result = f"\t\t\t\t\t<div class='grid {'content-' + alignment if not alignment == 'right' else ''}'>\n{result}\t\t\t\t\t</div>\n"
+    return result
+
+
+@render.register(_Component)
+def _render_component(content:_Component, alignment:Union[bool, str] = False) -> str:
+    """Renders a component with its __html__() method"""
+    return content.__html__()
+
 
 @dataclass
-class SocialLink(_Component):
+class SocialLink(_ValueComponent):
     """Can be used to create a social media link icon, or just the icon
 
     Notes 
@@ -95,7 +473,7 @@ class SocialLink(_Component):
 
 
 @dataclass
-class Link(_Component):
+class Link(_ValueComponent):
     """A component for generating web links
 
     Attributes
@@ -166,16 +544,16 @@ class Code(_Component):
         str
             The escaped string of content
         """
-        self.content = self.content.replace("<", "&lt").replace(">", "&gt").replace("&", "&amp")
-        return self.content
+        return escape(self.content, quote=False)
 
 
+    @_memoized
     def __html__(self) -> str:
         return f"""\t\t\t\t\t<pre><code class='language-{self.language.lower()}'>{self._escape()}</code></pre>\n"""
 
 
 @dataclass
-class Icon(_Component):
+class Icon(_ValueComponent):
     """A component that generates an icon
 
     Attributes
@@ -228,6 +606,7 @@ class Footer(_Component):
     links: List[Union[Link, SocialLink]]
 
 
+    @_memoized
     def __html__(self) -> str:
         result =f"""
         <footer>
@@ -246,7 +625,7 @@ class Footer(_Component):
 
 
 @dataclass
-class Button(_Component):
+class Button(_ValueComponent):
     """A component that allows you to add html buttons
 
     Attributes
@@ -338,6 +717,7 @@ class Navbar(_Component):
     links: List[Union[Link, SocialLink]]
 
 
+    @_memoized
     def __html__(self) -> str:
         result =f"""
         <header role="banner">
@@ -413,6 +793,7 @@ class TableOfContents(_Component):
     sections: dict
 
 
+    @_memoized
     def __html__(self) -> str:
         result = "\n\t\t<hr>\n\t\t<div class='toc'>\n\t\t\t<ol>"
         for section_title in self.sections:
@@ -422,7 +803,7 @@ class TableOfContents(_Component):
 
 
 @dataclass
-class Video(_Component):
+class Video(_ValueComponent):
     """A component that allows you to embed a youtube video
 
     Attributes
@@ -446,7 +827,7 @@ class Video(_Component):
         return f"""\n\t\t\t\t<div class='embed'>\n\t\t\t\t\t<iframe src='https://www.youtube.com/embed/{self.video_id}' frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen ></iframe>\n\t\t\t\t</div> """
 
 @dataclass
-class Image(_Component):
+class Image(_ValueComponent):
     """A component to include images
 
     Attributes
@@ -468,7 +849,7 @@ class Image(_Component):
 
     Notes
     -----
-    - All images must be included in the same directory as the presentation source file under /img or /images
+    - All images must be included in the same directory as the presentation source file under /img or /images (or in Presentation.asset_folder)
 
     Examples
     --------
@@ -531,27 +912,358 @@ class Grid(_Component):
         self.contents = contents
 
     def __html__(self):
-        result = "\n\t\t\t\t<div class='grid'>"
+        result = "\n\t\t\t\t<div class='grid'>\n"
         for content in self.contents:
-            if type(content) == str:
-                result += f"\n\t\t\t\t\t<div class='column'><p>{content}</p></div>\n"
-            elif isinstance(content, _Component):
-                result += "\n\t\t\t\t\t<div class='column'>"
-                result += content.__html__()
-                result += "</div>"
-            elif type(content) == list:
-                result += "\n\t\t\t\t\t<div class='column'>"
+            result += "\t\t\t\t\t<div class='column'>\n"
+            if isinstance(content, (list, tuple)): # Lists at the top level of a grid are a column of stacked content
                 for subcontent in content:
-                    if isinstance(subcontent, _Component):
-                        result += subcontent.__html__()
-                    elif type(subcontent) == str:
-                        result += f"\n\t\t\t\t\t<p>{subcontent}</p>\n"
-                    elif type(subcontent) == list:
-                        result += "\n\t\t\t\t\t<ul>"
-                        for point in subcontent:
-                            result += f"\n\t\t\t\t\t<li>{point}</li>\n"
-                        result += "\n\t\t\t\t\t</ul>"
-                result += "\n\t\t\t\t\t</div>"
+                    result += render(subcontent)
             else:
-                raise ValueError(f"Provided content to Grid was {type(content)}, which is not List, Component or string")
-        return result
\ No newline at end of file
+                result += render(content)
+            result += "\t\t\t\t\t</div>\n"
+        result += "\t\t\t\t</div>\n"
+        return result
+
+
+def _downsample_lttb(x:"numpy.ndarray", y:"numpy.ndarray", points:int) -> "numpy.ndarray":
+    """Returns the indices of the points picked by the largest triangle three buckets algorithm (keeps the shape of a line)"""
+    import numpy
+    edges = numpy.linspace(1, len(x) - 1, points - 1).astype(int)
+    selected = numpy.empty(points, dtype=int)
+    selected[0], selected[-1] = 0, len(x) - 1
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        previous = selected[bucket]
+        areas = numpy.abs((x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        selected[bucket + 1] = start + int(areas.argmax())
+    return selected
+
+
+def _downsample_minmax(y:"numpy.ndarray", points:int) -> "numpy.ndarray":
+    """Returns the indices of the first and last point, and the lowest and highest point of each bucket between them (keeps every spike)"""
+    import numpy
+    inner = y[1:-1]
+    bucket_count = (points - 2) // 2
+    if not bucket_count: # Only room for one point between the first and last, keep the one furthest from the mean
+        middle = [1 + int(numpy.abs(inner - inner.mean()).argmax())]
+    else:
+        bucket_size = ceil(len(inner) / bucket_count)
+        padded = numpy.full(bucket_size * ceil(len(inner) / bucket_size), numpy.nan)
+        padded[:len(inner)] = inner
+        buckets = padded.reshape(-1, bucket_size)
+        offsets = 1 + numpy.arange(len(buckets)) * bucket_size
+        middle = numpy.concatenate((offsets + numpy.nanargmin(buckets, axis=1), offsets + numpy.nanargmax(buckets, axis=1)))
+    return numpy.unique(numpy.concatenate(([0], middle, [len(y) - 1])))
+
+
+def downsample(x:Sequence[float], y:Sequence[float], points:int = 500, method:str = "lttb") -> Tuple[List[float], List[float]]:
+    """Reduces a data series to at most points points, keeping its shape
+
+    Parameters
+    ----------
+    x : (Sequence[float] or numpy.ndarray)
+        The x values, in increasing order
+
+    y : (Sequence[float] or numpy.ndarray)
+        The y values
+
+    points : (int)
+        The most points to keep, at least 3 (the first and last point are always kept), optional and defaults to 500
+
+    method : (str)
+        'lttb' (largest triangle three buckets, best for lines) or 'minmax' (the lowest and highest point of each bucket, keeps every spike), optional and defaults to 'lttb'
+
+    Returns
+    -------
+    Tuple[List[float], List[float]]
+        The x and y values of the kept points, points that aren't finite (i.e. nan) are removed
+
+    Raises
+    ------
+    ValueError
+        If x and y are not the same length, points is less than 3, or method is not 'lttb' or 'minmax'
+
+    Notes
+    -----
+    - If numpy is installed the series is downsampled with vectorized numpy operations, otherwise every nth point is kept
+
+    Examples
+    --------
+    ### Reduce a million points to 500
+    ```
+    import numpy
+    from ezprez.components import downsample
+
+    x = numpy.arange(1_000_000)
+    x, y = downsample(x, numpy.sin(x / 10_000), 500)
+    ```
+    """
+    if method not in ("lttb", "minmax"):
+        raise ValueError(f"Downsampling method must be 'lttb' or 'minmax', got {method}")
+    if len(x) != len(y):
+        raise ValueError(f"x and y must be the same length, got {len(x)} and {len(y)}")
+    if points < 3:
+        raise ValueError(f"Can't downsample to less than 3 points, got {points}")
+    try:
+        import numpy # Imported here, so importing ezprez doesn't load numpy for decks without a Chart
+    except ImportError:
+        numpy = False
+    if numpy:
+        x, y = numpy.asarray(x, dtype=float), numpy.asarray(y, dtype=float)
+        finite = numpy.isfinite(x) & numpy.isfinite(y)
+        x, y = x[finite], y[finite]
+        if len(x) > points:
+            selected = _downsample_lttb(x, y, points) if method == "lttb" else _downsample_minmax(y, points)
+            x, y = x[selected], y[selected]
+        return x.tolist(), y.tolist()
+    kept = [(float(x_value), float(y_value)) for x_value, y_value in zip(x, y) if isfinite(float(x_value)) and isfinite(float(y_value))]
+    if len(kept) > points:
+        step = (len(kept) - 1) / (points - 1)
+        kept = [kept[round(index * step)] for index in range(points)]
+    return [point[0] for point in kept], [point[1] for point in kept]
+
+
+class Chart(_Component):
+    """A component that renders a line, bar or scatter chart of a data series as an inline svg
+
+    Attributes
+    ----------
+    title: (str)
+        The title of the chart
+
+    x: (List[float])
+        The x values of the (downsampled) series
+
+    y: (List[float])
+        The y values of the (downsampled) series
+
+    kind: (str)
+        The type of chart, either 'line', 'bar' or 'scatter', optional and defaults to 'line'
+
+    color: (str)
+        The color of the line, bars or points, optional and defaults to '#4dd'
+
+    width: (int)
+        The width of the chart in pixels, optional and defaults to 800
+
+    height: (int)
+        The height of the chart in pixels, optional and defaults to 400
+
+    Notes
+    -----
+    - y (and x) can be lists, tuples or numpy arrays, if x is False the index of each value is used
+    - The series is downsampled to max_points points (at least 3, see downsample()) when the Chart is created, so large arrays aren't kept in memory or rendered
+    - Use downsample_method='minmax' to keep every spike (i.e. for latency metrics)
+
+    Examples
+    --------
+    ### Add a line chart of a million measurements
+    ```
+    import numpy
+    from ezprez.core import Slide
+    from ezprez.components import Chart
+
+    Slide("Requests per second", Chart("Requests per second", numpy.random.poisson(300, 1_000_000)))
+    ```
+
+    ### Add a bar chart
+    ```
+    from ezprez.core import Slide
+    from ezprez.components import Chart
+
+    Slide("Releases", Chart("Releases per year", [3, 5, 8], x=[2019, 2020, 2021], kind="bar"))
+    ```
+    """
+    def __init__(self, title:str, y:Sequence[float], x:Union[bool, Sequence[float]] = False, kind:str = "line", color:str = "#4dd", width:int = 800, height:int = 400, max_points:int = 500, downsample_method:str = "lttb"):
+        if kind not in ("line", "bar", "scatter"):
+            raise ValueError(f"Chart kind must be 'line', 'bar' or 'scatter', got {kind}")
+        if max_points < 3:
+            raise ValueError(f"max_points must be at least 3, got {max_points}")
+        self.title = title
+        self.x, self.y = downsample(x if x is not False else range(len(y)), y, max_points, downsample_method)
+        self.kind = kind
+        self.color = color
+        self.width = width
+        self.height = height
+
+    def __html__(self) -> str:
+        padding = 40
+        result = f"""\t\t\t\t\t<svg class='chart' viewBox='0 0 {self.width} {self.height}' width='{self.width}' height='{self.height}' role='img' aria-label='{escape(self.title)}'>\n"""
+        result += f"""\t\t\t\t\t\t<title>{escape(self.title)}</title>\n"""
+        if self.y:
+            x_low, x_high = min(self.x), max(self.x)
+            y_low, y_high = (min(min(self.y), 0), max(max(self.y), 0)) if self.kind == "bar" else (min(self.y), max(self.y)) # Bars start at 0
+            inset = (self.width - 2 * padding) / len(self.y) / 2 if self.kind == "bar" else 0 # Keeps the first and last bars inside the axes
+            x_scale = (self.width - 2 * padding - 2 * inset) / ((x_high - x_low) or 1)
+            y_scale = (self.height - 2 * padding) / ((y_high - y_low) or 1)
+            points = [(padding + inset + (x_value - x_low) * x_scale, self.height - padding - (y_value - y_low) * y_scale) for x_value, y_value in zip(self.x, self.y)]
+
+            result += f"""\t\t\t\t\t\t<path d='M{padding} {padding}V{self.height - padding}H{self.width - padding}' fill='none' stroke='currentColor' stroke-opacity='0.4'/>\n"""
+            result += f"""\t\t\t\t\t\t<text x='{padding - 4}' y='{padding}' text-anchor='end' font-size='12'>{y_high:g}</text>\n"""
+            result += f"""\t\t\t\t\t\t<text x='{padding - 4}' y='{self.height - padding}' text-anchor='end' font-size='12'>{y_low:g}</text>\n"""
+            result += f"""\t\t\t\t\t\t<text x='{padding}' y='{self.height - padding + 16}' text-anchor='middle' font-size='12'>{x_low:g}</text>\n"""
+            result += f"""\t\t\t\t\t\t<text x='{self.width - padding}' y='{self.height - padding + 16}' text-anchor='middle' font-size='12'>{x_high:g}</text>\n"""
+            if self.kind == "line":
+                result += f"""\t\t\t\t\t\t<polyline points='{" ".join(f"{x:.1f},{y:.1f}" for x, y in points)}' fill='none' stroke='{escape(self.color)}' stroke-width='2'/>\n"""
+            elif self.kind == "scatter":
+                result += f"""\t\t\t\t\t\t<g fill='{escape(self.color)}'>{"".join(f"<circle cx='{x:.1f}' cy='{y:.1f}' r='3'/>" for x, y in points)}</g>\n"""
+            else:
+                bar_width = max(inset * 1.6, 1)
+                base = self.height - padding - (0 - y_low) * y_scale
+                bars = "".join(f"<rect x='{x - bar_width / 2:.1f}' y='{min(y, base):.1f}' width='{bar_width:.1f}' height='{abs(base - y):.1f}'/>" for x, y in points)
+                result += f"""\t\t\t\t\t\t<g fill='{escape(self.color)}'>{bars}</g>\n"""
+        result += "\t\t\t\t\t</svg>\n"
+        return result
+
+
+_PAGE_BREAK = object()
+"""Yielded by Table._iter_html() between pages, Slide starts a new section (with the same heading) when it sees one"""
+
+
+class Table(_Component):
+    """A component that renders rows of data (lists, dictionaries, a DataFrame or a .csv file) as a table, optionally split across slides
+
+    Attributes
+    ----------
+    rows: (Iterable, DataFrame or str)
+        The rows of the table, an iterable of lists/tuples or dictionaries, a DataFrame-like object (anything with columns and itertuples()), or the path to a .csv file
+
+    columns: (List[str] or False)
+        The column headings, optional and defaults to False (see notes)
+
+    caption: (str)
+        A caption for the table, optional and defaults to ''
+
+    rows_per_slide: (int or False)
+        The most rows to put on one slide, the rest are put on extra slides with the same heading, optional and defaults to False (every row is on one slide)
+
+    Notes
+    -----
+    - If columns is False they're taken from the first row of a .csv file, the columns of a DataFrame, or the keys of the first dictionary; tables of lists/tuples have no heading row
+    - Rows are read while the slide is exported and streamed into index.html a row at a time, so they're never all in memory (unless the rows are a list)
+    - Each export reads the rows again, so a generator of rows can only be exported once (use a list, a DataFrame or a .csv file)
+    - Serializing a table of a generator of rows (i.e. with to_bytes()) reads them into a list, which replaces the generator
+    - Cells are escaped, except components (i.e. a Link) which are rendered as html
+    - rows_per_slide only applies to tables directly in a Slide; content before the table is on the first slide, and content after it is on the last
+    - Every extra slide shifts the number of the slides after it (i.e. #slide=N links)
+
+    Examples
+    --------
+    ### Add a table of speakers
+    ```
+    from ezprez.core import Slide
+    from ezprez.components import Table
+
+    Slide("Speakers", Table([{"name": "Kieran", "talk": "ezprez"}, {"name": "Jane", "talk": "Rust"}]))
+    ```
+
+    ### Split a .csv file with 50,000 rows across slides of 20 rows
+    ```
+    from ezprez.core import Slide
+    from ezprez.components import Table
+
+    Slide("Results", Table("results.csv", caption="Benchmark results", rows_per_slide=20))
+    ```
+    """
+    def __init__(self, rows:Union[Iterable, str], columns:Union[bool, List[str]] = False, caption:str = "", rows_per_slide:Union[bool, int] = False):
+        if isinstance(rows, str) and not os.path.isfile(rows):
+            raise FileNotFoundError(f"Could not find table file {rows}")
+        if rows_per_slide is not False and rows_per_slide < 1:
+            raise ValueError(f"rows_per_slide must be at least 1, got {rows_per_slide}")
+        self.rows = os.path.abspath(rows) if isinstance(rows, str) else rows
+        self.columns = list(columns) if columns else False
+        self.caption = caption
+        self.rows_per_slide = rows_per_slide
+
+    def _serialized_attributes(self) -> dict:
+        """Stores the rows as a list, so DataFrames and generators (which can't be serialized) are read into lists"""
+        if self.one_shot: # Keep the rows that were read, so the table still renders them
+            self.rows = list(self.rows)
+        if isinstance(self.rows, (str, list)):
+            return vars(self)
+        columns, rows = self._iter_rows()
+        return {**vars(self), "rows": [list(row) for row in rows], "columns": columns}
+
+    @property
+    def one_shot(self) -> bool:
+        """Whether the rows are an iterator (i.e. a generator) that can only be read once"""
+        if isinstance(self.rows, str) or hasattr(self.rows, "itertuples"):
+            return False
+        return iter(self.rows) is self.rows
+
+    def _iter_rows(self) -> Tuple[Union[bool, List[str]], Iterator[Sequence]]:
+        """Returns the columns of the table, and an iterator of its rows as sequences of cells"""
+        columns = self.columns
+        if isinstance(self.rows, str):
+            def _read_csv():
+                with open(self.rows, newline="", encoding="utf-8") as csv_file:
+                    yield from csv.reader(csv_file)
+            rows = _read_csv()
+            if not columns:
+                columns = next(rows, [])
+            return columns, rows
+        if hasattr(self.rows, "itertuples") and hasattr(self.rows, "columns"): # DataFrame-like
+            return columns or [str(column) for column in self.rows.columns], self.rows.itertuples(index=False, name=None)
+
+        rows = iter(self.rows)
+        first_row = next(rows, None)
+        if first_row is None:
+            return columns, iter(())
+        rows = chain((first_row,), rows)
+        if isinstance(first_row, dict):
+            columns = columns or list(first_row)
+            return columns, ([row.get(column, "") for column in columns] for row in rows)
+        return columns, rows
+
+    def __len__(self) -> int:
+        """Returns the number of rows (reading them, except for lists)"""
+        if isinstance(self.rows, list):
+            return len(self.rows)
+        return sum(1 for _ in self._iter_rows()[1])
+
+    @staticmethod
+    def _render_cell(cell) -> str:
+        if isinstance(cell, _Component):
+            return cell.__html__()
+        return "" if cell is None else escape(str(cell))
+
+    def _iter_html(self, page_breaks:bool = False, sample:bool = False) -> Generator[str, None, None]:
+        """Generates the markup of the table a row at a time
+
+        Parameters
+        ----------
+        page_breaks : (bool)
+            Whether to split the table into a table per rows_per_slide rows, with _PAGE_BREAK yielded between them, optional and defaults to False
+
+        sample : (bool)
+            Whether to only generate the first row (an empty row if the rows are one_shot, so they aren't read), used to find the
+            tags and classes the critical css needs, optional and defaults to False
+        """
+        if sample and self.one_shot:
+            columns, rows = self.columns, iter(((None,),))
+        else:
+            columns, rows = self._iter_rows()
+            if sample:
+                rows = islice(rows, 1)
+        opening = "\t\t\t\t\t<table>\n"
+        if self.caption:
+            opening += f"\t\t\t\t\t\t<caption>{escape(self.caption)}</caption>\n"
+        if columns:
+            opening += f"\t\t\t\t\t\t<thead><tr>{''.join(f'<th>{escape(str(column))}</th>' for column in columns)}</tr></thead>\n"
+        opening += "\t\t\t\t\t\t<tbody>\n"
+        closing = "\t\t\t\t\t\t</tbody>\n\t\t\t\t\t</table>\n"
+
+        yield opening
+        for row_number, row in enumerate(rows):
+            if page_breaks and self.rows_per_slide and row_number and not row_number % self.rows_per_slide:
+                yield closing
+                yield _PAGE_BREAK
+                yield opening
+            yield f"\t\t\t\t\t\t\t<tr>{''.join(f'<td>{self._render_cell(cell)}</td>' for cell in row)}</tr>\n"
+        yield closing
+
+    def __html__(self) -> str:
+        return "".join(self._iter_html())
+
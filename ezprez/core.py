@@ -5,6 +5,9 @@ Classes
 #### Slide
 The class that is used to generate slides that are fed into the Presentation object
 
+#### RecordSlides
+A lazy collection of slides generated from records (i.e. database rows) with a template
+
 ####Presentation
 The class for defining the presentation configuration, and primary entrypoint to exporting presentations
 
@@ -29,22 +32,33 @@ prez.export(".", force=True, folder_name="Presentation")
 """
 # Standard lib dependencies
 import os                                   # Used in path validation
-from datetime import datetime               # Used to get date for export
-from typing import Union, List              # Used to enrich type hints in methods
-from shutil import copyfile, copytree, rmtree         # Used to do high level filesystem operations
+import gzip                                 # Used to write .tar.gz archives with a fixed timestamp
+import tarfile                              # Used to stream exports into .tar.gz archives
+import zipfile                              # Used to stream exports into .zip archives
+import csv                                  # Used to read slide records from .csv files
+import json                                 # Used to read slide records from .jsonl files
+import threading                            # Used to make Slide.all safe to use from multiple threads
+from tempfile import SpooledTemporaryFile   # Used to hand generated files to tarfile
+from datetime import datetime, timezone     # Used to get date for export
+from shutil import copy2, rmtree            # Used to do high level filesystem operations
+from itertools import chain                 # Used to put the first slide back after it's used to generate the head
+from typing import Union, List, BinaryIO, Callable, Dict, Generator, Iterable, Iterator, Set  # Used to enrich type hints in methods
 from dataclasses import dataclass, field    # Used to make class generation faster and more efficient
 
 # Internal dependencies
 from ezprez.components import *             # Used for type checking in content generation
-from ezprez.components import _Component    # Used for type checking in content generation
+from ezprez.components import _Component, _PAGE_BREAK # Used for type checking in content generation, and splitting tables across slides
+from ezprez.vendor import GOOGLE_FONTS_URL, FONT_AWESOME_URL, FONT_AWESOME_INTEGRITY, HIGHLIGHT_CSS_URL, HIGHLIGHT_JS_URL, vendor as vendor_assets # Used to link (or self-host) third-party assets
+from ezprez.serialize import Serializable   # Used to serialize presentations and slides with to_bytes()/from_bytes()
+from ezprez.audit import Budget, Report, analyze as analyze_presentation # Used to check presentations against performance budgets
+from ezprez.search import SEARCH_INDEX_PATH, SEARCH_SCRIPT, SearchIndex # Used to export a full-text search index of the slides
+from ezprez.assets import get_webslides_folder, iter_folder, read_file, fingerprint as fingerprint_files, prune as prune_files, rewrite_references, inline_sprite, defer_images, LAZY_IMAGES_SCRIPT, LAZY_EAGER_SLIDES, precache, critical_css # Used to locate, read and post-process the cached webslides files on export
 
 # External Dependencies
 from tqdm import tqdm                       # Used for progress bars
-from elevate import elevate                 # Used for any protected folder access such as system wide python installs or exports
-from pystall.core import ZIPResource, build # Used to download webslides from the latest version and extract it for use on export
 
 
-class Slide:
+class Slide(Serializable):
     """The class that is used to generate slides that are fed into the Presentation object
 
     Class Variables
@@ -52,6 +66,9 @@ class Slide:
     all: (List[Slide])
         Contains all slide instances that have been instatiated, accessed through Slide.all
 
+    lock: (threading.Lock)
+        Used to make changes to Slide.all safe when slides are created from multiple threads
+
     Attributes
     ----------
     heading: (str)
@@ -104,6 +121,7 @@ class Slide:
     ```
     """
     all = []
+    lock = threading.Lock()
 
     def __init__(self, heading:str, *contents:Union[str, list, tuple, _Component], background:Union[bool,str] = False, horizontal_alignment:str = "center", vertical_alignment:str = "center", image:Union[bool, Image]=False, animation:str = "fadeIn" ):
         # Assign class attributes
@@ -116,42 +134,167 @@ class Slide:
         self.animation = animation
 
         # Append slide to the class variable Slide.all
-        Slide.all.append(self)
+        with Slide.lock:
+            Slide.all.append(self)
+
+    def _generate_content(self, default_background:Union[bool, str] = False, sample:bool = False, page_breaks:bool = False):
+        """Generates the necessary html with the provided contents, a Table with rows_per_slide set is streamed a row at a time and split into a section per page
+
+        Parameters
+        ----------
+        default_background : (bool or str)
+            The background to use if Slide.background isn't set, optional and defaults to False
+
+        sample : (bool)
+            Whether to only generate the first row of each Table (see Table._iter_html()), used to generate the critical css, optional and defaults to False
 
-    def _generate_content(self):
-        """Generates the necessary html with the provided contents"""
-        result = f"\n\t\t\t<section class='bg-{self.background} slide-{self.vertical_alignment}'>"
+        page_breaks : (bool)
+            Whether to yield _PAGE_BREAK before each extra section a Table adds, used to count the rendered sections, optional and defaults to False
+        """
+        opening = f"\n\t\t\t<section class='bg-{self.background or default_background} slide-{self.vertical_alignment}'>"
         
         if self.image:
-            result += f"\n\t\t\t\t<span class='background' style='background-image:url(\"./static/images/{self.image.filename}\")'></span>"
-        result += f"\n\t\t\t\t<div class='wrap {self.animation}'>\n\t\t\t\t\t<div class='content-{self.horizontal_alignment}'>\n\t\t\t\t\t<h2>{self.heading}</h2>\n"
-        
+            opening += f"\n\t\t\t\t<span class='background' style='background-image:url(\"./static/images/{self.image.filename}\")'></span>"
+        opening += f"\n\t\t\t\t<div class='wrap {self.animation}'>\n\t\t\t\t\t<div class='content-{self.horizontal_alignment}'>\n\t\t\t\t\t<h2>{self.heading}</h2>\n"
+        closing = "\n\t\t\t\t\t</div>\n\t\t\t\t</div>\n\t\t\t</section>\n"
+
+        result = opening
         for content in self.contents:
-            if type(content) == str: # If the current peice of content is a str
-                result += f"\t\t\t\t\t<p>{content}</p>\n"
-
-            elif type(content) == list or type(content) == tuple: # If the current peice of content is a list or tuple
-                result += f"\t\t\t\t\t<div class='grid {'content-' + self.horizontal_alignment if not self.horizontal_alignment == 'right' else ''}'>\n\t\t\t\t\t\t\t<ul style='text-align:justify;'>\n"
-                for bullet_point in content: # Iterate through each element in the list/tuple
-                    result += f"\t\t\t\t\t\t\t\t<li>{bullet_point}</li>\n"
-                result += "\t\t\t\t\t</div>\n\t\t\t\t\t\t\t</ul>\n"
-            elif isinstance(content, _Component) or type(SocialLink): # If the current peice of content is a Component
-                result += content.__html__()
-        result += "\n\t\t\t\t\t</div>\n\t\t\t\t</div>\n\t\t\t</section>\n"
+            if isinstance(content, Table):
+                yield result
+                result = ""
+                for chunk in content._iter_html(page_breaks=True, sample=sample):
+                    if chunk is _PAGE_BREAK:
+                        yield closing
+                        if page_breaks:
+                            yield _PAGE_BREAK
+                        yield opening
+                    else:
+                        yield chunk
+            else:
+                result += render(content, alignment=self.horizontal_alignment)
+        result += closing
 
         yield result
 
 
-    def __html__(self):
-        """Generates the markup for each slide"""
+    def __html__(self, default_background:Union[bool, str] = False):
+        """Generates the markup for each slide, using default_background if Slide.background isn't set"""
         result = ""
-        for content in self._generate_content():
+        for content in self._generate_content(default_background):
             result+= content
         return result
 
 
+class RecordSlides:
+    """A lazy collection of slides generated from records (i.e. database rows) with a template
+
+    Attributes
+    ----------
+    records: (Iterable)
+        The records to generate slides from, each one is passed to template
+
+    template: (Callable)
+        A function that takes a single record and returns a Slide
+
+    Notes
+    -----
+    - Slides are only created while iterating, and are not added to Slide.all, so memory stays flat no matter how many records there are
+    - Each iteration iterates records again, so a generator of records can only be exported once (use a list, or from_csv()/from_jsonl())
+    - Iterating one-shot records (i.e. a generator) a second time raises a ValueError instead of generating no slides
+    - len() is the number of records if they have a length (lists, and the records of from_csv()/from_jsonl()), otherwise it raises a TypeError
+    - Only slides the template creates are removed from Slide.all, a slide that already existed is returned as is
+    - This is what Presentation.from_records(), Presentation.from_csv() and Presentation.from_jsonl() set as Presentation.slides
+
+    Examples
+    --------
+    ### Generate a slide per row of a database query
+    ```
+    from ezprez.core import Slide, RecordSlides
+
+    slides = RecordSlides(cursor.execute("SELECT name, bio FROM speakers"), lambda row: Slide(row[0], row[1]))
+    ```
+    """
+    def __init__(self, records:Iterable, template:Callable[[object], Slide]):
+        self.records = records
+        self.template = template
+        self._used = False
+
+
+    @property
+    def one_shot(self) -> bool:
+        """Whether records is an iterator (i.e. a generator) that can only be iterated once"""
+        return iter(self.records) is self.records
+
+
+    def __len__(self) -> int:
+        """Returns the number of records (and so slides), without generating the slides
+
+        Raises
+        ------
+        TypeError
+            If the records don't have a length (i.e. a generator), since counting them would use them up
+        """
+        if not hasattr(self.records, "__len__"):
+            raise TypeError(f"Can't count the slides of records without a length ({type(self.records).__name__}), pass a list of records (or use from_csv()/from_jsonl())")
+        return len(self.records)
+
+
+    def __iter__(self) -> Iterator[Slide]:
+        if self.one_shot:
+            if self._used:
+                raise ValueError("The records are an iterator (i.e. a generator) that has already been used up, pass a list of records (or use from_csv()/from_jsonl()) to use them more than once")
+            self._used = True
+        for record in self.records:
+            with Slide.lock:
+                existing = len(Slide.all)
+            slide = self.template(record)
+            with Slide.lock: # Don't keep a reference to a slide the template created after it's rendered
+                for index in range(len(Slide.all) - 1, existing - 1, -1):
+                    if Slide.all[index] is slide:
+                        del Slide.all[index]
+                        break
+            yield slide
+
+
+class _CSVRecords:
+    """Re-iterable records of a .csv file, each one is a dictionary of {column:value}'s"""
+    def __init__(self, path:str, **reader_options):
+        self.path = os.path.abspath(path)
+        self.reader_options = reader_options
+
+
+    def __iter__(self) -> Iterator[dict]:
+        with open(self.path, newline="", encoding="utf-8") as csv_file:
+            yield from csv.DictReader(csv_file, **self.reader_options)
+
+
+    def __len__(self) -> int:
+        """Returns the number of records, reading the file"""
+        return sum(1 for _ in self)
+
+
+class _JSONLRecords:
+    """Re-iterable records of a .jsonl file (one json value per line)"""
+    def __init__(self, path:str):
+        self.path = os.path.abspath(path)
+
+
+    def __iter__(self) -> Iterator[object]:
+        with open(self.path, encoding="utf-8") as jsonl_file:
+            for line in jsonl_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+    def __len__(self) -> int:
+        """Returns the number of records, reading the file (without parsing the json)"""
+        with open(self.path, encoding="utf-8") as jsonl_file:
+            return sum(1 for line in jsonl_file if line.strip())
+
+
 @dataclass
-class Presentation:
+class Presentation(Serializable):
     """The class for defining the presentation configuration, and primary entrypoint to exporting presentations
 
     Attributes
@@ -165,7 +308,7 @@ class Presentation:
     url: (str)
         The canonical URL the presentation will be deployed at
 
-    slides: List[Slide]
+    slides: List[Slide] or RecordSlides
         The slides to generate the presentation with, optional and defaults to Slide.all
 
     background: (str)
@@ -192,11 +335,33 @@ class Presentation:
     footer: (Footer or False)
         The footer for the site, optional defaults to False
 
+    asset_folder: (str or False)
+        The folder to export images from, optional defaults to False (see notes)
+
+    updated_time: (datetime or False)
+        The time to use as the presentation's last update, optional defaults to False (see notes)
+
+    Notes
+    -----
+    - If updated_time is False the SOURCE_DATE_EPOCH environment variable is used if it's set, otherwise the time of the export
+    - When updated_time or SOURCE_DATE_EPOCH is set exports are reproducible, every file's modification time is set to it so exporting an unchanged presentation gives byte-identical files
+    - If asset_folder is False the img (or images) folder in the current directory is used, it is resolved when the Presentation is created so exports don't depend on the working directory
+    - Rendering does not modify the slides, so separate presentations can be exported from multiple threads at the same time
+
     Methods
     -------
     export:
         Exports the presentation files
 
+    from_records, from_csv, from_jsonl:
+        Creates a presentation with a slide per record, that are generated lazily while exporting
+
+    analyze:
+        Reports the image sizes, videos, DOM size and external requests of the presentation, and checks them against a budget
+
+    to_bytes, from_bytes:
+        Serializes the presentation (and its slides) to a compact versioned format, and recreates it (see ezprez.serialize)
+
     Examples
     --------
     ### Creating a presentation and exporting it to ./Presentation
@@ -233,7 +398,141 @@ class Presentation:
     favicon: Union[bool, Image] = False
     navbar: Union[bool, Navbar] = False
     footer: Union[bool, Footer] = False
-    slides: List[Slide] = field(default_factory=lambda: Slide.all) 
+    slides: Union[List[Slide], RecordSlides] = field(default_factory=lambda: Slide.all) 
+    asset_folder: Union[bool, str] = False
+    updated_time: Union[bool, datetime] = False
+
+
+    def __post_init__(self):
+        # Resolve the image folder once, so exports don't depend on the working directory at export time
+        if self.asset_folder:
+            self.asset_folder = os.path.abspath(self.asset_folder)
+        else:
+            for image_folder in ("img", "images"):
+                if os.path.isdir(image_folder):
+                    self.asset_folder = os.path.abspath(image_folder)
+                    break
+
+
+    def _serialized_attributes(self) -> dict:
+        """Stores slides as a list, so RecordSlides (which can't be serialized) are generated into slides"""
+        attributes = vars(self)
+        if not isinstance(self.slides, list):
+            attributes = {**attributes, "slides": list(self.slides)}
+        return attributes
+
+
+    @classmethod
+    def from_records(cls, records:Iterable, template:Callable[[object], Slide], *args, **kwargs) -> "Presentation":
+        """Creates a presentation with a slide per record, that are generated lazily while exporting
+
+        Parameters
+        ----------
+        records : (Iterable)
+            The records to generate slides from (i.e. database rows)
+
+        template : (Callable)
+            A function that takes a single record and returns a Slide
+
+        args, kwargs
+            The rest of the arguments to create the Presentation with (i.e. title, description, url)
+
+        Returns
+        -------
+        Presentation
+            The presentation, with Presentation.slides set to a RecordSlides
+
+        Notes
+        -----
+        - Slides are rendered straight into the exported index.html one at a time and then discarded, so memory stays flat no matter how many records there are
+        - Each export iterates records again, so a generator of records can only be exported once (exporting it again, or analyze(), raises a ValueError)
+
+        Examples
+        --------
+        ### Create a slide per speaker
+        ```
+        from ezprez.core import Presentation, Slide
+
+        speakers = [{"name": "Kieran", "bio": "Writes python"}, {"name": "Jane", "bio": "Writes rust"}]
+
+        prez = Presentation.from_records(speakers, lambda speaker: Slide(speaker["name"], speaker["bio"]), title, description, url)
+        prez.export(".", force=True)
+        ```
+        """
+        return cls(*args, slides=RecordSlides(records, template), **kwargs)
+
+
+    @classmethod
+    def from_csv(cls, path:str, template:Callable[[dict], Slide], *args, **kwargs) -> "Presentation":
+        """Creates a presentation with a slide per row of a .csv file, that are generated lazily while exporting
+
+        Parameters
+        ----------
+        path : (str)
+            The path to the .csv file, the first row must be the column names
+
+        template : (Callable)
+            A function that takes a row as a dictionary of {column:value}'s and returns a Slide
+
+        args, kwargs
+            The rest of the arguments to create the Presentation with (i.e. title, description, url)
+
+        Returns
+        -------
+        Presentation
+            The presentation, the file is read again (one row at a time) on each export
+
+        Examples
+        --------
+        ### Create a slide per row of speakers.csv
+        ```
+        from ezprez.core import Presentation, Slide
+
+        prez = Presentation.from_csv("speakers.csv", lambda row: Slide(row["name"], row["bio"]), title, description, url)
+        ```
+        """
+        return cls.from_records(_CSVRecords(path), template, *args, **kwargs)
+
+
+    @classmethod
+    def from_jsonl(cls, path:str, template:Callable[[object], Slide], *args, **kwargs) -> "Presentation":
+        """Creates a presentation with a slide per line of a .jsonl file, that are generated lazily while exporting
+
+        Parameters
+        ----------
+        path : (str)
+            The path to the .jsonl file (one json value per line)
+
+        template : (Callable)
+            A function that takes a parsed line and returns a Slide
+
+        args, kwargs
+            The rest of the arguments to create the Presentation with (i.e. title, description, url)
+
+        Returns
+        -------
+        Presentation
+            The presentation, the file is read again (one line at a time) on each export
+
+        Examples
+        --------
+        ### Create a slide per line of speakers.jsonl
+        ```
+        from ezprez.core import Presentation, Slide
+
+        prez = Presentation.from_jsonl("speakers.jsonl", lambda speaker: Slide(speaker["name"], speaker["bio"]), title, description, url)
+        ```
+        """
+        return cls.from_records(_JSONLRecords(path), template, *args, **kwargs)
+
+
+    def _pinned_time(self) -> Union[bool, datetime]:
+        """Returns Presentation.updated_time, or the time in the SOURCE_DATE_EPOCH environment variable, or False if neither is set"""
+        if self.updated_time:
+            return self.updated_time
+        if os.environ.get("SOURCE_DATE_EPOCH"):
+            return datetime.fromtimestamp(int(os.environ["SOURCE_DATE_EPOCH"]), tz=timezone.utc)
+        return False
 
 
     def _generate_favicon_markup(self):
@@ -285,22 +584,228 @@ class Presentation:
             return ""
 
 
+    def _bundle(self) -> Dict[str, str]:
+        """Collects the static files of an export (webslides and images) without copying them
+
+        Returns
+        -------
+        Dict[str, str]
+            A dictionary of {relative_path:source_path}'s for every file to export, except index.html
+        """
+        bundle = {}
+        for relative_path, source_path in iter_folder(get_webslides_folder()):
+            if relative_path != "index.html":
+                bundle[relative_path] = source_path
+
+        # Image files
+        if self.asset_folder and os.path.isdir(self.asset_folder):
+            for file_name in os.listdir(self.asset_folder):
+                if os.path.isfile(os.path.join(self.asset_folder, file_name)):
+                    bundle[f"static/images/{file_name}"] = os.path.join(self.asset_folder, file_name)
+        return bundle
+
+
+    def _components(self) -> Generator[_Component, None, None]:
+        """Yields every component used outside of the slides (the navbar, the footer, and the images)"""
+        for component in (self.image, self.favicon, self.navbar, self.footer):
+            if component:
+                yield from walk(component)
+
+
+    @staticmethod
+    def _icon_names(components:Iterable[_Component]) -> Set[str]:
+        """Returns the ids of every svg/font icon (i.e. 'fa-heart') used by an Icon or SocialLink in the components"""
+        icon_names = set()
+        for component in components:
+            if isinstance(component, Icon):
+                icon_names.add(component.label)
+            elif isinstance(component, SocialLink):
+                icon_names.add(f"fa-{component.name}")
+        return icon_names
+
+
+    def analyze(self, budget:Union[bool, Budget] = False) -> Report:
+        """Reports the image sizes, videos, DOM size and external requests of the presentation, and checks them against a budget
+
+        Parameters
+        ----------
+        budget : (Budget or False)
+            The limits to check the presentation against, optional and defaults to False (nothing is checked)
+
+        Returns
+        -------
+        Report
+            The results of the analysis, Report.violations lists every budget limit that was exceeded
+
+        Raises
+        ------
+        ValueError
+            If the slides are generated from one-shot records (i.e. a generator), which analyzing would use up before they're exported
+
+        Notes
+        -----
+        - The slides are walked without being rendered, so analyzing is much faster than exporting
+
+        Examples
+        --------
+        ### Stop a build if a presentation has more than 5MB of images or any slide has more than 1MB
+        ```
+        from ezprez.audit import Budget
+
+        report = prez.analyze(Budget(max_image_bytes=5_000_000, max_slide_image_bytes=1_000_000))
+        print(report)
+
+        if report.passed:
+            prez.export(".")
+        ```
+        """
+        if isinstance(self.slides, RecordSlides) and self.slides.one_shot:
+            raise ValueError("Can't analyze slides generated from an iterator of records (i.e. a generator) without using them up, pass a list of records (or use from_csv()/from_jsonl())")
+        return analyze_presentation(self, budget)
+
+
+    def _build(self, fingerprint:bool = False, prune:bool = False, vendor:bool = False, sprite:bool = False, lazy_images:Union[bool, int] = False, offline:bool = False, fast_first_paint:bool = False, search:bool = False) -> Dict[str, Union[str, bytes, Iterator[bytes]]]:
+        """Generates every file of an export, without writing anything to disk
+
+        Parameters
+        ----------
+        fingerprint : (bool)
+            Whether to add a hash of the contents to every css, js, font and image file name, optional and defaults to False
+
+        prune : (bool)
+            Whether to only include the files index.html actually uses, optional and defaults to False
+
+        vendor : (bool)
+            Whether to self-host subsetted copies of the third-party fonts, icons and highlight.js, optional and defaults to False
+
+        sprite : (bool)
+            Whether to inline an svg sprite of only the icons that are used, optional and defaults to False
+
+        lazy_images : (bool or int)
+            Whether to defer loading images after the first LAZY_EAGER_SLIDES slides (see notes), or the number of slides to load images for immediately, optional and defaults to False
+
+        offline : (bool)
+            Whether to add a service worker that precaches the presentation, optional and defaults to False
+
+        fast_first_paint : (bool)
+            Whether to inline the critical css, load stylesheets and scripts without blocking rendering, and only load highlight.js if there's Code, optional and defaults to False
+
+        search : (bool)
+            Whether to export a full-text search index of the slides, and add a search box that opens when / is pressed, optional and defaults to False
+
+        Returns
+        -------
+        Dict[str, str or bytes or Iterator[bytes]]
+            A dictionary of {relative_path:source_path or contents}'s for every file to export, including index.html, sorted by path
+
+        Notes
+        -----
+        - If none of the options need the full html (or the search index), index.html is an iterator that renders the slides one at a time as it's consumed
+        - The slides are only iterated once, the search index and the icons for the sprite are collected while they're rendered
+        - The intro slide, and each extra slide a Table with rows_per_slide adds, count towards the slides lazy_images loads immediately
+        - The search index is added before the other options, so prune keeps it and offline precaches it
+        """
+        files = self._bundle()
+        if not (sprite or vendor or prune or fingerprint or offline or search): # Nothing needs the full html, so stream it one slide at a time
+            files["index.html"] = (chunk.encode() for chunk in self._iter_html(lazy_images, fast_first_paint))
+            return dict(sorted(files.items()))
+
+        index = SearchIndex(self) if search else False
+        icon_names = self._icon_names(self._components()) if sprite else set()
+        def _visit(slide:Slide):
+            """Collects the search terms and icons of each slide while it's rendered"""
+            if search:
+                index.add(slide)
+            if sprite:
+                icon_names.update(self._icon_names(walk(slide.contents)))
+
+        presentation_content = "".join(self._iter_html(lazy_images, fast_first_paint, search, _visit if search or sprite else False))
+        if search:
+            files[SEARCH_INDEX_PATH] = index.to_bytes()
+        if sprite:
+            presentation_content = inline_sprite(presentation_content, icon_names)
+        if vendor:
+            presentation_content, vendored_files = vendor_assets(presentation_content)
+            files.update(vendored_files)
+        if prune:
+            files = prune_files(files, presentation_content)
+        if fingerprint:
+            files, manifest = fingerprint_files(files)
+            presentation_content = rewrite_references(presentation_content, manifest)
+        if offline: # Last, so the hashes match the final files
+            presentation_content, files = precache(files, presentation_content)
+        files["index.html"] = presentation_content.encode()
+        return dict(sorted(files.items()))
+
+
     def __len__(self) -> int:
-        """Returns the number of slides in the presentation"""
+        """Returns the number of slides in the presentation
+
+        Raises
+        ------
+        TypeError
+            If the slides are generated from records without a length (i.e. a generator, see RecordSlides)
+        """
         return len(self.slides)
 
 
-    def __html__(self) -> str:
-        """Generates the index.html file of a presentation using the provided slides"""
-        slides_html = ""
-        slide_iterator = tqdm(self.slides)
-        slide_iterator.set_description_str("Generating slide content")
-        for slide in slide_iterator:
-            if not slide.background:
-                slide.background = self.background
-            slides_html += slide.__html__()
+    def _generate_preload_markup(self, first_slide:Union[bool, Slide] = False) -> str:
+        """Generates the <link rel=preload> hints for the images of the first slides (the intro slide and first_slide)"""
+        images = [self.image] if self.intro and self.image else []
+        if first_slide:
+            images += [first_slide.image] if first_slide.image else []
+            images += [component for component in walk(first_slide.contents) if isinstance(component, Image)]
+        result = "<!-- Preload the first slide's images -->"
+        for filename in dict.fromkeys(image.filename for image in images):
+            result += f"\n        <link rel='preload' as='image' href='./static/images/{filename}'>"
+        return result
+
+
+    def _generate_critical_css(self, first_slide:Union[bool, Slide] = False) -> str:
+        """Generates the webslides css needed to render the navbar, intro slide and first_slide (only the first row of its tables is generated)"""
+        css_path = os.path.join(get_webslides_folder(), "static", "css", "webslides.css")
+        if not os.path.isfile(css_path):
+            return ""
+        html = (self.navbar.__html__() if self.navbar else "") + (self._generate_intro_slide() or "")
+        if first_slide:
+            html += "".join(first_slide._generate_content(self.background, sample=True))
+        return critical_css(read_file(css_path).decode("utf-8", errors="surrogateescape"), "static/css/webslides.css", html)
+
+
+    @staticmethod
+    def _generate_deferred_stylesheet(href:str, attributes:str = "") -> str:
+        """Generates a stylesheet link that loads without blocking rendering (with a <noscript> fallback)"""
+        return f'''<link rel="preload" as="style" href="{href}" {attributes}onload="this.onload=null;this.rel='stylesheet'">
+        <noscript><link rel="stylesheet" href="{href}" {attributes}></noscript>'''
+
+
+    def _generate_stylesheet_markup(self, fast_first_paint:bool = False, first_slide:Union[bool, Slide] = False) -> str:
+        """Generates the stylesheet links in the <head>, fast_first_paint inlines the critical css and loads the stylesheets without blocking rendering"""
+        if not fast_first_paint:
+            return f'''<!-- Google Fonts -->
+        <link href="{GOOGLE_FONTS_URL.replace("&", "&amp;")}" rel="stylesheet">
+
+        <!-- CSS WebSlides -->
+        <link rel="stylesheet" type='text/css' media='all' href="static/css/webslides.css">
+
+        <!-- Optional - CSS SVG Icons (Font Awesome) -->
+        <link rel="stylesheet" href="{FONT_AWESOME_URL}" integrity="{FONT_AWESOME_INTEGRITY}" crossorigin="anonymous" />'''
+        return f'''<!-- Critical CSS (the styles of the first slides, the stylesheets load without blocking rendering) -->
+        <style>{self._generate_critical_css(first_slide)}</style>
 
-        result = f'''<!doctype html>
+        <!-- Google Fonts -->
+        {self._generate_deferred_stylesheet(GOOGLE_FONTS_URL.replace("&", "&amp;"))}
+
+        <!-- CSS WebSlides -->
+        {self._generate_deferred_stylesheet("static/css/webslides.css")}
+
+        <!-- Optional - CSS SVG Icons (Font Awesome) -->
+        {self._generate_deferred_stylesheet(FONT_AWESOME_URL, f'integrity="{FONT_AWESOME_INTEGRITY}" crossorigin="anonymous" ')}'''
+
+
+    def _generate_head(self, lazy_images:Union[bool, int] = False, fast_first_paint:bool = False, first_slide:Union[bool, Slide] = False) -> str:
+        """Generates the start of the index.html file, up to and including the intro slide (first_slide is used for the preload hints and critical css)"""
+        return f'''<!doctype html>
 <html lang="en" prefix="og: http://ogp.me/ns#">
     <head>
         <meta charset="utf-8">
@@ -313,14 +818,7 @@ class Presentation:
         <!-- URL CANONICAL -->
         <link rel="canonical" href="{self.url}">
 
-        <!-- Google Fonts -->
-        <link href="https://fonts.googleapis.com/css?family=Roboto:100,100i,300,300i,400,400i,700,700i%7CMaitree:200,300,400,600,700&amp;subset=latin-ext" rel="stylesheet">
-
-        <!-- CSS WebSlides -->
-        <link rel="stylesheet" type='text/css' media='all' href="static/css/webslides.css">
-
-        <!-- Optional - CSS SVG Icons (Font Awesome) -->
-        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.1/css/all.min.css" integrity="sha512-+4zCK9k+qNFUR5X+cKL9EIR+ZOhtIloNl9GIKS57V1MyNsYpYcUrUeQc9vNfzsWfV28IaLL3i96P9sdNyeRssA==" crossorigin="anonymous" />
+        {self._generate_stylesheet_markup(fast_first_paint, first_slide)}
 
         <!-- SOCIAL CARDS (ADD YOUR INFO) -->
 
@@ -329,25 +827,23 @@ class Presentation:
         <meta property="og:type" content="article">
         <meta property="og:title" content="{self.title}"> 
         <meta property="og:description" content="{self.description}">
-        <meta property="og:updated_time" content="{datetime.today()}">
-        <meta property="og:image" content="{self.image if self.image else "static/images/share-webslides.jpg"}">
+        <meta property="og:updated_time" content="{(self._pinned_time() or datetime.now(timezone.utc)).isoformat()}">
+        <meta property="og:image" content="{f"./static/images/{self.image.filename}" if self.image else "static/images/share-webslides.jpg"}">
 
         <!-- TWITTER -->
         <meta name="twitter:card" content="summary_large_image">
         <meta name="twitter:title" content="{self.title}"> 
         <meta name="twitter:description" content="{self.description}"> 
-        <meta name="twitter:image" content="{self.image if self.image else "static/images/share-webslides.jpg"}">
+        <meta name="twitter:image" content="{f"./static/images/{self.image.filename}" if self.image else "static/images/share-webslides.jpg"}">
 
         {self._generate_favicon_markup()}
+        {self._generate_preload_markup(first_slide) if lazy_images is not False else ""}
 
         <!-- Android -->
         <meta name="mobile-web-app-capable" content="yes">
         <meta name="theme-color" content="#f0f0f0">
 
-        <!-- Code highlighting -->
-        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/10.4.0/styles/default.min.css">
-        <script src="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/10.4.0/highlight.min.js"></script>
-        <script>hljs.initHighlightingOnLoad();</script>
+        {"" if fast_first_paint else self._generate_highlighting_markup()}
 
     </head>
     {self.navbar.__html__() if self.navbar else ""}
@@ -355,8 +851,41 @@ class Presentation:
 
     <main role='main'>
         <article id='webslides' {'class="vertical"' if self.vertical else ""}>
-{self._generate_intro_slide()}
-{slides_html}
+{self._generate_intro_slide() or ""}
+'''
+
+
+    def _generate_highlighting_markup(self, fast_first_paint:bool = False) -> str:
+        """Generates the highlight.js stylesheet and script, fast_first_paint loads them without blocking rendering"""
+        if not fast_first_paint:
+            return f'''<!-- Code highlighting -->
+        <link rel="stylesheet" href="{HIGHLIGHT_CSS_URL}">
+        <script src="{HIGHLIGHT_JS_URL}"></script>
+        <script>hljs.initHighlightingOnLoad();</script>'''
+        return f'''<!-- Code highlighting -->
+    {self._generate_deferred_stylesheet(HIGHLIGHT_CSS_URL)}
+    <script defer src="{HIGHLIGHT_JS_URL}" onload="hljs.initHighlighting();"></script>'''
+
+
+    def _generate_webslides_script(self, fast_first_paint:bool = False) -> str:
+        """Generates the webslides script, fast_first_paint defers it until the page is parsed"""
+        if not fast_first_paint:
+            return """<script src='static/js/webslides.js'></script>
+    <script>
+        window.ws = new WebSlides();
+    </script>"""
+        return """<script defer src='static/js/webslides.js'></script>
+    <script>
+        document.addEventListener('DOMContentLoaded', function () {
+            window.ws = new WebSlides();
+        });
+    </script>"""
+
+
+    def _generate_tail(self, lazy_images:Union[bool, int] = False, fast_first_paint:bool = False, has_code:bool = False, search:bool = False) -> str:
+        """Generates the end of the index.html file, starting with the endcard (fast_first_paint adds highlight.js here if has_code is True)"""
+        highlighting = f"\n    {self._generate_highlighting_markup(True)}" if fast_first_paint and has_code else ""
+        return f'''
 {self._generate_endcard()}
 
         </article>
@@ -365,10 +894,9 @@ class Presentation:
     <!-- end main -->
 
     <!-- Required -->
-    <script src='static/js/webslides.js'></script>
-    <script>
-        window.ws = new WebSlides();
-    </script>
+    {self._generate_webslides_script(fast_first_paint)}{highlighting}
+    {LAZY_IMAGES_SCRIPT if lazy_images is not False else ""}
+    {SEARCH_SCRIPT if search else ""}
 
     <!-- OPTIONAL - svg-icons.js (fontastic.me - Font Awesome as svg icons) -->
     <script defer src='static/js/svg-icons.js'></script>
@@ -377,10 +905,65 @@ class Presentation:
     {self.footer.__html__() if self.footer else ""}
 </html>
         '''
-        return result
 
 
-    def export(self, file_path:str, folder_name:Union[str, bool] = False, force:bool = False):
+    def _iter_html(self, lazy_images:Union[bool, int] = False, fast_first_paint:bool = False, search:bool = False, visit:Union[bool, Callable[[Slide], None]] = False) -> Generator[str, None, None]:
+        """Generates the index.html file of a presentation one slide at a time
+
+        Parameters
+        ----------
+        lazy_images : (bool or int)
+            Whether to defer loading images after the first LAZY_EAGER_SLIDES slides, or the number of slides to load images for immediately, optional and defaults to False
+
+        fast_first_paint : (bool)
+            Whether to inline the critical css, load stylesheets and scripts without blocking rendering, and only load highlight.js if there's Code, optional and defaults to False
+
+        search : (bool)
+            Whether to add the search box script, optional and defaults to False
+
+        visit : (Callable or False)
+            A function that is called with each slide before it's rendered, optional and defaults to False
+
+        Notes
+        -----
+        - The slides are only iterated once (the first slide is taken before the head is generated), so a RecordSlides only generates each slide once
+        """
+        eager_slides = LAZY_EAGER_SLIDES if lazy_images is True else lazy_images
+        has_code = False
+        slides = self.slides
+        total = None
+        if isinstance(slides, list): # Render a snapshot, in case slides are added (i.e. to Slide.all) by another thread
+            with Slide.lock:
+                slides = list(slides)
+            total = len(slides)
+        slides = iter(slides)
+        first_slide = next(slides, False)
+        yield self._generate_head(lazy_images, fast_first_paint, first_slide)
+        slide_iterator = tqdm(chain((first_slide,), slides) if first_slide else slides, total=total)
+        slide_iterator.set_description_str("Generating slide content")
+        section_number = 1 if self.intro else 0 # Counts <section>'s, since a Table with rows_per_slide renders several
+        for slide in slide_iterator:
+            section_number += 1
+            if visit:
+                visit(slide)
+            if fast_first_paint and not has_code: # highlight.js is added at the end, so slides are only checked once
+                has_code = any(isinstance(component, Code) for component in walk(slide.contents))
+            for chunk in slide._generate_content(self.background, page_breaks=True):
+                if chunk is _PAGE_BREAK:
+                    section_number += 1
+                elif lazy_images is not False and section_number > eager_slides:
+                    yield defer_images(chunk)
+                else:
+                    yield chunk
+        yield self._generate_tail(lazy_images, fast_first_paint, has_code, search)
+
+
+    def __html__(self) -> str:
+        """Generates the index.html file of a presentation using the provided slides"""
+        return "".join(self._iter_html())
+
+
+    def export(self, file_path:str, folder_name:Union[str, bool] = False, force:bool = False, fingerprint:bool = False, prune:bool = False, vendor:bool = False, sprite:bool = False, lazy_images:Union[bool, int] = False, offline:bool = False, fast_first_paint:bool = False, search:bool = False):
         """Exports the presentation files
 
         Parameters
@@ -394,10 +977,43 @@ class Presentation:
         force : (bool)
             Whether to force generating files (overwrite existing files if found), optional and defaults to False
 
+        fingerprint : (bool)
+            Whether to add a hash of the contents to every css, js, font and image file name (see notes), optional and defaults to False
+
+        prune : (bool)
+            Whether to only copy the files the presentation uses (see notes), optional and defaults to False
+
+        vendor : (bool)
+            Whether to self-host the Google Fonts, Font Awesome and highlight.js files instead of linking to their CDN's (see notes), optional and defaults to False
+
+        sprite : (bool)
+            Whether to inline an svg sprite of only the icons used by Icon's and SocialLink's (see notes), optional and defaults to False
+
+        lazy_images : (bool or int)
+            Whether to defer loading the images of slides after the first 3, or the number of slides to load images for immediately (see notes), optional and defaults to False
+
+        offline : (bool)
+            Whether to add a service worker that caches the presentation so it loads instantly on repeat visits and works offline (see notes), optional and defaults to False
+
+        fast_first_paint : (bool)
+            Whether to make the first slide show up sooner by removing render-blocking stylesheets and scripts (see notes), optional and defaults to False
+
+        search : (bool)
+            Whether to make the slides searchable (see notes), optional and defaults to False
+
         Notes
         -----
         - all files are exported to file_path/folder_name
         - folder_name defaults to Presenation.title
+        - When fingerprint is True every reference in index.html and the stylesheets is rewritten to the new file names, and a manifest.json of {original_path:fingerprinted_path}'s is exported
+        - When prune is True only files referenced by index.html, and by url()'s/@import's in the stylesheets it links, are copied (so the webslides demos, unused fonts and unused images are skipped)
+        - When vendor is True the third-party files are downloaded once into a local cache, subsetted to the characters and icons the presentation uses, and exported to static/vendor/
+        - When sprite is True svg-icons.js (and the Font Awesome stylesheet) are no longer loaded if every icon the presentation uses is in the sprite
+        - When lazy_images is set the deferred background images and Image's are loaded by a script when their slide (or one of the 2 slides before it) is shown, and the intro and first slide's images are preloaded
+        - When offline is True sw.js and a precache-manifest.json of {path:hash}'s are exported, on the next export only the files whose hash changed are downloaded again
+        - When fast_first_paint is True the webslides css the navbar, intro and first slide need is inlined, the stylesheets are loaded without blocking rendering, the scripts are deferred, and highlight.js is only loaded if the presentation has Code
+        - When search is True a static/search-index.json of the slides' text is exported, and pressing / opens a search box that jumps to the slide of the result that's picked
+        - When Presentation.updated_time or SOURCE_DATE_EPOCH is set every file and folder's modification time is set to it
 
         Raises
         ------
@@ -418,43 +1034,184 @@ class Presentation:
         if not folder_name:
             folder_name = self.title
         file_path = os.path.abspath(file_path)
+        output_folder = os.path.join(file_path, folder_name)
 
-        # finding downloads folder
-        if os.name == "nt":
-            DOWNLOAD_FOLDER = f"{os.getenv('USERPROFILE')}\\Downloads"
-        else: # PORT: Assuming variable is there for MacOS and Linux installs
-            DOWNLOAD_FOLDER = f"{os.getenv('HOME')}/Downloads" 
-
-        # check if webslides is downloaded, if it is use those files, if not download and extract it
-        if not os.path.exists(os.path.join(os.path.dirname(__file__), "webslides")):
-            try:
-                build(ZIPResource("webslides", "https://webslides.tv/webslides-latest.zip", overwrite_agreement=True))
-                copytree(os.path.join(DOWNLOAD_FOLDER, "webslides"), os.path.join(os.path.dirname(__file__), "webslides"))
-            except PermissionError:
-                elevate()
-                copytree(os.path.join(DOWNLOAD_FOLDER, "webslides"), os.path.join(os.path.dirname(__file__), "webslides"))
-        try:
-            copytree(os.path.join(os.path.dirname(__file__), "webslides"), os.path.join(file_path, folder_name))
-        except FileExistsError:
+        if os.path.exists(output_folder):
             if force:
-                rmtree(os.path.join(file_path, folder_name))
-                copytree(os.path.join(os.path.dirname(__file__), "webslides"), os.path.join(file_path, folder_name))
+                rmtree(output_folder)
+            else:
+                raise FileExistsError(f"The file path {output_folder} exists, to replace use Presentation.export({file_path}, force=True)")
+
+        # Copy webslides and image files, and write the generated files (i.e. index.html)
+        print(f"Writing html to {os.path.join(output_folder, 'index.html')}")
+        for relative_path, source in self._build(fingerprint=fingerprint, prune=prune, vendor=vendor, sprite=sprite, lazy_images=lazy_images, offline=offline, fast_first_paint=fast_first_paint, search=search).items():
+            destination = os.path.join(output_folder, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if isinstance(source, str):
+                copy2(source, destination)
+            else:
+                with open(destination, "wb") as generated_file:
+                    generated_file.writelines([source] if isinstance(source, bytes) else source)
+
+        # Normalize modification times, so unchanged files look unchanged to rsync/deploy tools
+        pinned_time = self._pinned_time()
+        if pinned_time:
+            timestamp = pinned_time.timestamp()
+            for directory, _, file_names in os.walk(output_folder, topdown=False):
+                for file_name in file_names:
+                    os.utime(os.path.join(directory, file_name), (timestamp, timestamp))
+                os.utime(directory, (timestamp, timestamp))
+
+
+    def export_memory(self, **options) -> Dict[str, bytes]:
+        """Exports the presentation files into memory instead of onto disk
+
+        Parameters
+        ----------
+        options : (bool)
+            Any of the keyword export options of Presentation.export() (i.e. fingerprint=True)
+
+        Returns
+        -------
+        Dict[str, bytes]
+            A dictionary of {relative_path:contents}'s for every exported file, including index.html
+
+        Notes
+        -----
+        - Webslides files are shared references to a process-wide cached copy, so they are not duplicated per presentation
+        - Only index.html and the images are read/generated on each call
+
+        Examples
+        --------
+        ### Serve the index.html of a presentation without writing it to disk
+        ```
+        from ezprez.core import Presentation
+        prez = Presentation(title, description, url)
+
+        files = prez.export_memory()
+        index = files["index.html"].decode()
+        ```
+        """
+        files = {}
+        for relative_path, source in self._build(**options).items():
+            if isinstance(source, str):
+                files[relative_path] = read_file(source)
+            else:
+                files[relative_path] = source if isinstance(source, bytes) else b"".join(source)
+        return files
+
+
+    def export_archive(self, path_or_fileobj:Union[str, BinaryIO], format:str = "zip", folder_name:Union[str, bool] = False, force:bool = False, **options):
+        """Exports the presentation files directly into a .zip or .tar.gz archive
+
+        Parameters
+        ----------
+        path_or_fileobj : (str or BinaryIO)
+            The path of the archive to create, or a writable binary file object to stream the archive into
+
+        format : (str)
+            The archive format, either 'zip' or 'tar.gz', optional and defaults to 'zip'
+
+        folder_name : (str or False)
+            A folder to nest all files inside of within the archive, optional and defaults to False (files are at the archive root)
+
+        force : (bool)
+            Whether to overwrite an existing archive at path_or_fileobj, optional and defaults to False
+
+        options : (bool)
+            Any of the keyword export options of Presentation.export() (i.e. fingerprint=True)
+
+        Notes
+        -----
+        - Files are streamed from the cached webslides folder and the image folder, no intermediate folder is created
+        - When Presentation.updated_time or SOURCE_DATE_EPOCH is set every file's modification time (and owner) in the archive is normalized, so the archive is byte-identical between exports
+
+        Raises
+        ------
+        ValueError
+            If format is not 'zip' or 'tar.gz'
+
+        FileExistsError
+            If force is False, and a file exists at path_or_fileobj
+
+        Examples
+        --------
+        ### Export a presentation to presentation.zip in the current directory
+        ```
+        from ezprez.core import Presentation
+        prez = Presentation(title, description, url)
+
+        prez.export_archive("presentation.zip", force=True)
+        ```
+
+        ### Export a presentation into an in-memory .tar.gz
+        ```
+        from io import BytesIO
+        from ezprez.core import Presentation
+        prez = Presentation(title, description, url)
+
+        archive = BytesIO()
+        prez.export_archive(archive, format="tar.gz")
+        ```
+        """
+        if format not in ("zip", "tar.gz"):
+            raise ValueError(f"Archive format must be 'zip' or 'tar.gz', got {format}")
+        if isinstance(path_or_fileobj, (str, os.PathLike)):
+            path_or_fileobj = os.path.abspath(path_or_fileobj)
+            if os.path.exists(path_or_fileobj) and not force:
+                raise FileExistsError(f"The file path {path_or_fileobj} exists, to replace use Presentation.export_archive({path_or_fileobj}, force=True)")
+        prefix = f"{folder_name}/" if folder_name else ""
+
+        files = self._build(**options)
+        pinned_time = self._pinned_time()
+        mtime = int(pinned_time.timestamp()) if pinned_time else int(datetime.now().timestamp())
+
+        if format == "zip":
+            # Zip timestamps can't be before 1980, and are stored without a timezone
+            date_time = max(datetime.fromtimestamp(mtime, tz=timezone.utc), datetime(1980, 1, 1, tzinfo=timezone.utc)).timetuple()[:6]
+            with zipfile.ZipFile(path_or_fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for relative_path, source in files.items():
+                    if isinstance(source, str) and not pinned_time:
+                        archive.write(source, prefix + relative_path)
+                        continue
+                    file_info = zipfile.ZipInfo(prefix + relative_path, date_time=date_time)
+                    file_info.compress_type = zipfile.ZIP_DEFLATED
+                    file_info.external_attr = 0o644 << 16
+                    with archive.open(file_info, "w") as archived_file:
+                        if isinstance(source, str):
+                            archived_file.write(read_file(source))
+                        else:
+                            archived_file.writelines([source] if isinstance(source, bytes) else source)
+        else:
+            if isinstance(path_or_fileobj, (str, os.PathLike)):
+                output_file = open(path_or_fileobj, "wb")
             else:
-                raise FileExistsError(f"The file path {os.path.join(file_path, folder_name)} exists, to replace use Presentation.export({file_path}, force=True)")
-
-        # Copy image files
-        if os.path.exists("./img"):
-            for file_name in os.listdir("./img"):
-                if os.path.isfile(os.path.join("img", file_name)):
-                    copyfile(os.path.join("img", file_name), os.path.join(file_path, folder_name, "static", "images", file_name))
-        elif os.path.exists("./images"):
-            for file_name in os.listdir("./images"):
-                if os.path.isfile(os.path.join("images", file_name)):
-                    copyfile(os.path.join("images", file_name), os.path.join(file_path, folder_name, "static", "images", file_name))
-
-        # replace index.html with generated html
-        presentation_content = self.__html__()
-        index_path = os.path.join(file_path, folder_name, "index.html")
-        print(f"Writing html to {index_path}")
-        with open(index_path, "w+") as presentation_file:
-            presentation_file.write(presentation_content)
+                output_file = path_or_fileobj
+            # The gzip header has a timestamp and file name of its own
+            compressed_file = gzip.GzipFile(filename="", mode="wb", fileobj=output_file, mtime=mtime)
+
+            def _normalize(file_info:tarfile.TarInfo) -> tarfile.TarInfo:
+                if pinned_time:
+                    file_info.mtime = mtime
+                    file_info.uid = file_info.gid = 0
+                    file_info.uname = file_info.gname = ""
+                    file_info.mode = 0o644
+                return file_info
+
+            try:
+                with tarfile.open(fileobj=compressed_file, mode="w") as archive:
+                    for relative_path, source in files.items():
+                        if isinstance(source, str):
+                            archive.add(source, prefix + relative_path, recursive=False, filter=_normalize)
+                            continue
+                        with SpooledTemporaryFile(max_size=1024 * 1024) as spooled_file: # tar headers need the size up front
+                            spooled_file.writelines([source] if isinstance(source, bytes) else source)
+                            file_info = tarfile.TarInfo(prefix + relative_path)
+                            file_info.size = spooled_file.tell()
+                            file_info.mtime = mtime
+                            spooled_file.seek(0)
+                            archive.addfile(_normalize(file_info), spooled_file)
+            finally:
+                compressed_file.close()
+                if output_file is not path_or_fileobj:
+                    output_file.close()
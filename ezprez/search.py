@@ -0,0 +1,403 @@
+"""The module that contains the full-text search index exported with the search export option
+
+Classes
+-------
+#### SearchIndex
+Builds the search index of a presentation one slide at a time, so it can be built while the slides are rendered
+
+Functions
+---------
+#### extract_text
+Yields the searchable text of some content (str, list, tuple or Component), dispatching on its type
+
+#### tokenize
+Splits text into the lowercase terms that are indexed and searched for
+
+#### build_index
+Builds the search index of a presentation, mapping each term to the slides it's on
+
+Notes
+-----
+- The index is json of {"version": SEARCH_INDEX_VERSION, "slides": [[slide_number, heading], ...], "terms": {term: [...]}}
+- Each term's list is the positions (in "slides") of the slides it's on, delta encoded (each value is the difference from the one before it) to keep the file small
+- The terms of each Slide are cached while its text stays the same, so exporting a presentation more than once (i.e. to a folder and an archive) only tokenizes it once
+- A Table of a generator of rows can't be indexed without using up the rows it's rendered from, so it raises a ValueError (use a list, a DataFrame or a .csv file)
+- SEARCH_SCRIPT opens a search box when / is pressed, downloads the index the first time it's opened, and jumps to #slide=N when a result is picked
+
+Examples
+--------
+#### Export a presentation with search
+```
+from ezprez.core import Presentation
+
+prez = Presentation(title, description, url)
+prez.export(".", search=True)
+```
+"""
+# Standard lib dependencies
+import re                                   # Used to remove html tags and split text into terms
+import json                                 # Used to encode the index
+import weakref                              # Used to cache the terms of slides without keeping them alive
+from html import unescape                   # Used to turn html entities in headings and Raw content back into text
+from functools import singledispatch        # Used to dispatch text extraction on the type of content
+from typing import Iterator, List, Sequence, Tuple, Union # Used to enrich type hints in functions
+
+# Internal dependencies
+from ezprez.components import *             # Used to dispatch text extraction on the type of component
+from ezprez.components import _Component    # Used to dispatch text extraction on the type of component
+
+
+SEARCH_INDEX_VERSION = 1
+"""The version of the index format written by build_index()"""
+
+SEARCH_INDEX_PATH = "static/search-index.json"
+"""Where the index is exported to, it's in static/ so prune and offline keep (and precache) it"""
+
+TAG_PATTERN = re.compile(r"<[^>]*>")
+"""Matches html tags, which are removed from headings, strings and Raw content before they're indexed"""
+
+TERM_PATTERN = re.compile(r"\w\w+")
+"""Matches the terms that are indexed, words (and numbers) of at least 2 characters"""
+
+SEARCH_SCRIPT = f"""<script>
+        (function () {{
+            var index = null, box, input, results;
+            function load() {{
+                if (!index) index = fetch('{SEARCH_INDEX_PATH}').then(function (response) {{ return response.json(); }});
+                return index;
+            }}
+            function lookup(data, query) {{ // Slides that have a term starting with every word of the query
+                var words = query.toLowerCase().match(/[\\p{{L}}\\p{{M}}\\p{{N}}_]+/gu) || [], matches = null;
+                words.forEach(function (word) {{
+                    var found = {{}};
+                    Object.keys(data.terms).forEach(function (term) {{
+                        if (term.lastIndexOf(word, 0) !== 0) return;
+                        var position = 0;
+                        data.terms[term].forEach(function (delta) {{ position += delta; found[position] = true; }});
+                    }});
+                    matches = matches === null ? found : Object.keys(matches).reduce(function (both, position) {{
+                        if (found[position]) both[position] = true;
+                        return both;
+                    }}, {{}});
+                }});
+                return Object.keys(matches || {{}}).map(Number).sort(function (a, b) {{ return a - b; }}).map(function (position) {{ return data.slides[position]; }});
+            }}
+            function go(slideNumber) {{
+                box.hidden = true;
+                if (window.ws && window.ws.goToSlide) window.ws.goToSlide(slideNumber - 1);
+                else location.hash = 'slide=' + slideNumber;
+            }}
+            function update() {{
+                var query = input.value;
+                load().then(function (data) {{
+                    if (query !== input.value) return;
+                    results.textContent = '';
+                    lookup(data, query).slice(0, 10).forEach(function (slide) {{
+                        var item = document.createElement('li'), link = document.createElement('a');
+                        link.href = '#slide=' + slide[0];
+                        link.textContent = slide[1] || 'Slide ' + slide[0];
+                        link.addEventListener('click', function (event) {{ event.preventDefault(); go(slide[0]); }});
+                        item.setAttribute('data-slide', slide[0]);
+                        item.appendChild(link);
+                        results.appendChild(item);
+                    }});
+                }});
+            }}
+            function open() {{
+                if (!box) {{
+                    box = document.createElement('div');
+                    box.id = 'ezprez-search';
+                    box.setAttribute('style', 'position:fixed;top:1em;left:50%;transform:translateX(-50%);z-index:1000;width:30em;max-width:90vw;padding:.5em;background:#fff;color:#141414;box-shadow:0 2px 12px rgba(0,0,0,.3);text-align:left;font-size:16px');
+                    input = document.createElement('input');
+                    input.type = 'search';
+                    input.placeholder = 'Search slides';
+                    input.setAttribute('aria-label', 'Search slides');
+                    input.style.width = '100%';
+                    results = document.createElement('ol');
+                    box.appendChild(input);
+                    box.appendChild(results);
+                    document.body.appendChild(box);
+                    input.addEventListener('input', update);
+                    input.addEventListener('keydown', function (event) {{
+                        event.stopPropagation(); // Don't let webslides change slides while typing
+                        if (event.key === 'Escape') box.hidden = true;
+                        if (event.key === 'Enter' && results.firstChild) go(Number(results.firstChild.getAttribute('data-slide')));
+                    }});
+                }}
+                box.hidden = false;
+                input.focus();
+                input.select();
+                load();
+            }}
+            document.addEventListener('keydown', function (event) {{
+                if (event.key === '/' && !/^(INPUT|TEXTAREA|SELECT)$/.test(event.target.tagName)) {{
+                    event.preventDefault();
+                    open();
+                }}
+            }});
+        }})();
+    </script>"""
+"""Opens a search box when / is pressed, and jumps to the slide of the result that's picked"""
+
+_slide_terms = weakref.WeakKeyDictionary()
+"""A cache of {slide:(texts, terms)}'s, the terms are reused while the text extracted from the slide is the same"""
+
+
+@singledispatch
+def extract_text(content) -> Iterator[str]:
+    """Yields the searchable text of some content (str, list, tuple or Component), dispatching on its type
+
+    Parameters
+    ----------
+    content : (str, list, tuple or Component)
+        The content to extract text from, mirrors what ezprez.components.render() accepts
+
+    Yields
+    ------
+    str
+        Each piece of text in the content, which may contain html
+
+    Notes
+    -----
+    - Components without a registered extractor yield the text of their nested content (i.e. the contents of a Grid)
+    - Other types can register an extractor with extract_text.register()
+
+    Examples
+    --------
+    ### Index the text of a custom type
+    ```
+    from decimal import Decimal
+    from ezprez.search import extract_text
+
+    @extract_text.register(Decimal)
+    def _extract_decimal(content:Decimal):
+        yield f"{content:,.2f}"
+    ```
+    """
+    return iter(())
+
+
+@extract_text.register(str)
+def _extract_string(content:str) -> Iterator[str]:
+    yield content
+
+
+@extract_text.register(list)
+@extract_text.register(tuple)
+def _extract_list(content:Union[list, tuple]) -> Iterator[str]:
+    for item in content:
+        yield from extract_text(item)
+
+
+@extract_text.register(_Component)
+def _extract_component(content:_Component) -> Iterator[str]:
+    for attribute in vars(content).values():
+        if isinstance(attribute, (list, tuple, _Component)):
+            yield from extract_text(attribute)
+
+
+@extract_text.register(Link)
+@extract_text.register(Button)
+def _extract_label(content:Union[Link, Button]) -> Iterator[str]:
+    yield content.label
+
+
+@extract_text.register(Code)
+@extract_text.register(Raw)
+def _extract_content(content:Union[Code, Raw]) -> Iterator[str]:
+    yield content.content
+
+
+@extract_text.register(TableOfContents)
+def _extract_table_of_contents(content:TableOfContents) -> Iterator[str]:
+    yield from content.sections
+
+
+@extract_text.register(Image)
+@extract_text.register(Chart)
+def _extract_title(content:Union[Image, Chart]) -> Iterator[str]:
+    yield content.title
+
+
+@extract_text.register(Table)
+def _extract_table(content:Table) -> Iterator[str]:
+    columns, rows = _table_rows(content)
+    yield content.caption
+    yield from columns or ()
+    for row in rows:
+        for cell in row:
+            yield from _extract_cell(cell)
+
+
+def _table_rows(content:Table) -> Tuple[Union[bool, List[str]], Iterator[Sequence]]:
+    """Returns the columns and rows of a Table (see Table._iter_rows()), raising a ValueError if reading them would use them up"""
+    if content.one_shot:
+        raise ValueError("Can't index a Table of a generator of rows without using them up before they're exported, pass a list of rows, a DataFrame or a .csv file to export with search=True")
+    return content._iter_rows()
+
+
+def _extract_cell(cell) -> Iterator[str]:
+    """Yields the text of a Table cell, which is any value (or a component)"""
+    if isinstance(cell, _Component):
+        yield from extract_text(cell)
+    elif cell is not None:
+        yield str(cell)
+
+
+def tokenize(text:str) -> List[str]:
+    """Splits text into the lowercase terms that are indexed and searched for
+
+    Parameters
+    ----------
+    text : (str)
+        The text to split, html tags are removed and entities are unescaped
+
+    Returns
+    -------
+    List[str]
+        The terms, in order (including repeats)
+
+    Examples
+    --------
+    ### Split a heading into terms
+    ```
+    from ezprez.search import tokenize
+
+    tokenize("<b>Fast</b> &amp; small exports") # ['fast', 'small', 'exports']
+    ```
+    """
+    return TERM_PATTERN.findall(unescape(TAG_PATTERN.sub(" ", text)).lower())
+
+
+def _slide_sections(slide) -> List[List[str]]:
+    """Returns the sorted terms of each section a slide renders to (a Table with rows_per_slide adds a section per page), cached per slide"""
+    sections = [[slide.heading]]
+    for content in slide.contents: # Mirrors how Slide splits tables across sections
+        if isinstance(content, Table) and content.rows_per_slide:
+            columns, rows = _table_rows(content)
+            page_text = [content.caption, *(columns or ())]
+            sections[-1].extend(page_text)
+            for row_number, row in enumerate(rows):
+                if row_number and not row_number % content.rows_per_slide:
+                    sections.append([slide.heading, *page_text])
+                for cell in row:
+                    sections[-1].extend(_extract_cell(cell))
+        else:
+            sections[-1].extend(extract_text(content))
+
+    texts = [" ".join(section) for section in sections]
+    cached = _slide_terms.get(slide)
+    if cached and cached[0] == texts: # Only reused if nothing (i.e. an appended bullet point or a changed label) changed the text
+        return cached[1]
+    terms = [sorted(set(tokenize(text))) for text in texts]
+    _slide_terms[slide] = (texts, terms)
+    return terms
+
+
+class SearchIndex:
+    """Builds the search index of a presentation one slide at a time, so it can be built while the slides are rendered
+
+    Attributes
+    ----------
+    slides: (List[list])
+        The [slide_number, heading] of every indexed slide (a Table with rows_per_slide adds one per page)
+
+    postings: (Dict[str, List[int]])
+        The positions (in slides) of the slides each term is on
+
+    Notes
+    -----
+    - The intro slide (the presentation's title and description) is indexed when the SearchIndex is created
+    - This is what exporting with search=True uses, so record driven slides (see Presentation.from_records()) are only generated once
+
+    Examples
+    --------
+    ### Index slides as they're generated
+    ```
+    from ezprez.search import SearchIndex
+
+    index = SearchIndex(prez)
+    for slide in prez.slides:
+        index.add(slide)
+    data = index.to_bytes()
+    ```
+    """
+    def __init__(self, presentation):
+        self.slides = []
+        self.postings = {}
+        if presentation.intro:
+            self._add(presentation.title, sorted(set(tokenize(f"{presentation.title} {presentation.description}"))))
+
+
+    def _add(self, heading:str, terms:List[str]):
+        """Adds a section, numbered after the last one, with its sorted terms"""
+        position = len(self.slides)
+        self.slides.append([position + 1, " ".join(unescape(TAG_PATTERN.sub(" ", heading)).split())])
+        for term in terms:
+            self.postings.setdefault(term, []).append(position)
+
+
+    def add(self, slide):
+        """Indexes the next slide of the presentation
+
+        Parameters
+        ----------
+        slide : (Slide)
+            The slide to index, slides must be added in the order they're exported in
+
+        Raises
+        ------
+        ValueError
+            If the slide has a Table of a generator of rows
+        """
+        for terms in _slide_sections(slide):
+            self._add(slide.heading, terms)
+
+
+    def to_bytes(self) -> bytes:
+        """Returns the json encoded index (see the module notes for the format)"""
+        terms = {}
+        for term in sorted(self.postings):
+            positions = self.postings[term]
+            terms[term] = [positions[0]] + [position - previous for previous, position in zip(positions, positions[1:])]
+        return json.dumps({"version": SEARCH_INDEX_VERSION, "slides": self.slides, "terms": terms}, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def build_index(presentation) -> bytes:
+    """Builds the search index of a presentation, mapping each term to the slides it's on
+
+    Parameters
+    ----------
+    presentation : (Presentation)
+        The presentation to index
+
+    Returns
+    -------
+    bytes
+        The json encoded index (see the module notes for the format)
+
+    Raises
+    ------
+    ValueError
+        If a slide has a Table of a generator of rows
+
+    Notes
+    -----
+    - Slide headings, strings, bullet points, Link and Button labels, Code and Raw content, TableOfContents entries, Image and Chart titles, and Table cells are indexed
+    - The intro slide indexes the presentation's title and description, the endcard is not indexed
+    - Each slide is only visited once, so building the index takes time proportional to the size of the presentation
+
+    Examples
+    --------
+    ### Write the search index of a presentation
+    ```
+    from ezprez.search import build_index
+
+    with open("search-index.json", "wb") as index_file:
+        index_file.write(build_index(prez))
+    ```
+    """
+    index = SearchIndex(presentation)
+    for slide in presentation.slides:
+        index.add(slide)
+    return index.to_bytes()
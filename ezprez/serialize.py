@@ -0,0 +1,272 @@
+"""The module that contains the compact, versioned serialization format used to send presentations between processes
+
+Classes
+-------
+#### Serializable
+The base class that gives Presentation, Slide and every component to_bytes() and from_bytes()
+
+Functions
+---------
+#### to_bytes
+Serializes a Presentation, Slide or component (and everything inside of it) to bytes
+
+#### from_bytes
+Recreates the Presentation, Slide or component that was serialized with to_bytes()
+
+Notes
+-----
+- The format is FORMAT_HEADER, a version byte, and the zlib compressed pickle (PICKLE_PROTOCOL) of the attributes of each object, so encoding and decoding runs in C
+- Each object is stored once, no matter how many times it's used (i.e. a Navbar shared by two presentations), and is the same instance again after from_bytes()
+- Equal value components (i.e. two Link("Home", "#")'s) are stored once, and are a single instance after from_bytes()
+- Attributes are stored by name, so data serialized by an older version still loads if attributes are added (missing dataclass fields get their defaults)
+- Only subclasses of Serializable (and datetimes) are created by from_bytes(), so (unlike plain pickle) loading data can't run arbitrary code
+- Slides are not added to Slide.all when they're loaded, and a Presentation's slides are stored as a list (a RecordSlides is generated into slides when serializing)
+
+Examples
+--------
+#### Send a presentation to another process
+```
+from ezprez.core import Presentation
+
+data = prez.to_bytes()
+
+# In the other process
+prez = Presentation.from_bytes(data)
+prez.export(".")
+```
+"""
+# Standard lib dependencies
+import zlib                                 # Used to compress the encoded objects
+import pickle                               # Used to encode the objects (loading is restricted to Serializable classes)
+import copyreg                              # Used to create objects without calling __init__ when they're loaded
+from io import BytesIO                      # Used to hand the encoded objects to the unpickler
+from datetime import datetime, timedelta, timezone # Used to serialize Presentation.updated_time
+from dataclasses import MISSING, fields, is_dataclass # Used to fill in attributes added after data was serialized
+from typing import Callable, Dict, Type     # Used to enrich type hints in functions
+
+
+FORMAT_HEADER = b"EZPREZ"
+"""The bytes every serialized object starts with"""
+
+FORMAT_VERSION = 1
+"""The version of the format written by to_bytes(), from_bytes() raises a ValueError for newer versions"""
+
+PICKLE_PROTOCOL = 4
+"""The pickle protocol objects are encoded with"""
+
+COMPRESSION_LEVEL = 1
+"""The zlib compression level of the encoded objects, repeated objects and strings are already stored once so higher levels barely make the data smaller"""
+
+_ALLOWED_GLOBALS = {("datetime", "datetime"): datetime, ("datetime", "timezone"): timezone, ("datetime", "timedelta"): timedelta}
+"""The only classes (besides Serializable subclasses) from_bytes() can create"""
+
+_classes: Dict[str, type] = {}
+"""A cache of {qualified_name:class}'s of every Serializable subclass, used by from_bytes()"""
+
+_defaults: Dict[type, Dict[str, Callable[[], object]]] = {}
+"""A cache of {class:{field_name:default_factory}}'s of the dataclass fields with defaults of every loaded class"""
+
+
+class Serializable:
+    """The base class that gives Presentation, Slide and every component to_bytes() and from_bytes()
+
+    Methods
+    -------
+    to_bytes:
+        Serializes the object (and everything inside of it) to bytes
+
+    from_bytes:
+        Recreates an object that was serialized with to_bytes()
+    """
+    _serialized_by_value = False
+    """Whether equal instances (the same class and attribute values) are stored once, and loaded as a single shared instance"""
+
+    def _serialized_attributes(self) -> dict:
+        """Returns the {name:value}'s of the attributes to serialize, subclasses can override it to store attributes differently"""
+        return vars(self)
+
+
+    def __setstate__(self, state:dict):
+        """Restores the attributes of a loaded object, dataclass fields that were added after it was serialized get their defaults"""
+        self.__dict__.update(state)
+        cls = type(self)
+        if cls not in _defaults:
+            _defaults[cls] = {}
+            for dataclass_field in fields(cls) if is_dataclass(cls) else ():
+                if dataclass_field.default is not MISSING:
+                    _defaults[cls][dataclass_field.name] = lambda default=dataclass_field.default: default
+                elif dataclass_field.default_factory is not MISSING:
+                    _defaults[cls][dataclass_field.name] = dataclass_field.default_factory
+        for name, default in _defaults[cls].items():
+            if name not in state:
+                self.__dict__[name] = default()
+
+
+    def to_bytes(self) -> bytes:
+        """Serializes the object (and everything inside of it) to bytes, see ezprez.serialize.to_bytes()"""
+        return to_bytes(self)
+
+
+    @classmethod
+    def from_bytes(cls, data:bytes) -> "Serializable":
+        """Recreates an object that was serialized with to_bytes(), see ezprez.serialize.from_bytes()
+
+        Raises
+        ------
+        ValueError
+            If the data is not a serialized instance of the class
+        """
+        result = from_bytes(data)
+        if not isinstance(result, cls):
+            raise ValueError(f"Serialized data contains a {type(result).__name__}, not a {cls.__name__}")
+        return result
+
+
+def _qualified_name(cls:type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _find_class(name:str) -> Type[Serializable]:
+    """Finds a Serializable subclass by its qualified name (i.e. 'ezprez.components.Icon')"""
+    if name not in _classes:
+        unvisited = [Serializable]
+        while unvisited:
+            cls = unvisited.pop()
+            _classes[_qualified_name(cls)] = cls
+            unvisited.extend(cls.__subclasses__())
+    if name not in _classes or _classes[name] is Serializable:
+        raise ValueError(f"Serialized data contains {name}, which is not a Serializable class (is the module it's defined in imported?)")
+    return _classes[name]
+
+
+def _shared(value):
+    """Returns value, used to store a reference to an equal object that was already stored (or the base value of a str/int/float subclass)"""
+    return value
+
+
+class _Pickler(pickle.Pickler):
+    """Stores Serializable objects by their _serialized_attributes(), and only stores each equal value component once"""
+    def __init__(self, file:BytesIO):
+        super().__init__(file, protocol=PICKLE_PROTOCOL)
+        self.by_value = {}
+
+
+    def _canonical(self, value:Serializable) -> Serializable:
+        """Returns the first stored value component that's equal to value (the same class and attribute values), or value itself"""
+        attributes = value._serialized_attributes()
+        values = tuple(attributes.values())
+        for _ in range(2):
+            try: # The types are part of the key, so i.e. Icon(size=True) and Icon(size=1) stay separate
+                return self.by_value.setdefault((type(value), tuple(attributes), values, tuple(map(type, values))), value)
+            except TypeError: # Nested value components are compared by their canonical instance, other unhashable attributes (i.e. lists) aren't compared
+                values = tuple(id(self._canonical(item)) if isinstance(item, Serializable) and item._serialized_by_value else item for item in values)
+        return value
+
+
+    def reducer_override(self, value):
+        """Called for every value that isn't a str, int, float, bool, None, bytes, list, tuple, dict or set"""
+        if isinstance(value, Serializable):
+            if value._serialized_by_value:
+                canonical = self._canonical(value)
+                if canonical is not value:
+                    return _shared, (canonical,)
+            return copyreg.__newobj__, (type(value),), value._serialized_attributes() # Loaded with cls.__new__(cls), so __init__ isn't called
+        if isinstance(value, (datetime, timedelta, timezone)) or value is _shared or (isinstance(value, type) and (issubclass(value, Serializable) or value in _ALLOWED_GLOBALS.values())):
+            return NotImplemented # Stored by pickle (classes and functions are stored by name)
+        for scalar in (str, int, float): # Subclasses of scalars (i.e. IntEnum's) are stored as the scalar
+            if isinstance(value, scalar):
+                return _shared, (scalar.__str__(value) if scalar is str else scalar(value),)
+        raise ValueError(f"Can't serialize {type(value)}, only Serializable's, str, int, float, bool, None, list, tuple, dict and datetime are supported")
+
+
+class _Unpickler(pickle.Unpickler):
+    """Only creates Serializable classes and datetimes, so loading data can't run arbitrary code"""
+    def find_class(self, module:str, name:str):
+        if (module, name) in _ALLOWED_GLOBALS:
+            return _ALLOWED_GLOBALS[module, name]
+        if (module, name) == (__name__, "_shared"):
+            return _shared
+        return _find_class(f"{module}.{name}")
+
+
+def to_bytes(value:Serializable) -> bytes:
+    """Serializes a Presentation, Slide or component (and everything inside of it) to bytes
+
+    Parameters
+    ----------
+    value : (Serializable)
+        The Presentation, Slide or component to serialize
+
+    Returns
+    -------
+    bytes
+        The serialized object, recreate it with from_bytes()
+
+    Raises
+    ------
+    ValueError
+        If the value (or any attribute inside of it) is not a Serializable, str, int, float, bool, None, list, tuple, dict or datetime
+
+    Examples
+    --------
+    ### Serialize a slide
+    ```
+    from ezprez.core import Slide
+    from ezprez.serialize import to_bytes
+
+    data = to_bytes(Slide("Title", "Content"))
+    ```
+    """
+    if not isinstance(value, Serializable):
+        raise ValueError(f"Can't serialize {type(value)}, only Presentation's, Slide's and components can be serialized")
+    encoded = BytesIO()
+    _Pickler(encoded).dump(value)
+    return FORMAT_HEADER + bytes([FORMAT_VERSION]) + zlib.compress(encoded.getbuffer(), COMPRESSION_LEVEL)
+
+
+def from_bytes(data:bytes) -> Serializable:
+    """Recreates the Presentation, Slide or component that was serialized with to_bytes()
+
+    Parameters
+    ----------
+    data : (bytes)
+        The serialized object
+
+    Returns
+    -------
+    Serializable
+        The Presentation, Slide or component, objects that were shared before serializing are shared again
+
+    Raises
+    ------
+    ValueError
+        If the data was not created by to_bytes(), was created by a newer version of ezprez, or contains a class that isn't Serializable
+
+    Examples
+    --------
+    ### Serialize and recreate a slide
+    ```
+    from ezprez.core import Slide
+    from ezprez.serialize import to_bytes, from_bytes
+
+    slide = from_bytes(to_bytes(Slide("Title", "Content")))
+    ```
+    """
+    if not data.startswith(FORMAT_HEADER) or len(data) <= len(FORMAT_HEADER):
+        raise ValueError("Data was not serialized by ezprez")
+    version = data[len(FORMAT_HEADER)]
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Data was serialized with format version {version}, this version of ezprez can only read up to version {FORMAT_VERSION}")
+    try:
+        encoded = zlib.decompress(data[len(FORMAT_HEADER) + 1:])
+    except zlib.error as error:
+        raise ValueError(f"Serialized data is corrupted: {error}")
+    try:
+        result = _Unpickler(BytesIO(encoded)).load()
+    except ValueError: # A class that isn't Serializable
+        raise
+    except Exception as error: # The unpickler raises many different errors for corrupted data
+        raise ValueError(f"Serialized data is corrupted: {error}")
+    if not isinstance(result, Serializable):
+        raise ValueError(f"Serialized data contains a {type(result).__name__}, not a Presentation, Slide or component")
+    return result
@@ -0,0 +1,255 @@
+"""The module that contains a WSGI/ASGI application used to serve presentations without exporting them to disk
+
+Classes
+-------
+#### PresentationApp
+A WSGI and ASGI application that serves a single presentation from memory
+
+Functions
+---------
+#### app
+Creates a PresentationApp for a presentation
+
+Notes
+-----
+- index.html is only rendered once (on the first request), every later request is served from memory
+- When served with ASGI the presentation is rendered in a worker thread, so the event loop isn't blocked while it renders
+- Every response has a strong ETag and a Last-Modified header, and conditional GET's are answered with 304 Not Modified
+- Fingerprinted files (i.e. webslides.3f2a9c81d0e4.css) are served with long lived immutable cache headers
+
+Examples
+--------
+#### Serving a presentation with wsgiref
+```
+from wsgiref.simple_server import make_server
+
+from ezprez.core import Presentation, Slide
+from ezprez.serve import app
+
+Slide('This is the title', 'and this is the content')
+prez = Presentation(title, description, url)
+
+make_server("", 8000, app(prez)).serve_forever()
+```
+
+#### Serving a presentation with an ASGI server (i.e. uvicorn)
+```
+from ezprez.core import Presentation
+from ezprez.serve import app
+
+prez = Presentation(title, description, url)
+application = app(prez) # Then run uvicorn module:application
+```
+"""
+# Standard lib dependencies
+import re                                   # Used to detect fingerprinted file names
+import asyncio                              # Used to render the presentation outside the event loop when served with ASGI
+import time                                 # Used to timestamp the rendered presentation
+import hashlib                              # Used to generate ETags
+import mimetypes                            # Used to guess the Content-Type of files
+import threading                            # Used to make sure the presentation is only rendered once
+from email.utils import formatdate, parsedate_to_datetime  # Used to format and parse HTTP dates
+from typing import Dict, List, Tuple        # Used to enrich type hints in methods
+
+# Internal dependencies
+from ezprez.core import Presentation        # Used for type hints
+
+
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+"""Matches file names that include a content hash, i.e. webslides.3f2a9c81d0e4.css"""
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+"""The Cache-Control header used for fingerprinted files"""
+
+REVALIDATE_CACHE_CONTROL = "no-cache"
+"""The Cache-Control header used for every other file (cached, but revalidated with the ETag)"""
+
+STATUS_LINES = {200: "200 OK", 304: "304 Not Modified", 404: "404 Not Found", 405: "405 Method Not Allowed"}
+
+
+class PresentationApp:
+    """A WSGI and ASGI application that serves a single presentation from memory
+
+    Attributes
+    ----------
+    presentation: (Presentation)
+        The presentation to serve
+
+    options: (dict)
+        The keyword export options to render the presentation with (see Presentation.export())
+
+    last_modified: (float)
+        The unix timestamp the presentation was rendered at (or its updated_time/SOURCE_DATE_EPOCH), or False if it has not been rendered yet
+
+    Notes
+    -----
+    - The same instance can be used as a WSGI app (called with environ, start_response) or as an ASGI app (called with scope, receive, send)
+    - Call PresentationApp.reload() if the presentation changes and needs to be rendered again
+
+    Examples
+    --------
+    ### Serve a presentation with wsgiref
+    ```
+    from wsgiref.simple_server import make_server
+    from ezprez.serve import PresentationApp
+
+    make_server("", 8000, PresentationApp(prez)).serve_forever()
+    ```
+    """
+    def __init__(self, presentation:Presentation, **options):
+        self.presentation = presentation
+        self.options = options
+        self.last_modified = False
+        self._files = False
+        self._lock = threading.Lock()
+
+
+    def reload(self):
+        """Discards the rendered files so the presentation is rendered again on the next request"""
+        with self._lock:
+            self._files = False
+            self.last_modified = False
+
+
+    def _get_files(self) -> Dict[str, Tuple[bytes, str]]:
+        """Renders the presentation on first use and returns a dictionary of {path:(contents, etag)}'s"""
+        if not self._files:
+            with self._lock:
+                if not self._files:
+                    files = {}
+                    for relative_path, contents in self.presentation.export_memory(**self.options).items():
+                        files[f"/{relative_path}"] = (contents, f'"{hashlib.sha256(contents).hexdigest()[:32]}"')
+                    pinned_time = self.presentation._pinned_time()
+                    self.last_modified = pinned_time.timestamp() if pinned_time else time.time()
+                    self._files = files
+        return self._files
+
+
+    def _is_not_modified(self, headers:Dict[str, str], etag:str) -> bool:
+        """Checks the conditional request headers against a file's ETag and the render time"""
+        if "if-none-match" in headers:
+            candidates = [candidate.strip() for candidate in headers["if-none-match"].split(",")]
+            return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+        if "if-modified-since" in headers:
+            try:
+                return parsedate_to_datetime(headers["if-modified-since"]).timestamp() >= int(self.last_modified)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+    def respond(self, method:str, path:str, headers:Dict[str, str]) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Generates the response for a request
+
+        Parameters
+        ----------
+        method : (str)
+            The HTTP method of the request
+
+        path : (str)
+            The (url decoded) path of the request
+
+        headers : (Dict[str, str])
+            The request headers, with lowercase names
+
+        Returns
+        -------
+        Tuple[int, List[Tuple[str, str]], bytes]
+            The status code, response headers and body
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, [("Allow", "GET, HEAD"), ("Content-Length", "0")], b""
+
+        if path.endswith("/"):
+            path += "index.html"
+        files = self._get_files()
+        if path not in files:
+            return 404, [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", "9")], b"Not Found"
+
+        contents, etag = files[path]
+        response_headers = [
+            ("ETag", etag),
+            ("Last-Modified", formatdate(self.last_modified, usegmt=True)),
+            ("Cache-Control", IMMUTABLE_CACHE_CONTROL if FINGERPRINT_PATTERN.search(path) else REVALIDATE_CACHE_CONTROL),
+        ]
+        if self._is_not_modified(headers, etag):
+            return 304, response_headers, b""
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json", "image/svg+xml"):
+            content_type += "; charset=utf-8"
+        response_headers += [("Content-Type", content_type), ("Content-Length", str(len(contents)))]
+        return 200, response_headers, b"" if method == "HEAD" else contents
+
+
+    def __call__(self, *args):
+        """Dispatches to the WSGI interface (environ, start_response) or the ASGI interface (scope, receive, send)"""
+        if len(args) == 3:
+            return self._asgi(*args)
+        environ, start_response = args
+        headers = {key[5:].replace("_", "-").lower(): value for key, value in environ.items() if key.startswith("HTTP_")}
+        path = environ.get("PATH_INFO", "/").encode("latin-1").decode("utf-8", "replace") # WSGI decodes the path as latin-1 (PEP 3333)
+        status, response_headers, body = self.respond(environ.get("REQUEST_METHOD", "GET"), path or "/", headers)
+        start_response(STATUS_LINES[status], response_headers)
+        return [body]
+
+
+    async def _asgi(self, scope:dict, receive, send):
+        """The ASGI interface of the app"""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        if not self._files: # Render in a worker thread instead of blocking the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self._get_files)
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+        status, response_headers, body = self.respond(scope.get("method", "GET"), scope.get("path", "/") or "/", headers)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response_headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def app(presentation:Presentation, **options) -> PresentationApp:
+    """Creates a PresentationApp (WSGI and ASGI application) for a presentation
+
+    Parameters
+    ----------
+    presentation : (Presentation)
+        The presentation to serve
+
+    options : (bool)
+        Any of the keyword export options of Presentation.export() (i.e. fingerprint=True)
+
+    Returns
+    -------
+    PresentationApp
+        The application serving the presentation
+
+    Examples
+    --------
+    ### Serving a presentation with wsgiref
+    ```
+    from wsgiref.simple_server import make_server
+    from ezprez.serve import app
+
+    make_server("", 8000, app(prez)).serve_forever()
+    ```
+
+    ### Serving a presentation with fingerprinted (immutable) assets
+    ```
+    from wsgiref.simple_server import make_server
+    from ezprez.serve import app
+
+    make_server("", 8000, app(prez, fingerprint=True)).serve_forever()
+    ```
+    """
+    return PresentationApp(presentation, **options)
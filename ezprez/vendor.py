@@ -0,0 +1,322 @@
+"""The module that contains the helpers used to self-host (vendor) the third-party assets of a presentation
+
+Constants
+---------
+#### GOOGLE_FONTS_URL
+The Google Fonts stylesheet linked in the head of every presentation
+
+#### FONT_AWESOME_URL
+The Font Awesome stylesheet linked in the head of every presentation
+
+#### HIGHLIGHT_CSS_URL, HIGHLIGHT_JS_URL
+The highlight.js stylesheet and script linked in the head of every presentation
+
+Functions
+---------
+#### vendor
+Replaces every third-party asset in a generated html file with a subsetted local copy
+
+#### split_css
+Splits a stylesheet into its top-level statements and rules
+
+#### rule_prelude
+Returns the selectors/at-rule of a rule from split_css()
+
+Notes
+-----
+- On first use you will need an internet connection to download the assets, after that they are read from a local cache
+- Font files are only subsetted to the characters/icons used if fontTools is installed (pip install fonttools brotli), otherwise
+  only the stylesheets are subsetted (unused icons, unicode ranges and font families are removed)
+"""
+# Standard lib dependencies
+import os                                   # Used in path validation
+import re                                   # Used to parse stylesheets and html
+import html as html_module                  # Used to unescape the text of generated html
+import hashlib                              # Used to generate cache file names
+import posixpath                            # Used to resolve relative references between vendored files
+import threading                            # Used to name temporary download files uniquely per thread
+from io import BytesIO                      # Used to hand font files to fontTools
+from urllib.parse import urljoin, urlparse  # Used to resolve references inside downloaded stylesheets
+from urllib.request import Request, urlopen # Used to download the assets on first use
+from typing import Dict, List, Set, Tuple   # Used to enrich type hints in functions
+
+# Optional Dependencies
+try:
+    from fontTools import subset as font_subset # Used to subset font files to the glyphs a presentation uses
+except ImportError:
+    font_subset = False
+
+
+GOOGLE_FONTS_URL = "https://fonts.googleapis.com/css?family=Roboto:100,100i,300,300i,400,400i,700,700i%7CMaitree:200,300,400,600,700&subset=latin-ext"
+"""The Google Fonts stylesheet linked in the head of every presentation"""
+
+FONT_AWESOME_URL = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.1/css/all.min.css"
+"""The Font Awesome stylesheet linked in the head of every presentation"""
+
+FONT_AWESOME_INTEGRITY = "sha512-+4zCK9k+qNFUR5X+cKL9EIR+ZOhtIloNl9GIKS57V1MyNsYpYcUrUeQc9vNfzsWfV28IaLL3i96P9sdNyeRssA=="
+"""The subresource integrity hash of FONT_AWESOME_URL"""
+
+HIGHLIGHT_CSS_URL = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/10.4.0/styles/default.min.css"
+"""The highlight.js stylesheet linked in the head of every presentation"""
+
+HIGHLIGHT_JS_URL = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/10.4.0/highlight.min.js"
+"""The highlight.js script linked in the head of every presentation"""
+
+VENDORED_PATHS = {
+    GOOGLE_FONTS_URL: "static/vendor/google-fonts/fonts.css",
+    FONT_AWESOME_URL: "static/vendor/font-awesome/css/all.min.css",
+    HIGHLIGHT_CSS_URL: "static/vendor/highlight/default.min.css",
+    HIGHLIGHT_JS_URL: "static/vendor/highlight/highlight.min.js",
+}
+"""The path (relative to the export root) each third-party asset is vendored to"""
+
+VENDOR_FOLDER = os.path.join(os.path.dirname(__file__), "vendor")
+"""The folder downloaded third-party assets are cached in"""
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+"""The user agent assets are downloaded with (Google Fonts only serves woff2 files to modern browsers)"""
+
+FONT_AWESOME_FAMILIES = {"fab": "fa-brands-", "far": "fa-regular-", "fas": "fa-solid-", "fa": "fa-solid-"}
+"""The font file prefix used by each Font Awesome style class"""
+
+_URL_PATTERN = re.compile(r"""url\(\s*(?P<quote>['"]?)(?P<url>[^'")\s]+)(?P=quote)\s*\)""")
+_ICON_GLYPH_PATTERN = re.compile(r"^\.fa-(?P<name>[a-z0-9-]+):{1,2}before$")
+_ICON_CLASS_PATTERN = re.compile(r"""class=['"](?P<classes>[^'"]*)['"]""")
+_GLYPH_CONTENT_PATTERN = re.compile(r"""content:\s*['"]\\(?P<codepoint>[0-9a-fA-F]+)['"]""")
+
+
+def _download(url:str) -> bytes:
+    """Returns the contents of a url, downloading it into VENDOR_FOLDER on first use"""
+    cache_name = hashlib.sha256(url.encode()).hexdigest()[:16] + "-" + (posixpath.basename(urlparse(url).path) or "index")
+    cache_path = os.path.join(VENDOR_FOLDER, cache_name)
+    if not os.path.exists(cache_path):
+        with urlopen(Request(url, headers={"User-Agent": USER_AGENT})) as response:
+            contents = response.read()
+        os.makedirs(VENDOR_FOLDER, exist_ok=True)
+        temporary_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(contents)
+        os.replace(temporary_path, cache_path) # Other threads/processes never see a partially written file
+        return contents
+    with open(cache_path, "rb") as cache_file:
+        return cache_file.read()
+
+
+def split_css(css:str) -> List[str]:
+    """Splits a stylesheet into its top-level statements and rules (i.e. '@charset "UTF-8";', '.fa{...}', '@media ...{...}')
+
+    Parameters
+    ----------
+    css : (str)
+        The stylesheet to split, comments and strings are skipped over
+
+    Returns
+    -------
+    List[str]
+        The statements and rules in order, joining them gives back the stylesheet
+
+    Examples
+    --------
+    ### Split a stylesheet into rules
+    ```
+    from ezprez.vendor import split_css
+
+    split_css("@charset 'UTF-8';.a{color:red}@media print{.a{color:#000}}") # ["@charset 'UTF-8';", '.a{color:red}', '@media print{.a{color:#000}}']
+    ```
+    """
+    chunks = []
+    start = depth = index = 0
+    while index < len(css):
+        if css.startswith("/*", index):
+            index = css.find("*/", index + 2)
+            index = len(css) if index == -1 else index + 2
+            continue
+        character = css[index]
+        if character in "'\"":
+            index = css.find(character, index + 1)
+            index = len(css) if index == -1 else index
+        elif character == "{":
+            depth += 1
+        elif character == "}":
+            depth -= 1
+            if depth == 0:
+                chunks.append(css[start:index + 1])
+                start = index + 1
+        elif character == ";" and depth == 0:
+            chunks.append(css[start:index + 1])
+            start = index + 1
+        index += 1
+    if css[start:].strip():
+        chunks.append(css[start:])
+    return chunks
+
+
+def rule_prelude(rule:str) -> str:
+    """Returns the selectors/at-rule of a rule from split_css() without comments (i.e. '@font-face' or '.fa-github:before'), or '' for statements without a block"""
+    rule = re.sub(r"/\*.*?\*/", "", rule, flags=re.S)
+    return rule[:rule.find("{")].strip() if "{" in rule else ""
+
+
+def _used_codepoints(html:str) -> Set[int]:
+    """Returns every character used in the text of a generated html file"""
+    text = html_module.unescape(re.sub(r"<[^>]*>", " ", html))
+    return {ord(character) for character in text}
+
+
+def _used_icons(html:str) -> Tuple[Set[str], Set[str]]:
+    """Returns the Font Awesome icon names (without fa-) and style classes (i.e. fab) used in a generated html file"""
+    icons, styles = set(), set()
+    for match in _ICON_CLASS_PATTERN.finditer(html):
+        for class_name in match.group("classes").split():
+            if class_name in FONT_AWESOME_FAMILIES:
+                styles.add(class_name)
+            elif class_name.startswith("fa-"):
+                icons.add(class_name[3:])
+    return icons, styles
+
+
+def _in_unicode_range(unicode_range:str, codepoints:Set[int]) -> bool:
+    """Checks if any of the codepoints are inside a css unicode-range descriptor (i.e. U+0000-00FF, U+0131)"""
+    for part in unicode_range.split(","):
+        part = part.strip().upper().replace("U+", "")
+        if "-" in part:
+            low, high = part.split("-", 1)
+        elif "?" in part:
+            low, high = part.replace("?", "0"), part.replace("?", "F")
+        else:
+            low = high = part
+        low, high = int(low, 16), int(high, 16)
+        if any(low <= codepoint <= high for codepoint in codepoints):
+            return True
+    return False
+
+
+def _only_woff2(rule:str) -> str:
+    """Reduces the src of an @font-face rule to its woff2 file (if it has one)"""
+    woff2 = re.search(r"""url\([^)]*\)\s*format\(\s*['"]woff2['"]\s*\)""", rule)
+    if not woff2:
+        return rule
+    rule = re.sub(r"src\s*:[^;}]*;?", "", rule)
+    return rule.replace("{", "{" + f"src:{woff2.group(0)};", 1)
+
+
+def _subset_google_fonts(css:str, codepoints:Set[int]) -> str:
+    """Removes every @font-face rule whose unicode-range is not used"""
+    rules = []
+    for rule in split_css(css):
+        unicode_range = re.search(r"unicode-range\s*:\s*([^;}]*)", rule)
+        if rule_prelude(rule).startswith("@font-face") and unicode_range and not _in_unicode_range(unicode_range.group(1), codepoints):
+            continue
+        rules.append(rule)
+    return "".join(rules)
+
+
+def _subset_font_awesome(css:str, icons:Set[str], styles:Set[str]) -> str:
+    """Removes every icon rule, and @font-face rule of a style, that is not used"""
+    used_font_prefixes = {FONT_AWESOME_FAMILIES[style] for style in styles}
+    rules = []
+    for rule in split_css(css):
+        prelude = rule_prelude(rule)
+        if prelude.startswith("@font-face"):
+            if not any(prefix in rule for prefix in used_font_prefixes):
+                continue
+            rule = _only_woff2(rule)
+        elif prelude and not prelude.startswith("@"):
+            selectors = [selector.strip() for selector in prelude.split(",")]
+            glyphs = [_ICON_GLYPH_PATTERN.match(selector) for selector in selectors]
+            if all(glyphs):
+                used_selectors = [selector for selector, glyph in zip(selectors, glyphs) if glyph.group("name") in icons]
+                if not used_selectors:
+                    continue
+                rule = rule[:rule.find(prelude)] + ",".join(used_selectors) + rule[rule.find("{"):]
+        rules.append(rule)
+    return "".join(rules)
+
+
+def _subset_font(contents:bytes, codepoints:Set[int]) -> bytes:
+    """Subsets a font file to the provided codepoints with fontTools (returns the font unchanged if that isn't possible)"""
+    if not font_subset or not codepoints:
+        return contents
+    try:
+        options = font_subset.Options()
+        font = font_subset.load_font(BytesIO(contents), options)
+        options.flavor = font.flavor
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        output = BytesIO()
+        font_subset.save_font(font, output, options)
+        return output.getvalue()
+    except Exception: # Corrupt/unsupported fonts (or a missing brotli install for woff2) fall back to the full font
+        return contents
+
+
+def _vendor_stylesheet(url:str, local_path:str, css:str, codepoints:Set[int]) -> Dict[str, bytes]:
+    """Downloads the files a stylesheet references, and returns the stylesheet (rewritten to point at them) and the files"""
+    files = {}
+
+    def _replace(match:re.Match) -> str:
+        reference = match.group("url")
+        if reference.startswith("data:"):
+            return match.group(0)
+        absolute_url = urljoin(url, reference)
+        if reference.startswith(("http:", "https:", "//")):
+            file_path = posixpath.join(posixpath.dirname(local_path), "fonts", posixpath.basename(urlparse(absolute_url).path))
+        else:
+            file_path = posixpath.normpath(posixpath.join(posixpath.dirname(local_path), reference.split("?")[0].split("#")[0]))
+        files[file_path] = _subset_font(_download(absolute_url), codepoints)
+        return f"url({posixpath.relpath(file_path, posixpath.dirname(local_path))})"
+
+    files[local_path] = _URL_PATTERN.sub(_replace, css).encode()
+    return files
+
+
+def vendor(html:str) -> Tuple[str, Dict[str, bytes]]:
+    """Replaces every third-party asset in a generated html file with a subsetted local copy
+
+    Parameters
+    ----------
+    html : (str)
+        The generated index.html
+
+    Returns
+    -------
+    Tuple[str, Dict[str, bytes]]
+        The html pointing at the local copies, and a dictionary of {relative_path:contents}'s of the vendored files
+
+    Notes
+    -----
+    - Only assets in VENDORED_PATHS that the html links to are vendored
+    - The Google Fonts stylesheet is reduced to the unicode ranges the text of the html uses
+    - The Font Awesome stylesheet is reduced to the icons and styles (fab, far, fas) the html uses, and woff2 files
+    - If fontTools is installed the font files themselves are subsetted to the used characters/icons
+
+    Examples
+    --------
+    ### Vendor the third-party assets of a presentation
+    ```
+    from ezprez.vendor import vendor
+
+    html, files = vendor(prez.__html__())
+    ```
+    """
+    files = {}
+    icons, styles = _used_icons(html)
+    for url, local_path in VENDORED_PATHS.items():
+        if url not in html.replace("&amp;", "&"):
+            continue
+        contents = _download(url)
+        if url == GOOGLE_FONTS_URL:
+            css = _subset_google_fonts(contents.decode(), _used_codepoints(html))
+            files.update(_vendor_stylesheet(url, local_path, css, _used_codepoints(html)))
+        elif url == FONT_AWESOME_URL:
+            css = _subset_font_awesome(contents.decode(), icons, styles)
+            glyphs = {int(match.group("codepoint"), 16) for match in _GLYPH_CONTENT_PATTERN.finditer(css)}
+            files.update(_vendor_stylesheet(url, local_path, css, glyphs))
+        else:
+            files[local_path] = contents
+
+        # Point the html at the local copy, subresource integrity hashes no longer match a subsetted copy
+        html = html.replace(url.replace("&", "&amp;"), local_path).replace(url, local_path)
+        html = re.sub(rf"""(href=["']{re.escape(local_path)}["'])\s*integrity=["'][^"']*["']\s*crossorigin=["'][^"']*["']""", r"\1", html)
+    return html, files
@@ -48,6 +48,12 @@ setuptools.setup(
     extras_require = {
         "dev" : ["pytest", # Used to run the test code in the tests directory
                 "mkdocs"], # Used to create HTML versions of the markdown docs in the docs directory
+        "vendor" : ["fonttools", # Used to subset vendored font files
+                "brotli"], # Used by fonttools to read and write woff2 files
+        "charts" : ["numpy"], # Used to downsample large data series in Chart's
+    },
+    entry_points = {
+        "console_scripts": ["ezprez = ezprez.cli:main"], # The ezprez command (i.e. ezprez audit deck.py)
     },
     classifiers = [
         "Programming Language :: Python :: 3",
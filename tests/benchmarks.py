@@ -0,0 +1,62 @@
+"""Benchmarks for rendering and serialization performance, run from the root of the repository with PYTHONPATH=. python tests/benchmarks.py"""
+import pickle
+import timeit
+
+from ezprez.core import Presentation, Slide
+from ezprez.components import Code, Footer, Grid, Icon, Image, Link, Navbar, SocialLink, TableOfContents, memoize, render, render_cache_info, walk
+
+
+def nested_grid(depth:int, width:int = 3) -> Grid:
+    """Creates a Grid with grids nested depth levels deep, each column holding text, bullet points and components"""
+    if depth == 0:
+        return Grid("leaf", ["a", ["b", "c"]], Icon("fa-heart"))
+    return Grid(*[["column text", ["bullet", ["nested bullet", Link("link", "#")]], nested_grid(depth - 1, 1)] for _ in range(width)])
+
+
+def benchmark_nested_grids():
+    """Times rendering deeply nested grids through the render() dispatch table"""
+    for depth in (10, 50, 200):
+        grid = nested_grid(depth)
+        runs = 20
+        seconds = timeit.timeit(lambda: render(grid), number=runs)
+        print(f"Nested grid depth {depth:>3}: {seconds / runs * 1000:.3f}ms per render ({len(render(grid)):,} characters)")
+
+
+def deck(slide_count:int) -> Presentation:
+    """Creates a presentation with a shared navbar/footer, and slides that repeat the same social links"""
+    social_links = [SocialLink(name, f"https://{name}.com/ezprez") for name in ("github", "twitter", "linkedin")]
+    slides = [Slide(f"Slide {index}", f"Some text for slide {index}", ["a bullet", ["a nested bullet", Link("link", "#")]], Code("python", f"print({index})"), Grid(*social_links), image=Image("", f"image-{index % 10}.jpg")) for index in range(slide_count)]
+    return Presentation("Benchmark", "A deck to benchmark with", "https://example.com", slides=slides, navbar=Navbar("Benchmark", social_links), footer=Footer(social_links))
+
+
+def benchmark_serialization():
+    """Compares the size and speed of to_bytes()/from_bytes() against pickle"""
+    for slide_count in (10, 100, 1000):
+        presentation = deck(slide_count)
+        runs = 20
+        data, pickled = presentation.to_bytes(), pickle.dumps(presentation)
+        dump_seconds = timeit.timeit(presentation.to_bytes, number=runs) / runs
+        load_seconds = timeit.timeit(lambda: Presentation.from_bytes(data), number=runs) / runs
+        pickle_dump_seconds = timeit.timeit(lambda: pickle.dumps(presentation), number=runs) / runs
+        pickle_load_seconds = timeit.timeit(lambda: pickle.loads(pickled), number=runs) / runs
+        print(f"{slide_count:>4} slides: to_bytes {len(data):>8,} bytes {dump_seconds * 1000:7.2f}ms dump {load_seconds * 1000:7.2f}ms load | pickle {len(pickled):>8,} bytes {pickle_dump_seconds * 1000:7.2f}ms dump {pickle_load_seconds * 1000:7.2f}ms load")
+
+
+def benchmark_memoized_rendering():
+    """Compares rendering slides that repeat code samples, agendas and links (and the number of distinct Link's) with and without memoize()"""
+    samples = [f"def example_{index}(items):\n    return [item for item in items if item > {index}]  # <filtered>\n" * 30 for index in range(10)]
+    agenda = {f"Section {index}": index * 100 for index in range(20)}
+    for enabled in (False, True):
+        memoize(enabled)
+        slides = [Slide(f"Slide {index}", Code("python", samples[index % 10]), TableOfContents(agenda), Link("Home", "#slide=1"), image=Image("", "photo.jpg")) for index in range(1000)]
+        runs = 5
+        seconds = timeit.timeit(lambda: [slide.__html__() for slide in slides], number=runs) / runs
+        links = {id(component) for slide in slides for component in walk(slide.contents) if isinstance(component, Link)}
+        print(f"memoize({enabled!s:<5}): {seconds * 1000:7.2f}ms per render of 1000 slides, {len(links):>4} distinct Link's, {render_cache_info()}")
+    memoize(False)
+
+
+if __name__ == "__main__":
+    benchmark_nested_grids()
+    benchmark_serialization()
+    benchmark_memoized_rendering()
@@ -1,6 +1,654 @@
 """Include your own tests as functions here"""
+import os
+import re
+import sys
+import json
+import subprocess
+import asyncio
+import zlib
+import pickle
+import hashlib
+import time
+import tarfile
+import zipfile
+from io import BytesIO
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ezprez.assets
+import ezprez.vendor
+import ezprez.components
+from ezprez.core import Presentation, Slide
+from ezprez.audit import Budget
+from ezprez.cli import main
+from ezprez.serialize import FORMAT_HEADER, FORMAT_VERSION
+from ezprez.serve import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, app
+from ezprez.components import Button, Chart, Code, Footer, Grid, Icon, Image, Link, Navbar, SocialLink, Table, TableOfContents, Video, downsample, memoize, render, render_cache_info
+
 
 def test_package():
     """Validates that package is working as intended"""
 
 
+@pytest.fixture
+def webslides(tmp_path, monkeypatch) -> str:
+    """Creates a minimal webslides distribution to export with (instead of downloading it), and returns its folder"""
+    folder = str(tmp_path / "webslides")
+    monkeypatch.setattr(ezprez.assets, "WEBSLIDES_FOLDER", folder)
+    for relative_path, contents in {
+        "index.html": "<html></html>",
+        "static/css/webslides.css": "body{}",
+        "static/js/webslides.js": "function WebSlides(){}",
+        "static/js/svg-icons.js": "",
+        "static/images/favicons/favicon-152.png": "",
+        "static/images/share-webslides.jpg": "",
+    }.items():
+        path = os.path.join(folder, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as webslides_file:
+            webslides_file.write(contents)
+    return folder
+
+
+def test_export_archive(tmp_path, webslides):
+    """Validates that zip and tar.gz archives contain the exported files, nested in folder_name, written to paths or file objects"""
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "photo.jpg").write_bytes(b"photo")
+    presentation = Presentation("Archive", "", "", slides=[Slide("Slide", "Content")], asset_folder=str(tmp_path / "images"))
+    expected = sorted(["index.html", "static/css/webslides.css", "static/js/webslides.js", "static/js/svg-icons.js", "static/images/favicons/favicon-152.png", "static/images/share-webslides.jpg", "static/images/photo.jpg"])
+
+    presentation.export_archive(str(tmp_path / "deck.zip"))
+    with zipfile.ZipFile(tmp_path / "deck.zip") as archive:
+        assert sorted(archive.namelist()) == expected
+        assert "Content" in archive.read("index.html").decode()
+
+    archive_file = BytesIO()
+    presentation.export_archive(archive_file, format="tar.gz", folder_name="deck")
+    archive_file.seek(0)
+    with tarfile.open(fileobj=archive_file, mode="r:gz") as archive:
+        assert sorted(archive.getnames()) == [f"deck/{path}" for path in expected]
+        assert "Content" in archive.extractfile("deck/index.html").read().decode()
+
+    with pytest.raises(FileExistsError):
+        presentation.export_archive(str(tmp_path / "deck.zip"))
+    presentation.export_archive(str(tmp_path / "deck.zip"), folder_name="deck", force=True)
+    with zipfile.ZipFile(tmp_path / "deck.zip") as archive:
+        assert sorted(archive.namelist()) == [f"deck/{path}" for path in expected]
+    with pytest.raises(ValueError):
+        presentation.export_archive(BytesIO(), format="rar")
+
+
+def test_export_memory_shares_webslides(tmp_path, webslides):
+    """Validates that in-memory exports share the same bytes objects for webslides files, and only index.html and images differ"""
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}.jpg").write_bytes(name.encode())
+    first, second = (Presentation(name, "", "", slides=[Slide(name, "Content")], asset_folder=str(tmp_path / name)).export_memory() for name in ("first", "second"))
+
+    different = sorted(path for path in set(first) | set(second) if first.get(path) is not second.get(path))
+    assert different == ["index.html", "static/images/first.jpg", "static/images/second.jpg"]
+    assert first["static/css/webslides.css"] == b"body{}"
+
+
+def test_serve(tmp_path, webslides):
+    """Validates that the served presentation answers conditional requests with 304, rejects other methods and caches fingerprinted files forever"""
+    (tmp_path / "café.jpg").write_bytes(b"image")
+    slides = [Slide("Slide", "Content", Image("", "café.jpg"))]
+    presentation = Presentation("Served", "", "", slides=slides, asset_folder=str(tmp_path), updated_time=datetime(2021, 1, 1, tzinfo=timezone.utc))
+    application = app(presentation, fingerprint=True)
+
+    def request(path:str, method:str="GET", **headers):
+        responses = []
+        environ = {"REQUEST_METHOD": method, "PATH_INFO": path, **{f"HTTP_{name.upper()}": value for name, value in headers.items()}}
+        body = b"".join(application(environ, lambda status, response_headers: responses.append((status, dict(response_headers)))))
+        return responses[0][0], responses[0][1], body
+
+    status, headers, body = request("/")
+    assert status == "200 OK" and b"Content" in body
+    assert headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL and headers["Content-Type"] == "text/html; charset=utf-8"
+    assert headers["Last-Modified"] == "Fri, 01 Jan 2021 00:00:00 GMT"
+    assert request("/", if_none_match=headers["ETag"]) == ("304 Not Modified", {name: headers[name] for name in ("ETag", "Last-Modified", "Cache-Control")}, b"")
+    assert request("/index.html", if_modified_since=headers["Last-Modified"])[0] == "304 Not Modified"
+    assert request("/", if_modified_since="Thu, 31 Dec 2020 00:00:00 GMT")[0] == "200 OK"
+    assert request("/", if_none_match='"other"')[0] == "200 OK"
+    assert request("/", method="HEAD")[2] == b""
+    assert request("/", method="POST")[:2] == ("405 Method Not Allowed", {"Allow": "GET, HEAD", "Content-Length": "0"})
+    assert request("/missing.css")[0] == "404 Not Found"
+    image = next(path for path in application._get_files() if path.startswith("/static/images/café."))
+    assert request(image.encode().decode("latin-1"))[2] == b"image" # WSGI paths are utf-8 bytes decoded as latin-1
+
+    stylesheet = next(path for path in application._get_files() if path.startswith("/static/css/webslides."))
+    status, headers, body = request(stylesheet)
+    assert stylesheet != "/static/css/webslides.css" and body == b"body{}"
+    assert headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+    messages = []
+    async def receive():
+        return {"type": "http.request"}
+    async def send(message):
+        messages.append(message)
+    application.reload()
+    asyncio.run(application({"type": "http", "method": "GET", "path": stylesheet, "headers": [(b"if-none-match", headers["ETag"].encode())]}, receive, send))
+    assert messages[0]["status"] == 304 and messages[1]["body"] == b""
+
+
+def test_concurrent_exports(tmp_path, monkeypatch, webslides):
+    """Validates that presentations exported in parallel threads don't share images, slides or settings"""
+    shared_slide = Slide("Shared slide", Code("html", "<p>shared</p>"))
+
+    presentations = []
+    updated_time = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    for index in range(16):
+        asset_folder = tmp_path / f"images-{index}"
+        asset_folder.mkdir()
+        (asset_folder / f"image-{index}.jpg").write_bytes(str(index).encode())
+        slides = [Slide(f"Deck {index} slide {number}", f"Content {index}", image=Image("", f"image-{index}.jpg")) for number in range(50)]
+        presentations.append(Presentation(f"Deck {index}", "", "", background=f"color-{index}", slides=slides + [shared_slide], asset_folder=str(asset_folder), updated_time=updated_time))
+
+    monkeypatch.chdir(tmp_path) # Exports should not depend on the working directory
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda presentation: presentation.export(str(tmp_path / "output"), force=True), presentations))
+        in_memory = list(pool.map(lambda presentation: presentation.export_memory(), presentations))
+
+    for index, presentation in enumerate(presentations):
+        with open(tmp_path / "output" / f"Deck {index}" / "index.html") as index_file:
+            html = index_file.read()
+        assert html == in_memory[index]["index.html"].decode()
+        assert html.count(f"Deck {index} slide") == 50
+        assert html.count(f"bg-color-{index} ") == 51
+        assert html.count("&lt;p&gt;shared&lt;/p&gt;") == 1
+        for other in range(16):
+            if other != index:
+                assert f"Deck {other} slide" not in html and f"bg-color-{other} " not in html
+        assert sorted(os.listdir(tmp_path / "output" / f"Deck {index}" / "static" / "images")) == ["favicons", f"image-{index}.jpg", "share-webslides.jpg"]
+    assert shared_slide.background is False
+
+
+def test_fingerprint(tmp_path, webslides):
+    """Validates that fingerprinted exports rename static files by hash and rewrite stylesheet url()'s, the favicon, backgrounds and Image src's"""
+    for relative_path, contents in {"static/css/webslides.css": "@font-face{src:url('../fonts/roboto.woff2')}body{background:url(../images/bg.png)}", "static/fonts/roboto.woff2": "font", "static/images/bg.png": "bg"}.items():
+        (tmp_path / "webslides" / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "webslides" / relative_path).write_text(contents)
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "photo.jpg").write_bytes(b"photo")
+    (tmp_path / "images" / "background.jpg").write_bytes(b"background")
+    presentation = Presentation("Fingerprint", "", "", slides=[Slide("Slide", Image("Photo", "photo.jpg"), image=Image("", "background.jpg"))], asset_folder=str(tmp_path / "images"))
+
+    files = presentation.export_memory(fingerprint=True)
+    manifest = json.loads(files["manifest.json"])
+    assert sorted(files) == sorted(["index.html", "manifest.json", *manifest.values()]) and len(manifest) == 9
+    for path, fingerprinted_path in manifest.items():
+        stem, extension = path.rsplit(".", 1)
+        assert fingerprinted_path == f"{stem}.{hashlib.sha256(files[fingerprinted_path]).hexdigest()[:12]}.{extension}"
+
+    stylesheet = files[manifest["static/css/webslides.css"]].decode()
+    assert stylesheet == f"@font-face{{src:url('../fonts/{manifest['static/fonts/roboto.woff2'].rsplit('/', 1)[1]}')}}body{{background:url(../images/{manifest['static/images/bg.png'].rsplit('/', 1)[1]})}}"
+    html = files["index.html"].decode()
+    assert f'href="{manifest["static/css/webslides.css"]}"' in html
+    assert f'href="{manifest["static/images/favicons/favicon-152.png"]}"' in html
+    assert f"""background-image:url("./{manifest['static/images/background.jpg']}")""" in html
+    assert f"<img src='./{manifest['static/images/photo.jpg']}' alt='Photo'" in html
+    assert not any(f"{path}'" in html or f'{path}"' in html for path in manifest)
+
+
+def test_prune(tmp_path, webslides):
+    """Validates that prune skips the webslides demos, unused fonts and unreferenced images, but keeps the files the stylesheets reference"""
+    for relative_path, contents in {
+        "static/css/webslides.css": "@import 'fonts.css';body{background:url(../images/bg.png)}",
+        "static/css/fonts.css": "@font-face{src:url('../fonts/used.woff2')}",
+        "static/css/unused.css": "@font-face{src:url('../fonts/unused.woff2')}",
+        "static/fonts/used.woff2": "used",
+        "static/fonts/unused.woff2": "unused",
+        "static/images/bg.png": "bg",
+        "static/images/unused.png": "unused",
+        "demos/index.html": "<html></html>",
+    }.items():
+        (tmp_path / "webslides" / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "webslides" / relative_path).write_text(contents)
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "photo.jpg").write_bytes(b"photo")
+    (tmp_path / "images" / "unused.jpg").write_bytes(b"unused")
+    presentation = Presentation("Prune", "", "", slides=[Slide("Slide", Image("", "photo.jpg"))], asset_folder=str(tmp_path / "images"))
+
+    assert "demos/index.html" in presentation.export_memory()
+    files = presentation.export_memory(prune=True)
+    assert sorted(files) == sorted([
+        "index.html", "static/css/webslides.css", "static/css/fonts.css", "static/fonts/used.woff2", "static/images/bg.png",
+        "static/images/photo.jpg", "static/images/favicons/favicon-152.png", "static/images/share-webslides.jpg", "static/js/webslides.js", "static/js/svg-icons.js",
+    ])
+
+
+def test_vendor(monkeypatch, webslides):
+    """Validates that vendor points the head at local copies, drops the integrity hash and subsets the icons and unicode ranges that are used"""
+    downloads = {
+        ezprez.vendor.GOOGLE_FONTS_URL: (
+            "@font-face{font-family:'Roboto';src:url(https://fonts.gstatic.com/s/roboto/latin.woff2) format('woff2');unicode-range:U+0000-00FF}"
+            "@font-face{font-family:'Roboto';src:url(https://fonts.gstatic.com/s/roboto/cyrillic.woff2) format('woff2');unicode-range:U+0400-045F}"
+        ),
+        ezprez.vendor.FONT_AWESOME_URL: (
+            ".fa,.fab{display:inline-block}.fa-github:before{content:\"\\f09b\"}.fa-twitter:before{content:\"\\f099\"}.fa-heart:before,.fa-star:before{content:\"\\f004\"}"
+            "@font-face{font-family:'Font Awesome 5 Brands';src:url(../webfonts/fa-brands-400.eot);src:url(../webfonts/fa-brands-400.woff2) format('woff2'),url(../webfonts/fa-brands-400.woff) format('woff')}"
+            "@font-face{font-family:'Font Awesome 5 Free';src:url(../webfonts/fa-solid-900.woff2) format('woff2')}"
+        ),
+        ezprez.vendor.HIGHLIGHT_CSS_URL: ".hljs{display:block}",
+        ezprez.vendor.HIGHLIGHT_JS_URL: "var hljs={};",
+        "https://fonts.gstatic.com/s/roboto/latin.woff2": "latin",
+        "https://fonts.gstatic.com/s/roboto/cyrillic.woff2": "cyrillic",
+        "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.1/webfonts/fa-brands-400.woff2": "brands",
+    }
+    requested = []
+    def _download(url:str) -> bytes:
+        requested.append(url)
+        return downloads[url].encode()
+    monkeypatch.setattr(ezprez.vendor, "_download", _download)
+    presentation = Presentation("Vendor", "", "", slides=[Slide("Slide", SocialLink("github", "https://github.com/Descent098"), Code("python", "x = 1"))])
+
+    files = presentation.export_memory(vendor=True)
+    html = files["index.html"].decode()
+    assert not any(url in html.replace("&amp;", "&") for url in ezprez.vendor.VENDORED_PATHS) and "integrity=" not in html
+    assert '<link rel="stylesheet" href="static/vendor/font-awesome/css/all.min.css" />' in html
+    assert '<script src="static/vendor/highlight/highlight.min.js"></script>' in html
+    assert set(downloads) - set(requested) == {"https://fonts.gstatic.com/s/roboto/cyrillic.woff2"}
+
+    font_awesome = files["static/vendor/font-awesome/css/all.min.css"].decode()
+    assert ".fa-github:before" in font_awesome and "fa-twitter" not in font_awesome and "fa-heart" not in font_awesome and "fa-solid" not in font_awesome
+    assert "src:url(../webfonts/fa-brands-400.woff2) format('woff2')" in font_awesome and ".eot" not in font_awesome and "400.woff)" not in font_awesome
+    assert files["static/vendor/font-awesome/webfonts/fa-brands-400.woff2"] == b"brands"
+
+    google_fonts = files["static/vendor/google-fonts/fonts.css"].decode()
+    assert "url(fonts/latin.woff2)" in google_fonts and "cyrillic" not in google_fonts
+    assert files["static/vendor/google-fonts/fonts/latin.woff2"] == b"latin" and "static/vendor/google-fonts/fonts/cyrillic.woff2" not in files
+    assert files["static/vendor/highlight/highlight.min.js"] == b"var hljs={};"
+
+
+def test_inline_sprite(tmp_path, webslides):
+    """Validates that sprite inlines only the used icons, swaps SocialLink icon fonts for svg's and drops svg-icons.js and the Font Awesome stylesheet"""
+    symbols = {name: f"<symbol id='{name}' viewBox='0 0 32 32'><path d='M0 0h{index}'></path></symbol>" for index, name in enumerate(("fa-heart", "fa-github", "fa-unused"))}
+    (tmp_path / "webslides" / "static" / "js" / "svg-icons.js").write_text(f"var icons = '<svg>{''.join(symbols.values())}</svg>';")
+    presentation = Presentation("Sprite", "", "", slides=[Slide("Slide", Icon("fa-heart"), SocialLink("github", "https://github.com/Descent098"))])
+
+    html = presentation.export_memory(sprite=True)["index.html"].decode()
+    sprite = html.split("<body>", 1)[1].split("</svg>", 1)[0]
+    assert symbols["fa-heart"] in sprite and symbols["fa-github"] in sprite and "fa-unused" not in sprite
+    assert "<i class='fab fa-github" not in html and "<svg class='fa-github' style='width:3em;height:3em;'><use xlink:href='#fa-github'></use></svg>" in html
+    assert "svg-icons.js" not in html and ezprez.vendor.FONT_AWESOME_URL not in html
+
+
+def test_render():
+    """Validates that render() handles nested lists, values without a renderer in bullet points, Grid columns and the list wrapper of a Slide"""
+    assert render(["a", 1, [2.5, ["b"]]]) == (
+        "\t\t\t\t\t<ul>\n\t\t\t\t\t\t\t\t<li>a</li>\n\t\t\t\t\t\t\t\t<li>1</li>\n"
+        "\t\t\t\t\t\t\t\t<li>\n\t\t\t\t\t<ul>\n\t\t\t\t\t\t\t\t<li>2.5</li>\n"
+        "\t\t\t\t\t\t\t\t<li>\n\t\t\t\t\t<ul>\n\t\t\t\t\t\t\t\t<li>b</li>\n\t\t\t\t\t</ul>\n\t\t\t\t\t\t\t\t</li>\n"
+        "\t\t\t\t\t</ul>\n\t\t\t\t\t\t\t\t</li>\n\t\t\t\t\t</ul>\n"
+    )
+    assert "<li>\n\t\t\t\t\t<a href=# " in render([Link("link", "#")])
+    with pytest.raises(ValueError):
+        render(1)
+
+    grid = render(Grid("text", ["stacked", ["bullet", 2]], Link("link", "#")))
+    assert grid.count("<div class='column'>") == 3
+    assert "<div class='column'>\n\t\t\t\t\t<p>stacked</p>\n\t\t\t\t\t<ul>\n\t\t\t\t\t\t\t\t<li>bullet</li>\n\t\t\t\t\t\t\t\t<li>2</li>\n\t\t\t\t\t</ul>\n\t\t\t\t\t</div>" in grid
+
+    html = "".join(Slide("Numbers", [1, 2, 3], horizontal_alignment="left")._generate_content(False))
+    assert "<div class='grid content-left'>\n\t\t\t\t\t\t\t<ul style='text-align:justify;'>\n\t\t\t\t\t\t\t\t<li>1</li>\n" in html
+    assert html.count("<li>") == 3
+
+
+def test_record_slides(tmp_path, webslides):
+    """Validates that from_records, from_csv and from_jsonl generate each slide once per export, even from a generator of records"""
+    rows = [{"name": f"Speaker {index}", "bio": f"Bio {index}"} for index in range(10)]
+    (tmp_path / "speakers.csv").write_text("name,bio\n" + "".join(f"{row['name']},{row['bio']}\n" for row in rows))
+    (tmp_path / "speakers.jsonl").write_text("".join(json.dumps(row) + "\n" for row in rows) + "\n")
+    calls = []
+    def template(row:dict) -> Slide:
+        calls.append(row["name"])
+        return Slide(row["name"], row["bio"], Icon("fa-heart"))
+
+    presentations = {
+        "records": Presentation.from_records(rows, template, "Records", "", ""),
+        "csv": Presentation.from_csv(str(tmp_path / "speakers.csv"), template, "Records", "", ""),
+        "jsonl": Presentation.from_jsonl(str(tmp_path / "speakers.jsonl"), template, "Records", "", ""),
+    }
+    for name, presentation in presentations.items():
+        for options in ({}, {"sprite": True, "search": True, "fast_first_paint": True, "lazy_images": True}):
+            calls.clear()
+            files = presentation.export_memory(**options)
+            html = files["index.html"].decode()
+            assert calls == [row["name"] for row in rows], name
+            assert all(f"<h2>{row['name']}</h2>" in html and f"<p>{row['bio']}</p>" in html for row in rows)
+        assert json.loads(files["static/search-index.json"])["slides"][-1] == [11, "Speaker 9"]
+        assert presentation.analyze().slide_count == 12 and len(presentation) == 10
+    assert not any(slide.heading.startswith("Speaker") for slide in Slide.all)
+
+    existing = Slide("Existing", "Made before the export")
+    Presentation.from_records(rows, lambda row: existing, "Reused", "", "").export_memory()
+    assert any(slide is existing for slide in Slide.all) # Only slides the template creates are removed
+    Slide.all[:] = [slide for slide in Slide.all if slide is not existing]
+
+    calls.clear()
+    presentation = Presentation.from_records((row for row in rows), template, "Generator", "", "")
+    with pytest.raises(ValueError):
+        presentation.analyze()
+    with pytest.raises(TypeError):
+        len(presentation)
+    html = presentation.export_memory(sprite=True, search=True, fast_first_paint=True, lazy_images=True)["index.html"].decode()
+    assert html.count("<h2>Speaker") == 10 and len(calls) == 10
+    with pytest.raises(ValueError):
+        presentation.export_memory()
+    assert b"Speaker 9" in Presentation.from_records((row for row in rows), template, "Generator", "", "").export_memory()["index.html"]
+
+
+def test_analyze_budget(tmp_path):
+    """Validates that analyze() measures images, videos and code blocks per slide, and reports exceeded budgets"""
+    (tmp_path / "big.jpg").write_bytes(b"0" * 2000)
+    (tmp_path / "small.jpg").write_bytes(b"0" * 10)
+    slides = [
+        Slide("Images", Grid(Image("", "big.jpg"), Image("", "small.jpg")), image=Image("", "small.jpg")),
+        Slide("Code", Code("python", "x = 1\n" * 100), Video("abc")),
+    ]
+    presentation = Presentation("Audit", "", "", slides=slides, asset_folder=str(tmp_path))
+
+    report = presentation.analyze()
+    assert report.passed
+    assert report.image_bytes == {2: 2020}
+    assert report.videos == 1
+    assert report.largest_blocks == [(3, "Code", 600)]
+
+    report = presentation.analyze(Budget(max_slide_image_bytes=2000, max_videos=1, max_block_characters=1000))
+    assert len(report.violations) == 1 and "Slide 2" in report.violations[0]
+
+    presentation.favicon = Image("", "big.jpg")
+    report = presentation.analyze(Budget(max_slide_image_bytes=2020))
+    assert report.image_bytes[0] == 2000 and report.passed # Images every slide loads aren't counted as one slide's
+
+
+def test_audit_command(tmp_path, capsys):
+    """Validates that ezprez audit exits with 0 within budget, 1 over budget and 2 for missing files, and can print json or pick one presentation"""
+    (tmp_path / "deck.py").write_text(
+        "from ezprez.core import Presentation, Slide\n"
+        "from ezprez.components import Video\n"
+        "light = Presentation('Light', '', '', slides=[Slide('Text', 'Hello')])\n"
+        "heavy = Presentation('Heavy', '', '', slides=[Slide('Videos', Video('a'), Video('b'))])\n"
+    )
+    deck = str(tmp_path / "deck.py")
+
+    def audit(*arguments:str) -> int:
+        with pytest.raises(SystemExit) as exited:
+            main(["audit", *arguments])
+        return exited.value.code
+
+    assert audit(deck) == 0 and "Light\n-----" in capsys.readouterr().out
+    assert audit(deck, "--max-videos", "1") == 1 and "2 videos is over the budget of 1" in capsys.readouterr().out
+    assert audit(f"{deck}:light", "--max-videos", "1") == 0 and "Heavy" not in capsys.readouterr().out
+
+    assert audit(deck, "--json", "--max-videos", "1") == 1
+    reports = json.loads(capsys.readouterr().out)
+    assert reports["Heavy"]["videos"] == 2 and not reports["Heavy"]["passed"] and reports["Light"]["passed"]
+
+    assert audit(str(tmp_path / "missing.py")) == 2 and "Could not find presentation file" in capsys.readouterr().err
+    assert audit(f"{deck}:missing") == 2
+
+
+def test_analyze_generator_table():
+    """Validates that analyze() doesn't use up a Table of generated rows before it's exported"""
+    table = Table(([number] for number in range(50)), rows_per_slide=10)
+    presentation = Presentation("Audit", "", "", slides=[Slide("Rows", Grid(Table([[1], [2]]), "Text"), table)])
+    report = presentation.analyze()
+    assert report.unread_tables == 1 and report.slide_count == 3
+    assert "Not counting the rows of 1 tables" in str(report)
+
+    html = "".join(presentation._iter_html())
+    assert html.count("<tr>") == 52 and html.count("<h2>Rows</h2>") == 5
+
+    table = Table(({"number": number} for number in range(5)))
+    assert Table.from_bytes(table.to_bytes()).__html__() == table.__html__() and table.__html__().count("<tr>") == 6
+
+
+def test_reproducible_exports(tmp_path, monkeypatch, webslides):
+    """Validates that exports are byte-identical when SOURCE_DATE_EPOCH is set, even if the source files were touched"""
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1609459200")
+    presentation = Presentation("Reproducible", "", "", slides=[Slide("Slide", "Content")], asset_folder=webslides)
+
+    exports = []
+    for attempt in range(2):
+        os.utime(os.path.join(webslides, "static", "css", "webslides.css"), (time.time() + attempt * 100,) * 2)
+        presentation.export(str(tmp_path / f"output-{attempt}"))
+        for format in ("zip", "tar.gz"):
+            presentation.export_archive(str(tmp_path / f"output-{attempt}.{format}"), format=format)
+        exports.append([(tmp_path / f"output-{attempt}.{format}").read_bytes() for format in ("zip", "tar.gz")])
+
+    assert exports[0] == exports[1]
+    assert '"2021-01-01T00:00:00+00:00"' in (tmp_path / "output-0" / "Reproducible" / "index.html").read_text()
+    assert os.path.getmtime(tmp_path / "output-1" / "Reproducible" / "static" / "css" / "webslides.css") == 1609459200
+
+
+def test_lazy_images(tmp_path, webslides):
+    """Validates that lazy_images defers images after the first slides, preloads the first slide's images and keeps them fingerprintable"""
+    for index in range(5):
+        (tmp_path / f"image-{index}.jpg").write_bytes(str(index).encode())
+    slides = [Slide(f"Slide {index}", Image("", f"image-{index}.jpg"), image=Image("", f"image-{index}.jpg")) for index in range(5)]
+    presentation = Presentation("Lazy", "", "", slides=slides, asset_folder=str(tmp_path))
+
+    html = presentation.export_memory(lazy_images=2)["index.html"].decode()
+    assert "<link rel='preload' as='image' href='./static/images/image-0.jpg'>" in html
+    assert html.count("background-image:url(") == 1 and html.count("data-background=") == 4
+    assert html.count("<img src=") == 1 and html.count("<img data-src=") == 4
+    assert "ws:slide-change" in html
+
+    files = presentation.export_memory(lazy_images=True, fingerprint=True)
+    assert "data-background='./static/images/image-4.jpg'" not in files["index.html"].decode()
+    assert "static/images/image-4.jpg" in json.loads(files["manifest.json"])
+
+    slides = [Slide("Rows", Table([[index] for index in range(30)], rows_per_slide=10), image=Image("", "image-0.jpg")), Slide("After", image=Image("", "image-1.jpg"))]
+    html = Presentation("Lazy", "", "", slides=slides, asset_folder=str(tmp_path)).export_memory(lazy_images=2)["index.html"].decode()
+    assert html.count("background-image:url(") == 1 and html.count("data-background=") == 3 # Counted per section, like the lazy image script
+
+
+def test_offline_precache(tmp_path, webslides):
+    """Validates that offline exports a service worker whose manifest hashes index.html and the used files, and only changes for changed files"""
+    (tmp_path / "photo.jpg").write_bytes(b"first")
+    presentation = Presentation("Offline", "", "", slides=[Slide("Photo", Image("", "photo.jpg"))], asset_folder=str(tmp_path), updated_time=datetime(2021, 1, 1))
+
+    files = presentation.export_memory(offline=True)
+    manifest = json.loads(files["precache-manifest.json"])
+    assert {"index.html", "static/css/webslides.css", "static/images/photo.jpg"} <= set(manifest)
+    assert "static/images/share-webslides.jpg" in manifest and "static/js/svg-icons.js" in manifest
+    assert 'register("sw.js")' in files["index.html"].decode()
+    assert json.dumps(manifest, indent=4, sort_keys=True) in files["sw.js"].decode()
+
+    (tmp_path / "photo.jpg").write_bytes(b"second")
+    changed = json.loads(presentation.export_memory(offline=True)["precache-manifest.json"])
+    assert [path for path in manifest if manifest[path] != changed[path]] == ["static/images/photo.jpg"]
+
+
+def test_serialization_round_trip():
+    """Validates that to_bytes()/from_bytes() recreate presentations exactly, keep shared components shared and don't touch Slide.all"""
+    github = SocialLink("github", "https://github.com/Descent098")
+    navbar = Navbar("Title", [github, Link("Docs", "https://ezprez.readthedocs.io")])
+    slides = [
+        Slide("Grid", Grid(["a", ("b", ["c"])], Code("python", "print('<hi>')")), background="black", image=Image("", "a.jpg", width=300)),
+        Slide("Table of contents", TableOfContents({"Intro": 1, "End": 3}), Button("Go", "#", icon=Icon("fa-heart")), github),
+    ]
+    presentation = Presentation("Serialized", "", "", slides=slides, navbar=navbar, footer=Footer([github]), updated_time=datetime(2021, 1, 1))
+
+    slide_count = len(Slide.all)
+    loaded = Presentation.from_bytes(presentation.to_bytes())
+    assert len(Slide.all) == slide_count
+    assert vars(loaded.slides[0].contents[0]) == vars(slides[0].contents[0]) and vars(loaded.slides[1]) == vars(slides[1])
+    assert loaded.__html__() == presentation.__html__()
+    assert loaded.navbar.links[0] is loaded.footer.links[0] is loaded.slides[1].contents[2]
+    assert Icon.from_bytes(Icon("fa-heart").to_bytes()) == Icon("fa-heart")
+    with pytest.raises(ValueError):
+        Slide.from_bytes(Icon("fa-heart").to_bytes())
+
+    # Equal value components are stored (and loaded) once, other components and differently typed values are kept apart
+    slides = [Slide(f"Slide {index}", Link("Home", "#"), Button("Go", "#", icon=Icon("fa-heart")), Code("python", "x = 1")) for index in range(50)]
+    loaded = Presentation.from_bytes(Presentation("Deduplicated", "", "", slides=slides).to_bytes())
+    assert len({id(slide.contents[0]) for slide in loaded.slides}) == len({id(slide.contents[1]) for slide in loaded.slides}) == 1
+    assert len({id(slide.contents[2]) for slide in loaded.slides}) == 50
+    assert loaded.slides[0].contents[1].icon is loaded.slides[49].contents[1].icon and loaded.__html__().count("<h2>Slide") == 50
+    icons = Grid(Icon("fa-heart", size=1), Icon("fa-heart", size=True))
+    assert [icon.size for icon in Grid.from_bytes(icons.to_bytes()).contents] == [1, True]
+
+    # Data can only create ezprez objects, and fields added after serializing get their defaults
+    with pytest.raises(ValueError):
+        Slide.from_bytes(FORMAT_HEADER + bytes([FORMAT_VERSION]) + zlib.compress(pickle.dumps(ThreadPoolExecutor)))
+    with pytest.raises(ValueError):
+        Slide.from_bytes(FORMAT_HEADER + bytes([FORMAT_VERSION]) + zlib.compress(b"corrupted"))
+    data = zlib.decompress(presentation.to_bytes()[len(FORMAT_HEADER) + 1:]).replace(b"updated_time", b"removed_time")
+    loaded = Presentation.from_bytes(FORMAT_HEADER + bytes([FORMAT_VERSION]) + zlib.compress(data))
+    assert loaded.updated_time is False and loaded.removed_time == datetime(2021, 1, 1)
+
+
+def test_fast_first_paint(tmp_path, webslides):
+    """Validates that fast_first_paint inlines the critical css, defers stylesheets and scripts, and only loads highlight.js for Code"""
+    with open(os.path.join(webslides, "static", "css", "webslides.css"), "w") as stylesheet:
+        stylesheet.write(".wrap{margin:auto}.toc{color:red}@font-face{src:url(../fonts/a.woff2)}")
+
+    html = Presentation("Fast", "", "", slides=[Slide("Text", "No code here")]).export_memory(fast_first_paint=True)["index.html"].decode()
+    assert "<style>.wrap{margin:auto}@font-face{src:url(static/fonts/a.woff2)}</style>" in html
+    assert """<link rel="preload" as="style" href="static/css/webslides.css" """ in html
+    assert "<script defer src='static/js/webslides.js'></script>" in html
+    assert "highlight" not in html
+
+    slides = [Slide("Text", "No code here"), Slide("Code", Code("python", "print('hi')"))]
+    html = Presentation("Fast", "", "", slides=slides).export_memory(fast_first_paint=True)["index.html"].decode()
+    assert html.count("highlight.min.js") == 1 and html.index("highlight.min.js") > html.index("</article>")
+
+
+def test_critical_css_tables(tmp_path, webslides):
+    """Validates that the critical css is found from the first row of a Table, without reading a generator of rows"""
+    with open(os.path.join(webslides, "static", "css", "webslides.css"), "w") as stylesheet:
+        stylesheet.write("table{width:100%}td{padding:0}.toc{color:red}")
+    rows = ([number, number * 2] for number in range(1000))
+    html = Presentation("Fast", "", "", slides=[Slide("Table", Table(rows, rows_per_slide=100))]).export_memory(fast_first_paint=True)["index.html"].decode()
+    assert "<style>table{width:100%}td{padding:0}</style>" in html # Found without reading the generator
+    assert html.count("<tr>") == 1000 and html.count("<h2>Table</h2>") == 10
+
+
+def test_chart_downsampling():
+    """Checks that large series are downsampled to max_points, non-finite points are dropped and the title is escaped"""
+    numpy = pytest.importorskip("numpy")
+    y = numpy.sin(numpy.arange(1_000_000) / 10_000)
+    y[10] = numpy.nan
+    for method in ("lttb", "minmax"):
+        chart = Chart("<b>Sine</b>", y, max_points=300, downsample_method=method)
+        assert 2 < len(chart.x) <= 300 and len(chart.x) == len(chart.y)
+        assert chart.x[0] == 0 and chart.x[-1] == 999_999
+        assert max(chart.y) > 0.99 and min(chart.y) < -0.99 # Peaks are kept
+        html = chart.__html__()
+        assert "&lt;b&gt;Sine&lt;/b&gt;" in html and "<b>" not in html
+        assert len(html.split("<polyline points='")[1].split("'")[0].split()) == len(chart.x)
+
+    with pytest.raises(ValueError):
+        Chart("Pie", [1, 2, 3], kind="pie")
+    step = numpy.repeat([0.0, 1.0], 500)
+    for points in (3, 4, 10, 11):
+        x, _ = downsample(range(1000), step, points, "minmax")
+        assert x[0] == 0 and x[-1] == 999 and len(x) <= points # The first and last point are always kept
+
+    bars = Chart("Losses", [-5, -3, -1], kind="bar").__html__()
+    assert all(0 <= float(y) <= 400 for y in re.findall(r"<rect x='[^']*' y='([^']*)'", bars)) # Negative bars stay inside the viewBox
+
+    imported = subprocess.run([sys.executable, "-c", "import sys, ezprez.core; print('numpy' in sys.modules)"], cwd=os.path.dirname(os.path.dirname(__file__)), capture_output=True, text=True)
+    assert imported.stdout.strip() == "False" # numpy is only imported once a series is downsampled
+
+    for points in (0, 1, 2): # Would silently keep every point
+        with pytest.raises(ValueError):
+            Chart("Sine", y, max_points=points)
+        with pytest.raises(ValueError):
+            downsample(range(len(y)), y, points)
+
+
+def test_table_pagination(tmp_path):
+    """Checks that a Table of a .csv file is escaped and split into a slide per rows_per_slide rows"""
+    (tmp_path / "rows.csv").write_text("name,score\n" + "".join(f"<row {index}>,{index}\n" for index in range(50)))
+    slide = Slide("Scores", "Before", Table(str(tmp_path / "rows.csv"), caption="Scores", rows_per_slide=20), "After")
+    html = slide.__html__()
+
+    assert html.count("<section") == 3 and html.count("<h2>Scores</h2>") == 3
+    assert html.count("<th>name</th>") == 3 and html.count("<tr><td>") == 50
+    assert "&lt;row 49&gt;" in html and "<row" not in html
+    assert html.index("Before") < html.index("<table>") and html.rindex("</table>") < html.index("After")
+    assert Presentation("Table", "", "", slides=[slide]).analyze().slide_count == 5 # Intro, 3 pages and the endcard
+
+
+
+def test_search_index(tmp_path, webslides):
+    """Validates that the search index maps terms to the right slide numbers, including the pages of split tables, and is precached offline"""
+    slides = [
+        Slide("<em>Setup</em>", "Install with pip", ["Python &amp; pipx"], Link("Documentation", "https://example.com")),
+        Slide("Results", Table([[f"row{index}"] for index in range(5)], rows_per_slide=2)),
+        Slide("Demo", Code("python", "print('walrus')"), Grid(Button("Source", "#"))),
+    ]
+    presentation = Presentation("Searchable", "A deck", "", slides=slides, updated_time=datetime(2021, 1, 1))
+
+    files = presentation.export_memory(search=True, prune=True, offline=True)
+    index = json.loads(files["static/search-index.json"])
+    slide_numbers = {}
+    for term, deltas in index["terms"].items():
+        positions = [sum(deltas[:count + 1]) for count in range(len(deltas))]
+        slide_numbers[term] = [index["slides"][position][0] for position in positions]
+
+    assert index["slides"][:2] == [[1, "Searchable"], [2, "Setup"]]
+    assert slide_numbers["pipx"] == slide_numbers["documentation"] == slide_numbers["setup"] == [2]
+    assert slide_numbers["row0"] == [3] and slide_numbers["row3"] == [4] and slide_numbers["row4"] == [5]
+    assert slide_numbers["results"] == [3, 4, 5]
+    assert slide_numbers["walrus"] == slide_numbers["source"] == [6]
+    assert "em" not in slide_numbers and "amp" not in slide_numbers
+    assert "static/search-index.json" in json.loads(files["precache-manifest.json"])
+    assert "static/search-index.json" in files["index.html"].decode()
+
+    slides[0].contents[1].append("omega") # Changes that don't replace the heading or contents are still indexed
+    slides[0].contents[2].label = "Manual"
+    index = json.loads(presentation.export_memory(search=True)["static/search-index.json"])
+    assert "omega" in index["terms"] and "manual" in index["terms"] and "documentation" not in index["terms"]
+
+    rows = ([f"row{index}"] for index in range(5))
+    with pytest.raises(ValueError):
+        Presentation("Searchable", "", "", slides=[Slide("Rows", Table(rows))]).export_memory(search=True)
+
+
+def test_memoized_rendering():
+    """Checks that memoized html is reused until a field (or a link in a list) changes, and that equal Icon's/Link's are interned"""
+    memoize(maxsize=2)
+    try:
+        assert Icon("fa-heart") is Icon("fa-heart") and Icon("fa-heart") is not Icon("fa-star")
+        assert Link("Home", "#") is Link("Home", "#") and Link.from_bytes(Link("Home", "#").to_bytes()) is not Link("Home", "#")
+        changed = Link("Docs", "#docs")
+        changed.label = "Manual" # Changed components aren't returned for the arguments they were created with
+        assert Link("Docs", "#docs").label == "Docs" and Link("Manual", "#docs") is not changed
+        icon = Icon("fa-star")
+        icon.size = "60px"
+        assert Icon("fa-star").size == "48px" and Icon("fa-star") is not icon
+
+        navbar = Navbar("Title", [Link("Docs", "#docs")])
+        assert navbar.__html__() == navbar.__html__()
+        assert render_cache_info()[:2] == (1, 1)
+        generation = ezprez.components._render_cache.generation
+        assert Link("".join(["Do", "cs"]), "#docs") is navbar.links[0] # Returned without running __init__() again
+        assert ezprez.components._render_cache.generation == generation
+        navbar.links.append(SocialLink("github", "#"))
+        assert "fa-github" in navbar.__html__()
+        navbar.links[0].label = "Manual"
+        assert "Manual" in navbar.__html__() and render_cache_info()[:2] == (1, 3)
+
+        code = Code("python", "x = '<b>'")
+        code.__html__()
+        code.content = "y = 2"
+        assert "y = 2" in code.__html__() and render_cache_info().currsize == 2 # The least recently used html was dropped
+        navbar.links.append("Not a link")
+        with pytest.raises(ValueError):
+            navbar.__html__()
+
+        memoize(maxsize=2)
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: code.__html__(), range(2000)))
+        assert render_cache_info()[:2] == (1999, 1) # The counters are updated under the lock
+    finally:
+        memoize(False)
+    assert render_cache_info() == (0, 0, 0, 0, 0)
+